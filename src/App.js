@@ -15,6 +15,13 @@ function App() {
     setStep('viewPlan');
   };
 
+  // Show topics and challenges while the rest of the plan is still generating
+  const handlePartialResult = (data) => {
+    setIsLoading(false);
+    setPlanData(data);
+    setStep('viewPlan');
+  };
+
   const handleStartOver = () => {
     setPlanData(null);
     setStep('prepForm');
@@ -26,6 +33,7 @@ function App() {
       {step === 'prepForm' && (
         <InterviewPrepForm
           onSubmit={handlePrepFormSubmit}
+          onPartialResult={handlePartialResult}
           setIsLoading={setIsLoading}
         />
       )}
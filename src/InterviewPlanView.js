@@ -22,6 +22,17 @@ function InterviewPlanView({ planData, onStartOver }) {
   };
 
   const downloadExcel = () => {
+    if (excel_file && excel_file.download_url) {
+      // Served as an attachment by the backend, so the browser downloads it directly
+      const link = document.createElement('a');
+      link.href = `http://localhost:5000${excel_file.download_url}`;
+      link.download = excel_file.name || 'interview_plan.xlsx';
+      document.body.appendChild(link);
+      link.click();
+      document.body.removeChild(link);
+      return;
+    }
+
     if (!excel_file || !excel_file.content) {
       alert('Excel file is not available');
       return;
@@ -1,7 +1,24 @@
 import React, { useState } from 'react';
 import './InterviewPrepForm.css';
 
-function InterviewPrepForm({ onSubmit, setIsLoading }) {
+// Parse one Server-Sent Events message into { event, data }
+const parseSseMessage = (message) => {
+  let event = 'message';
+  const dataLines = [];
+  message.split('\n').forEach(line => {
+    if (line.startsWith('event:')) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith('data:')) {
+      dataLines.push(line.slice(5).trim());
+    }
+  });
+  if (dataLines.length === 0) {
+    return null;  // Keep-alive comment
+  }
+  return { event, data: JSON.parse(dataLines.join('\n')) };
+};
+
+function InterviewPrepForm({ onSubmit, onPartialResult, setIsLoading }) {
   const [formData, setFormData] = useState({
     candidateName: '',
     candidateResume: null,
@@ -77,55 +94,91 @@ function InterviewPrepForm({ onSubmit, setIsLoading }) {
     try {
       setIsLoading(true);
 
-      // Read resume file
-      const resumeContent = await readFileAsBase64(formData.candidateResume);
-
-      // Read meeting recording if provided
-      let meetingRecordingContent = null;
-      if (!formData.useTranscript && formData.meetingRecording) {
-        meetingRecordingContent = await readFileAsBase64(formData.meetingRecording);
-      }
-
-      // Prepare payload
-      const payload = {
-        candidate_cv: {
-          name: formData.candidateResume.name,
-          content: resumeContent
-        },
-        job_position: formData.jobPosition,
-        job_requirements: formData.jobRequirements,
-        interview_duration_minutes: parseInt(formData.interviewDuration),
-        include_code_challenges: formData.includeCodeChallenges
-      };
+      // Send files as multipart parts; the backend streams them to disk instead of
+      // decoding a base64 copy in memory
+      const payload = new FormData();
+      payload.append('candidate_cv', formData.candidateResume, formData.candidateResume.name);
+      payload.append('job_position', formData.jobPosition);
+      payload.append('job_requirements', formData.jobRequirements);
+      payload.append('interview_duration_minutes', String(parseInt(formData.interviewDuration)));
+      payload.append('include_code_challenges', String(formData.includeCodeChallenges));
 
       if (formData.useTranscript) {
-        payload.meeting_transcript = formData.meetingTranscript;
-      } else if (meetingRecordingContent) {
-        payload.meeting_recording = {
-          name: formData.meetingRecording.name,
-          content: meetingRecordingContent
-        };
+        payload.append('meeting_transcript', formData.meetingTranscript);
+      } else if (formData.meetingRecording) {
+        payload.append('meeting_recording', formData.meetingRecording, formData.meetingRecording.name);
       }
 
-      // Send to backend
-      const response = await fetch('http://localhost:5000/generate_interview_plan', {
+      // Send to backend and show each artifact as soon as it is streamed back
+      const response = await fetch('http://localhost:5000/generate_interview_plan/stream', {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify(payload)
+        body: payload
       });
 
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const result = await response.json();
+      const partial = {
+        interview_plan: { metadata: { job_title: formData.jobPosition, time_limit_minutes: parseInt(formData.interviewDuration) } },
+        code_challenges: { coding_challenges: [], system_design: null, debugging_challenge: null },
+        excel_file: null
+      };
 
-      if (result.status === 'success') {
-        onSubmit(result);
-      } else {
-        throw new Error(result.message || 'Failed to generate interview plan');
+      const handleEvent = ({ event, data }) => {
+        if (event === 'topic') {
+          // Topics arrive one by one while they are generated; 'topics' replaces them with the final list
+          const topics = [...(partial.interview_plan.prioritized_topics || []), data];
+          partial.interview_plan = { ...partial.interview_plan, prioritized_topics: topics, topics_to_cover: topics };
+          onPartialResult({ ...partial });
+        } else if (event === 'topics') {
+          partial.interview_plan = { ...partial.interview_plan, prioritized_topics: data, topics_to_cover: data };
+          onPartialResult({ ...partial });
+        } else if (event === 'code_challenge') {
+          const challenges = { ...partial.code_challenges };
+          if (data.kind === 'coding') {
+            challenges.coding_challenges = [...challenges.coding_challenges, data.challenge];
+          } else if (data.kind === 'system_design') {
+            challenges.system_design = data.challenge;
+          } else if (data.kind === 'debugging') {
+            challenges.debugging_challenge = data.challenge;
+          }
+          partial.code_challenges = challenges;
+          if (partial.interview_plan.prioritized_topics) {
+            onPartialResult({ ...partial });
+          }
+        } else if (event === 'complete') {
+          onSubmit(data);
+        } else if (event === 'error') {
+          throw new Error(data.message || 'Failed to generate interview plan');
+        }
+        return event === 'complete' || event === 'error';
+      };
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let finished = false;
+
+      while (!finished) {
+        const { value, done } = await reader.read();
+        if (done) {
+          break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while (!finished && (boundary = buffer.indexOf('\n\n')) !== -1) {
+          const message = parseSseMessage(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+          if (message) {
+            finished = handleEvent(message);
+          }
+        }
+      }
+
+      if (!finished) {
+        throw new Error('Connection closed before the interview plan was completed');
       }
 
     } catch (error) {
@@ -135,18 +188,6 @@ function InterviewPrepForm({ onSubmit, setIsLoading }) {
     }
   };
 
-  const readFileAsBase64 = (file) => {
-    return new Promise((resolve, reject) => {
-      const reader = new FileReader();
-      reader.onloadend = () => {
-        const base64String = reader.result.split(',')[1];
-        resolve(base64String);
-      };
-      reader.onerror = reject;
-      reader.readAsDataURL(file);
-    });
-  };
-
   return (
     <div className="interview-prep-form-container">
       <h1>Interview Preparation Assistant</h1>
@@ -1,19 +1,35 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 import os
 import base64
+import json
 import logging
 import io
+import math
+import queue
+import time
 from resume_analyzer import process_resume
 from audio_transcriber import process_meeting_recording, extract_meeting_insights
 from interview_plan_generator import create_complete_interview_plan
 from code_challenge_generator import create_challenge_suite
-from excel_generator import create_interview_excel
+from excel_generator import create_interview_excel, default_excel_filename
+from stage_graph import run_stage_graph
+from document_store import extract_text_once, get_document, get_extracted_text
+from jobs import JobManager, JobQueueFull
+from artifact_store import get_artifact, put_artifact
+from llm_client import governor
+from metrics import Gauge, registry, stage_timer, timed_stage
+from model_routing import ROUTING_PROFILES, routing_context
+from job_profiles import create_job_profile, delete_job_profile, get_job_profile
+from batch import BATCH_CONCURRENCY, run_batch
+from plan_store import get_plan, save_plan
+from plan_edits import CHALLENGE_KINDS, plan_workbook, regenerate_challenge, regenerate_rubric, regenerate_topic_questions
+from uploads import SpooledUploadRequest, read_source_bytes, remove_file, save_upload
 from dotenv import load_dotenv
 
 # Document parsing imports
 try:
-    from PyPDF2 import PdfReader
+    from pdf_extractor import extract_pdf_text
     PDF_SUPPORT = True
 except ImportError:
     PDF_SUPPORT = False
@@ -31,6 +47,7 @@ except ImportError:
     DOC_SUPPORT = False
 
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 CORS(app)
 
 # Load .env from project root (parent directory)
@@ -38,16 +55,46 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Largest accepted request body, and largest non-file form field (e.g. a pasted transcript)
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv("MAX_UPLOAD_MB", "200")) * 1024 * 1024
+app.config['MAX_FORM_MEMORY_SIZE'] = 10 * 1024 * 1024
+
+# Pipeline stages, in the order they are reported to clients
+PIPELINE_STAGES = ["resume", "meeting", "plan", "challenges", "excel"]
+
+# Stages whose result is streamed to clients as an artifact of its own
+STAGE_ARTIFACTS = {"resume": "resume_analysis", "meeting": "meeting_insights"}
+
+# Seconds between keep-alive comments on idle event streams
+SSE_KEEPALIVE_SECONDS = 15
+
+# Background executor for /generate_interview_plan/jobs
+job_manager = JobManager(
+    PIPELINE_STAGES,
+    max_workers=int(os.getenv("JOB_WORKERS", "4")),
+    max_pending=int(os.getenv("JOB_QUEUE_LIMIT", "20")),
+    result_ttl_seconds=float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+)
+
+# Background executor for /batch; each batch already processes several candidates at once
+BATCH_STAGES = ["job_profile", "candidates"]
+batch_manager = JobManager(
+    BATCH_STAGES,
+    max_workers=int(os.getenv("BATCH_JOB_WORKERS", "1")),
+    max_pending=int(os.getenv("BATCH_QUEUE_LIMIT", "5")),
+    result_ttl_seconds=float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+)
+
 UPLOAD_FOLDER = 'uploads'
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
-def extract_text_from_file(file_bytes, filename):
+def extract_text_from_file(source, filename):
     """
     Extract text from various file formats (TXT, PDF, DOC, DOCX).
 
     Args:
-        file_bytes: Raw bytes of the file
+        source: Raw bytes of the file, a file path or a binary file object
         filename: Name of the file (used to determine format)
 
     Returns:
@@ -57,6 +104,7 @@ def extract_text_from_file(file_bytes, filename):
 
     # TXT files - try multiple encodings
     if file_extension in ['txt', 'text']:
+        file_bytes = read_source_bytes(source)
         for encoding in ['utf-8', 'utf-8-sig', 'latin-1', 'windows-1252', 'cp1252']:
             try:
                 text = file_bytes.decode(encoding)
@@ -73,13 +121,9 @@ def extract_text_from_file(file_bytes, filename):
             logging.error("PDF support not available. Install PyPDF2.")
             return None
         try:
-            pdf_file = io.BytesIO(file_bytes)
-            pdf_reader = PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            logging.info(f"Successfully extracted text from PDF ({len(pdf_reader.pages)} pages)")
-            return text.strip()
+            text, page_count = extract_pdf_text(source)
+            logging.info(f"Successfully extracted text from PDF ({page_count} pages)")
+            return text
         except Exception as e:
             logging.error(f"Error extracting text from PDF: {str(e)}")
             return None
@@ -90,8 +134,11 @@ def extract_text_from_file(file_bytes, filename):
             logging.error("DOCX support not available. Install python-docx.")
             return None
         try:
-            docx_file = io.BytesIO(file_bytes)
-            doc = Document(docx_file)
+            if isinstance(source, (bytes, bytearray)):
+                source = io.BytesIO(source)
+            elif hasattr(source, 'seek'):
+                source.seek(0)
+            doc = Document(source)
 
             # Extract text from paragraphs
             text_parts = []
@@ -120,18 +167,22 @@ def extract_text_from_file(file_bytes, filename):
         if not DOC_SUPPORT:
             logging.error("DOC support not available. Install docx2txt.")
             return None
+        temp_path = None
         try:
-            # Save to temp file since docx2txt needs a file path
-            temp_path = os.path.join(UPLOAD_FOLDER, f"temp_{os.urandom(8).hex()}.doc")
-            with open(temp_path, 'wb') as f:
-                f.write(file_bytes)
-            text = docx2txt.process(temp_path)
-            os.remove(temp_path)
+            if isinstance(source, str):
+                text = docx2txt.process(source)
+            else:
+                # Save to temp file since docx2txt needs a file path
+                temp_path = os.path.join(UPLOAD_FOLDER, f"temp_{os.urandom(8).hex()}.doc")
+                with open(temp_path, 'wb') as f:
+                    f.write(read_source_bytes(source))
+                text = docx2txt.process(temp_path)
+                os.remove(temp_path)
             logging.info(f"Successfully extracted text from DOC file")
             return text.strip()
         except Exception as e:
             logging.error(f"Error extracting text from DOC: {str(e)}")
-            if os.path.exists(temp_path):
+            if temp_path and os.path.exists(temp_path):
                 os.remove(temp_path)
             return None
 
@@ -139,161 +190,913 @@ def extract_text_from_file(file_bytes, filename):
         logging.error(f"Unsupported file format: {file_extension}")
         return None
 
+class PipelineError(Exception):
+    """Raised by a pipeline stage to abort the request with an error response."""
+
+    def __init__(self, message, status_code=500):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+@app.errorhandler(PipelineError)
+def pipeline_error_handler(e):
+    """Answer invalid input found while reading a request (see request_payload) with its status code."""
+    return jsonify({'status': 'error', 'message': e.message}), e.status_code
+
+@timed_stage("resume")
+def resume_stage(resume_text):
+    """Analyze the candidate's resume."""
+    logging.info("Step 1: Processing resume")
+    resume_analysis = process_resume(resume_text)
+
+    if "error" in resume_analysis:
+        raise PipelineError(resume_analysis['error'])
+
+    return resume_analysis
+
+@timed_stage("meeting")
+def meeting_stage(data):
+    """Extract meeting insights from the transcript, the recording or the request defaults."""
+    logging.info("Step 2: Processing meeting information")
+
+    if data.get('job_profile'):
+        # Analyzed once when the job profile was created
+        return data['job_profile']['meeting_insights']
+
+    if data.get('meeting_transcript'):
+        # Use provided transcript
+        transcript_text = data.get('meeting_transcript')
+        return extract_meeting_insights(transcript_text)
+
+    if data.get('meeting_recording'):
+        # Transcribe recording
+        recording = data.get('meeting_recording', {})
+        file_extension = recording.get('name', 'audio.mp3').split('.')[-1]
+
+        if recording.get('upload_path'):
+            # Multipart upload, already streamed to disk
+            meeting_data = process_meeting_recording(recording['upload_path'])
+        else:
+            meeting_data = process_meeting_recording(
+                recording.get('content'),
+                is_base64=True,
+                file_extension=file_extension
+            )
+
+        if "error" in meeting_data:
+            raise PipelineError(meeting_data['error'])
+
+        return meeting_data.get('insights', {})
+
+    # No meeting data, use defaults
+    return {
+        "job_requirements": data.get('job_requirements', ''),
+        "interview_duration_minutes": data.get('interview_duration_minutes', 30),
+        "topics_to_cover": [],
+        "code_challenge_needed": True
+    }
+
+@timed_stage("plan")
+def plan_stage(data, job_details, resume_analysis, meeting_insights, on_artifact=None):
+    """Generate the interview plan once resume analysis and meeting insights are available."""
+    logging.info("Step 4: Generating interview plan")
+    interview_duration = data.get('interview_duration_minutes',
+                                 meeting_insights.get('interview_duration_minutes', 30))
+
+    interview_plan = create_complete_interview_plan(
+        resume_analysis,
+        {'insights': meeting_insights},
+        job_details,
+        interview_duration,
+        on_topics=(lambda topics: on_artifact("topics", topics)) if on_artifact else None,
+        on_topic=(lambda topic: on_artifact("topic", topic)) if on_artifact else None
+    )
+
+    if "error" in interview_plan:
+        raise PipelineError(interview_plan['error'])
+
+    return interview_plan
+
+@timed_stage("challenges")
+def challenges_stage(data, job_details, resume_analysis, meeting_insights, on_artifact=None):
+    """Generate code challenges (only if requested), overlapping with plan generation."""
+    logging.info("Step 5: Generating code challenges")
+    include_code_challenges = data.get('include_code_challenges', False)
+    if include_code_challenges:
+        return create_challenge_suite(
+            job_details,
+            resume_analysis,
+            {'insights': meeting_insights},
+            on_challenge=(lambda kind, challenge: on_artifact("code_challenge", {"kind": kind, "challenge": challenge})) if on_artifact else None
+        )
+
+    logging.info("Code challenges skipped - not requested by user")
+    return {"coding_challenges": [], "system_design": None, "debugging_challenge": None}
+
+@timed_stage("excel")
+def excel_stage(interview_plan, code_challenges):
+    """Build the Excel workbook from the finished plan and challenges."""
+    logging.info("Step 6: Generating Excel file")
+    excel_bytes = create_interview_excel(interview_plan, code_challenges, in_memory=True)
+
+    if not excel_bytes:
+        raise PipelineError('Failed to generate Excel file')
+
+    return {'name': default_excel_filename(interview_plan), 'content': excel_bytes}
+
+def run_interview_pipeline(data, on_stage=None, on_artifact=None):
+    """
+    Run the complete interview preparation pipeline for one request payload.
+
+    Stages that don't depend on each other (resume analysis and meeting insights,
+    plan and challenge generation) run concurrently.
+
+    Args:
+        data (dict): Request payload (see generate_interview_plan_endpoint)
+        on_stage (callable): Optional progress hook, called as on_stage(name, status, result)
+            with status "running" or "done" for each of PIPELINE_STAGES
+        on_artifact (callable): Optional hook called as on_artifact(name, payload) as soon as each
+            intermediate artifact exists: "resume_analysis", "meeting_insights", one "topic" per
+            topic while topics are streamed, "topics" and one "code_challenge" per generated challenge
+
+    Returns:
+        dict: Response body with the interview plan, code challenges and Excel file
+
+    Raises:
+        PipelineError: If the input is invalid or a stage fails
+    """
+    try:
+        return run_pipeline_stages(data, on_stage, on_artifact)
+    finally:
+        remove_uploads(data)
+
+def run_pipeline_stages(data, on_stage=None, on_artifact=None):
+    """Body of run_interview_pipeline, without the upload cleanup."""
+    model_profile = data.get('model_profile')
+    if model_profile and model_profile not in ROUTING_PROFILES:
+        raise PipelineError(f"Unknown model_profile. Available: {', '.join(ROUTING_PROFILES)}", 400)
+
+    # LLM stages pick their models from the request's profile and latency budget
+    with routing_context(model_profile, data.get('latency_budget_seconds')), stage_timer("pipeline"):
+        return run_routed_pipeline(data, on_stage, on_artifact)
+
+def run_routed_pipeline(data, on_stage=None, on_artifact=None):
+    """Body of run_pipeline_stages, inside the request's model routing context."""
+    if data.get('job_profile_id'):
+        data = apply_job_profile(data)
+
+    if on_stage:
+        on_stage("resume", "running", None)
+
+    with stage_timer("extract_resume"):
+        resume = data.get('candidate_cv', {})
+        if resume.get('upload_path'):
+            # Multipart upload, already streamed to disk
+            resume_filename = resume.get('name', 'resume.txt')
+            resume_hash, resume_text = extract_text_once(resume['upload_path'], resume_filename, extract_text_from_file)
+        elif resume.get('content'):
+            # Extract text from resume file (supports TXT, PDF, DOC, DOCX), parsing each distinct file once
+            resume_bytes = base64.b64decode(resume['content'])
+            resume_filename = resume.get('name', 'resume.txt')
+
+            resume_hash, resume_text = extract_text_once(resume_bytes, resume_filename, extract_text_from_file)
+        elif resume.get('content_hash'):
+            # Reuse a CV that was uploaded before
+            resume_hash = resume['content_hash']
+            resume_text = get_extracted_text(resume_hash)
+            if resume_text is None:
+                raise PipelineError('Unknown resume content_hash. Please upload the resume file again.', 400)
+        else:
+            raise PipelineError('Resume is required', 400)
+
+    if not resume_text or len(resume_text.strip()) < 10:
+        logging.error(f"Resume text is too short or empty. Length: {len(resume_text) if resume_text else 0}")
+        raise PipelineError('Resume file appears to be empty or contains insufficient text. Please provide a resume with at least some content.', 400)
+
+    logging.info(f"Resume text extracted successfully. Length: {len(resume_text)} characters")
+
+    # Get Job Details
+    logging.info("Step 3: Processing job details")
+    job_position = data.get('job_position', '')
+
+    job_details = {
+        "title": job_position or "Position",
+        "description": data.get('job_requirements', 'No specific requirements provided')
+    }
+
+    def stage_hook(name, status, result):
+        if name == "resume" and status == "running":
+            return  # Already reported before text extraction
+        if on_stage:
+            on_stage(name, status, result)
+        if on_artifact and status == "done" and name in STAGE_ARTIFACTS:
+            on_artifact(STAGE_ARTIFACTS[name], result)
+
+    results = run_stage_graph({
+        "resume": (lambda: resume_stage(resume_text), []),
+        "meeting": (lambda: meeting_stage(data), []),
+        "plan": (lambda resume_analysis, meeting_insights: plan_stage(data, job_details, resume_analysis, meeting_insights, on_artifact),
+                 ["resume", "meeting"]),
+        "challenges": (lambda resume_analysis, meeting_insights: challenges_stage(data, job_details, resume_analysis, meeting_insights, on_artifact),
+                       ["resume", "meeting"]),
+        "excel": (excel_stage, ["plan", "challenges"]),
+    }, on_stage=stage_hook)
+
+    interview_plan = results["plan"]
+    code_challenges = results["challenges"]
+    excel_file = results["excel"]
+
+    # Keep the workbook server-side and hand out a download link instead of embedding it
+    artifact = put_artifact(excel_file['content'], excel_file['name'])
+    excel_response = excel_file_response(artifact)
+    if data.get('inline_excel'):
+        # Legacy clients that still expect the base64 workbook in the body
+        excel_response['content'] = base64.b64encode(excel_file['content']).decode('utf-8')
+
+    # Log the structure for debugging
+    logging.info(f"Interview plan keys: {list(interview_plan.keys())}")
+    logging.info(f"Metadata: {interview_plan.get('metadata', {})}")
+    logging.info(f"Has prioritized_topics: {'prioritized_topics' in interview_plan}")
+    logging.info(f"Code challenges keys: {list(code_challenges.keys()) if code_challenges else 'None'}")
+
+    response_data = {
+        'status': 'success',
+        'candidate_cv_hash': resume_hash,
+        'interview_plan': interview_plan,
+        'code_challenges': code_challenges,
+        'excel_file': excel_response
+    }
+    if data.get('job_profile'):
+        response_data['job_profile_id'] = data['job_profile']['job_profile_id']
+
+    # Kept so that single topics, challenges or the rubric can be regenerated (see /plans)
+    plan = save_plan(job_details, results["resume"], results["meeting"], interview_plan, code_challenges, artifact,
+                     data.get('model_profile'))
+    if plan:
+        response_data['plan_id'] = plan['plan_id']
+
+    return response_data
+
+def excel_file_response(artifact):
+    """Describe a stored workbook for clients: its name and download link."""
+    return {
+        'name': artifact['name'],
+        'artifact_id': artifact['artifact_id'],
+        'download_url': f"/artifacts/{artifact['artifact_id']}",
+        'size': artifact['size'],
+        'expires_at': artifact['expires_at']
+    }
+
+def apply_job_profile(data):
+    """
+    Fill in a request from the job profile it references.
+
+    Fields sent with the request take precedence over the profile's.
+
+    Args:
+        data (dict): Request payload with a job_profile_id
+
+    Returns:
+        dict: Payload with the profile's job fields and the profile itself under "job_profile"
+
+    Raises:
+        PipelineError: If the job profile is unknown
+    """
+    profile = get_job_profile(data['job_profile_id'])
+    if profile is None:
+        raise PipelineError('Unknown job_profile_id. Please create the job profile again.', 400)
+
+    defaults = {key: profile[key] for key in ('job_position', 'job_requirements', 'interview_duration_minutes')
+                if profile.get(key) is not None}
+    return {**defaults, **data, 'job_profile': profile}
+
+def request_payload():
+    """
+    Read the pipeline payload from a JSON body or a multipart/form-data upload.
+
+    Multipart requests carry the CV as the candidate_cv file part, the recording as the
+    meeting_recording file part and the other fields as form fields. File parts are
+    streamed to temp files instead of being held in memory as base64.
+
+    Returns:
+        dict: Payload in the shape run_interview_pipeline expects
+    """
+    if request.mimetype != 'multipart/form-data':
+        data = dict(request.json)
+        # upload_path is set by the server for multipart uploads only
+        for field in ('candidate_cv', 'meeting_recording'):
+            if isinstance(data.get(field), dict):
+                data[field] = {key: value for key, value in data[field].items() if key != 'upload_path'}
+        if data.get('interview_duration_minutes') is not None:
+            data['interview_duration_minutes'] = parse_interview_duration(data['interview_duration_minutes'])
+        if data.get('latency_budget_seconds') is not None:
+            data['latency_budget_seconds'] = parse_latency_budget(data['latency_budget_seconds'])
+        return data
+
+    data = form_payload(request.form)
+
+    # Uploads are copied to paths the pipeline owns, so background jobs can read them
+    # after this request has closed its spooled files
+    for field in ('candidate_cv', 'meeting_recording'):
+        upload = request.files.get(field)
+        if upload and upload.filename:
+            data[field] = {'name': upload.filename, 'upload_path': save_upload(upload, UPLOAD_FOLDER)}
+
+    if request.form.get('candidate_cv_hash') and 'candidate_cv' not in data:
+        data['candidate_cv'] = {'content_hash': request.form['candidate_cv_hash']}
+
+    return data
+
+def form_payload(form):
+    """Read the non-file fields of a multipart/form-data request."""
+    data = {key: form[key] for key in ('meeting_transcript', 'job_requirements', 'job_position', 'job_profile_id', 'model_profile')
+            if form.get(key)}
+    if form.get('interview_duration_minutes'):
+        data['interview_duration_minutes'] = parse_interview_duration(form['interview_duration_minutes'])
+    if form.get('latency_budget_seconds'):
+        data['latency_budget_seconds'] = parse_latency_budget(form['latency_budget_seconds'])
+    for flag in ('include_code_challenges', 'inline_excel'):
+        data[flag] = form.get(flag, '').lower() in ('1', 'true', 'yes', 'on')
+    return data
+
+def parse_interview_duration(value):
+    """
+    Read the interview_duration_minutes field of a request.
+
+    Returns:
+        int: Minutes
+
+    Raises:
+        PipelineError: If the value isn't a positive whole number (400)
+    """
+    try:
+        if isinstance(value, bool):
+            raise ValueError(value)
+        minutes = float(value)
+    except (TypeError, ValueError):
+        minutes = None
+    if minutes is None or not math.isfinite(minutes) or minutes <= 0 or not minutes.is_integer():
+        raise PipelineError('interview_duration_minutes must be a positive whole number of minutes', 400)
+    return int(minutes)
+
+def parse_latency_budget(value):
+    """
+    Read the latency_budget_seconds field of a request.
+
+    Returns:
+        float: Seconds, 0 for no budget
+
+    Raises:
+        PipelineError: If the value isn't a non-negative number (400)
+    """
+    try:
+        if isinstance(value, bool):
+            raise ValueError(value)
+        seconds = float(value)
+    except (TypeError, ValueError):
+        seconds = None
+    if seconds is None or not math.isfinite(seconds) or seconds < 0:
+        raise PipelineError('latency_budget_seconds must be a non-negative number of seconds', 400)
+    return seconds
+
+def remove_uploads(data):
+    """Delete the temp files of multipart uploads once the pipeline is done with them."""
+    for field in ('candidate_cv', 'meeting_recording'):
+        upload = (data or {}).get(field)
+        if isinstance(upload, dict) and upload.get('upload_path'):
+            remove_file(upload['upload_path'])
+
 @app.route('/generate_interview_plan', methods=['POST'])
 def generate_interview_plan_endpoint():
     """
     Main endpoint for generating interview preparation plan.
 
+    Accepts multipart/form-data as well (see request_payload): the candidate_cv and
+    meeting_recording file parts are streamed to disk instead of sent as base64.
+
     Expected JSON payload:
     {
         "candidate_cv": {
             "name": "resume.pdf",
-            "content": "base64_encoded_content"
+            "content": "base64_encoded_content"  // or "content_hash" of an earlier upload
         },
         "meeting_recording": {
             "name": "meeting.mp3",  // optional if transcript provided
             "content": "base64_encoded_content"
         },
         "meeting_transcript": "text transcript...",  // alternative to recording
+        "job_profile_id": "...",  // alternative to the meeting and job fields, see /job_profiles
         "job_requirements": "...",
         "job_position": "Senior .NET Developer",
-        "interview_duration_minutes": 30
+        "interview_duration_minutes": 30,
+        "model_profile": "fast",  // optional routing profile (default, fast)
+        "latency_budget_seconds": 60,  // optional: downgrade to faster models when the budget runs out
+        "inline_excel": false  // also embed the workbook as base64 (download_url is always returned)
     }
     """
     try:
         logging.info("Received interview plan generation request")
-        data = request.json
+        response_data = run_interview_pipeline(request_payload())
 
-        # 1. Process Resume
-        logging.info("Step 1: Processing resume")
-        resume = data.get('candidate_cv', {})
-        if not resume.get('content'):
-            return jsonify({'status': 'error', 'message': 'Resume is required'}), 400
+        logging.info("Interview plan generated successfully")
+        return jsonify(response_data), 200
 
-        # Extract text from resume file (supports TXT, PDF, DOC, DOCX)
-        resume_bytes = base64.b64decode(resume['content'])
-        resume_filename = resume.get('name', 'resume.txt')
+    except PipelineError as e:
+        return jsonify({'status': 'error', 'message': e.message}), e.status_code
 
-        resume_text = extract_text_from_file(resume_bytes, resume_filename)
+    except Exception as e:
+        logging.error(f"Error generating interview plan: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
 
-        if not resume_text or len(resume_text.strip()) < 10:
-            logging.error(f"Resume text is too short or empty. Length: {len(resume_text) if resume_text else 0}")
-            return jsonify({'status': 'error', 'message': 'Resume file appears to be empty or contains insufficient text. Please provide a resume with at least some content.'}), 400
+@app.route('/generate_interview_plan/jobs', methods=['POST'])
+def submit_interview_plan_job_endpoint():
+    """
+    Queue interview plan generation as a background job and return its ID immediately.
 
-        logging.info(f"Resume text extracted successfully. Length: {len(resume_text)} characters")
-        resume_analysis = process_resume(resume_text)
+    Accepts the same JSON payload as /generate_interview_plan. Poll the returned
+    status_url for progress and the result.
+    """
+    data = request_payload()
+    try:
+        job_id = job_manager.submit(run_interview_pipeline, data)
+    except JobQueueFull as e:
+        logging.warning(f"Rejected interview plan job: {str(e)}")
+        remove_uploads(data)
+        return jsonify({'status': 'error', 'message': 'Too many interview plans are being generated. Please try again shortly.'}), 503
 
-        if "error" in resume_analysis:
-            return jsonify({'status': 'error', 'message': resume_analysis['error']}), 500
+    return jsonify({
+        'status': 'success',
+        'job_id': job_id,
+        'status_url': f"/jobs/{job_id}"
+    }), 202
 
-        # 2. Process Meeting Recording or Transcript
-        logging.info("Step 2: Processing meeting information")
-        meeting_insights = {}
+def format_sse(event, data):
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-        if data.get('meeting_transcript'):
-            # Use provided transcript
-            transcript_text = data.get('meeting_transcript')
-            meeting_insights = extract_meeting_insights(transcript_text)
-        elif data.get('meeting_recording'):
-            # Transcribe recording
-            recording = data.get('meeting_recording', {})
-            file_extension = recording.get('name', 'audio.mp3').split('.')[-1]
+@app.route('/generate_interview_plan/stream', methods=['POST'])
+def stream_interview_plan_endpoint():
+    """
+    Generate an interview plan and stream each artifact as Server-Sent Events as soon as it exists.
 
-            meeting_data = process_meeting_recording(
-                recording.get('content'),
-                is_base64=True,
-                file_extension=file_extension
+    Accepts the same JSON payload as /generate_interview_plan. Events, in rough order:
+        job               {"job_id"} - the stream is also backed by a pollable job
+        stage             {"name", "status"} for every stage transition
+        resume_analysis   resume analysis
+        meeting_insights  meeting insights
+        topic             one prioritized topic with its questions, as soon as it is generated
+        topics            all prioritized topics, final time allocations included
+        code_challenge    {"kind", "challenge"}, once per generated challenge
+        complete          same body as /generate_interview_plan, including the workbook
+        error             {"message", "status_code"}
+    """
+    data = request_payload()
+    events = queue.Queue()
+
+    def run_streamed_pipeline(on_stage):
+        def stage_hook(name, status, result):
+            on_stage(name, status, result)
+            events.put(("stage", {"name": name, "status": status}))
+
+        try:
+            response_data = run_interview_pipeline(
+                data,
+                on_stage=stage_hook,
+                on_artifact=lambda name, payload: events.put((name, payload))
             )
+            events.put(("complete", response_data))
+            return response_data
+        except PipelineError as e:
+            events.put(("error", {"message": e.message, "status_code": e.status_code}))
+            raise
+        except Exception as e:
+            logging.error(f"Error streaming interview plan: {str(e)}")
+            events.put(("error", {"message": str(e), "status_code": 500}))
+            raise
 
-            if "error" in meeting_data:
-                return jsonify({'status': 'error', 'message': meeting_data['error']}), 500
+    try:
+        job_id = job_manager.submit(run_streamed_pipeline)
+    except JobQueueFull as e:
+        logging.warning(f"Rejected interview plan stream: {str(e)}")
+        remove_uploads(data)
+        return jsonify({'status': 'error', 'message': 'Too many interview plans are being generated. Please try again shortly.'}), 503
 
-            meeting_insights = meeting_data.get('insights', {})
-        else:
-            # No meeting data, use defaults
-            meeting_insights = {
-                "job_requirements": data.get('job_requirements', ''),
-                "interview_duration_minutes": data.get('interview_duration_minutes', 30),
-                "topics_to_cover": [],
-                "code_challenge_needed": True
-            }
-
-        # 3. Get Job Details
-        logging.info("Step 3: Processing job details")
-        job_position = data.get('job_position', '')
-
-        job_details = {
-            "title": job_position or "Position",
-            "description": data.get('job_requirements', 'No specific requirements provided')
+    def generate():
+        yield format_sse("job", {"job_id": job_id})
+        while True:
+            try:
+                event, payload = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+
+            yield format_sse(event, payload)
+            if event in ("complete", "error"):
+                break
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job_endpoint(job_id):
+    """
+    Report a background job's progress.
+
+    The response lists every pipeline stage with its status (pending, running,
+    done or failed) and, once the job has finished, the result or error message.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+
+    response_data = {
+        'status': 'success',
+        'job_id': job_id,
+        'state': job['state'],
+        'stages': [{'name': name, 'status': job['stages'][name]} for name in PIPELINE_STAGES],
+        'current_stages': job['current_stages']
+    }
+
+    if job['state'] == 'succeeded':
+        response_data['result'] = job['result']
+    elif job['state'] == 'failed':
+        error = job['error']
+        response_data['error'] = {
+            'message': error.message if isinstance(error, PipelineError) else str(error),
+            'status_code': error.status_code if isinstance(error, PipelineError) else 500
         }
 
-        # 4. Generate Interview Plan
-        logging.info("Step 4: Generating interview plan")
-        interview_duration = data.get('interview_duration_minutes',
-                                     meeting_insights.get('interview_duration_minutes', 30))
+    return jsonify(response_data), 200
 
-        interview_plan = create_complete_interview_plan(
-            resume_analysis,
-            {'insights': meeting_insights},
-            job_details,
-            interview_duration
+@app.route('/artifacts/<artifact_id>', methods=['GET'])
+def download_artifact_endpoint(artifact_id):
+    """Download a generated file, with ETag and range request support."""
+    artifact = get_artifact(artifact_id)
+    if artifact is None:
+        return jsonify({'status': 'error', 'message': 'File not found or expired'}), 404
+
+    return send_artifact(artifact)
+
+def send_artifact(artifact):
+    """Send a stored file as a download, with ETag and range request support."""
+    return send_file(
+        io.BytesIO(artifact['content']),
+        mimetype=artifact['mimetype'],
+        as_attachment=True,
+        download_name=artifact['name'],
+        conditional=True,
+        etag=artifact['etag'],
+        last_modified=artifact['created_at'],
+        max_age=int(max(artifact['expires_at'] - time.time(), 0))
+    )
+
+def create_profile_from_payload(data):
+    """
+    Create a job profile from the job and meeting fields of a request payload.
+
+    Returns:
+        dict: The stored job profile
+
+    Raises:
+        PipelineError: If the meeting couldn't be analyzed
+    """
+    meeting_insights = meeting_stage(data)
+    if 'error' in meeting_insights:
+        raise PipelineError(meeting_insights['error'])
+
+    return create_job_profile(
+        data.get('job_position', ''),
+        data.get('job_requirements', ''),
+        meeting_insights,
+        data.get('interview_duration_minutes')
+    )
+
+@app.route('/job_profiles', methods=['POST'])
+def create_job_profile_endpoint():
+    """
+    Analyze a job once so that many candidates can be planned against it.
+
+    Takes the job and meeting fields of /generate_interview_plan (job_position,
+    job_requirements, interview_duration_minutes and meeting_transcript or
+    meeting_recording), extracts the meeting insights and stores them. Plan requests
+    that send the returned job_profile_id skip meeting processing.
+    """
+    data = request_payload()
+    try:
+        profile = create_profile_from_payload(data)
+        return jsonify({'status': 'success', **profile}), 201
+
+    except PipelineError as e:
+        return jsonify({'status': 'error', 'message': e.message}), e.status_code
+
+    except Exception as e:
+        logging.error(f"Error creating job profile: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+    finally:
+        remove_uploads(data)
+
+@app.route('/job_profiles/<job_profile_id>', methods=['GET'])
+def get_job_profile_endpoint(job_profile_id):
+    """Look up a job profile."""
+    profile = get_job_profile(job_profile_id)
+    if profile is None:
+        return jsonify({'status': 'error', 'message': 'Job profile not found'}), 404
+
+    return jsonify({'status': 'success', **profile}), 200
+
+@app.route('/job_profiles/<job_profile_id>', methods=['DELETE'])
+def delete_job_profile_endpoint(job_profile_id):
+    """Delete a job profile once its campaign is over."""
+    if not delete_job_profile(job_profile_id):
+        return jsonify({'status': 'error', 'message': 'Job profile not found'}), 404
+
+    return jsonify({'status': 'success', 'job_profile_id': job_profile_id}), 200
+
+def batch_request():
+    """
+    Read a batch request from a JSON body or a multipart/form-data upload.
+
+    JSON bodies list the CVs under "candidates" ({"name", "content"} or {"content_hash"}
+    each); multipart requests send one candidate_cv file part per CV. The job fields are
+    the same as for /generate_interview_plan.
+
+    Returns:
+        tuple: (job payload, list of candidate_cv dicts)
+    """
+    if request.mimetype != 'multipart/form-data':
+        data = request_payload()
+        if data.get('concurrency') is not None:
+            data['concurrency'] = parse_batch_concurrency(data['concurrency'])
+        candidates = [{key: cv[key] for key in ('name', 'content', 'content_hash') if key in cv}
+                      for cv in data.pop('candidates', []) if isinstance(cv, dict)]
+        return data, candidates
+
+    data = form_payload(request.form)
+    if request.form.get('concurrency'):
+        data['concurrency'] = parse_batch_concurrency(request.form['concurrency'])
+    recording = request.files.get('meeting_recording')
+    if recording and recording.filename:
+        data['meeting_recording'] = {'name': recording.filename, 'upload_path': save_upload(recording, UPLOAD_FOLDER)}
+
+    candidates = [{'name': upload.filename, 'upload_path': save_upload(upload, UPLOAD_FOLDER)}
+                  for upload in request.files.getlist('candidate_cv') if upload.filename]
+    return data, candidates
+
+def parse_batch_concurrency(value):
+    """
+    Read the concurrency field of a batch request.
+
+    Requests may lower the concurrency, not raise it: values above BATCH_CONCURRENCY
+    are clamped to it.
+
+    Returns:
+        int: Candidates processed at the same time
+
+    Raises:
+        PipelineError: If the value isn't a positive whole number (400)
+    """
+    try:
+        if isinstance(value, bool):
+            raise ValueError(value)
+        concurrency = float(value)
+    except (TypeError, ValueError):
+        concurrency = None
+    if concurrency is None or not math.isfinite(concurrency) or concurrency < 1 or not concurrency.is_integer():
+        raise PipelineError('concurrency must be a positive whole number', 400)
+    return min(int(concurrency), BATCH_CONCURRENCY)
+
+def run_batch_job(data, candidates, on_stage=None):
+    """Analyze the job once, then generate every candidate's plan (runs on batch_manager)."""
+    try:
+        on_stage("job_profile", "running", None)
+        job_profile_id = data.get('job_profile_id') or create_profile_from_payload(data)['job_profile_id']
+        on_stage("job_profile", "done", job_profile_id)
+
+        on_stage("candidates", "running", None)
+        summary = run_batch(
+            run_pipeline_stages,
+            candidates,
+            {'job_profile_id': job_profile_id, 'include_code_challenges': data.get('include_code_challenges', False),
+             'model_profile': data.get('model_profile'), 'latency_budget_seconds': data.get('latency_budget_seconds')},
+            max_concurrency=data.get('concurrency') or BATCH_CONCURRENCY
         )
+        on_stage("candidates", "done", summary)
 
-        if "error" in interview_plan:
-            return jsonify({'status': 'error', 'message': interview_plan['error']}), 500
-
-        # 5. Generate Code Challenges (only if requested)
-        logging.info("Step 5: Generating code challenges")
-        include_code_challenges = data.get('include_code_challenges', False)
-        if include_code_challenges:
-            code_challenges = create_challenge_suite(
-                job_details,
-                resume_analysis,
-                {'insights': meeting_insights}
-            )
-        else:
-            code_challenges = {"coding_challenges": [], "system_design": None, "debugging_challenge": None}
-            logging.info("Code challenges skipped - not requested by user")
+        return {'status': 'success', 'job_profile_id': job_profile_id, **summary}
+    finally:
+        remove_uploads(data)
+        for candidate in candidates:
+            if candidate.get('upload_path'):
+                remove_file(candidate['upload_path'])
+
+@app.route('/batch', methods=['POST'])
+def submit_batch_endpoint():
+    """
+    Generate interview plans for many candidates against one job, as a background job.
+
+    Takes the job fields of /generate_interview_plan (or a job_profile_id) plus many
+    CVs (see batch_request). The job is analyzed once, then BATCH_CONCURRENCY
+    candidates are processed at a time; poll the returned status_url for the summary
+    with each candidate's download_url.
+    """
+    data, candidates = batch_request()
+    if not candidates:
+        remove_uploads(data)
+        return jsonify({'status': 'error', 'message': 'At least one candidate CV is required'}), 400
 
-        # 6. Generate Excel File
-        logging.info("Step 6: Generating Excel file")
-        excel_path = create_interview_excel(interview_plan, code_challenges)
+    try:
+        job_id = batch_manager.submit(run_batch_job, data, candidates)
+    except JobQueueFull as e:
+        logging.warning(f"Rejected batch: {str(e)}")
+        remove_uploads(data)
+        for candidate in candidates:
+            if candidate.get('upload_path'):
+                remove_file(candidate['upload_path'])
+        return jsonify({'status': 'error', 'message': 'Too many batches are being processed. Please try again later.'}), 503
 
-        if not excel_path:
-            return jsonify({'status': 'error', 'message': 'Failed to generate Excel file'}), 500
+    return jsonify({
+        'status': 'success',
+        'job_id': job_id,
+        'candidates': len(candidates),
+        'status_url': f"/batch/{job_id}"
+    }), 202
 
-        # Read Excel file as base64 for sending to frontend
-        with open(excel_path, 'rb') as f:
-            excel_content = base64.b64encode(f.read()).decode('utf-8')
+@app.route('/batch/<job_id>', methods=['GET'])
+def get_batch_endpoint(job_id):
+    """Report a batch's progress and, once finished, its summary."""
+    job = batch_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Batch not found'}), 404
 
-        # Clean up Excel file
-        try:
-            os.remove(excel_path)
-        except:
-            pass
-
-        response_data = {
-            'status': 'success',
-            'interview_plan': interview_plan,
-            'code_challenges': code_challenges,
-            'excel_file': {
-                'name': os.path.basename(excel_path),
-                'content': excel_content
-            }
+    response_data = {
+        'status': 'success',
+        'job_id': job_id,
+        'state': job['state'],
+        'stages': [{'name': name, 'status': job['stages'][name]} for name in BATCH_STAGES]
+    }
+
+    if job['state'] == 'succeeded':
+        response_data['result'] = job['result']
+    elif job['state'] == 'failed':
+        error = job['error']
+        response_data['error'] = {
+            'message': error.message if isinstance(error, PipelineError) else str(error),
+            'status_code': error.status_code if isinstance(error, PipelineError) else 500
         }
 
-        # Log the structure for debugging
-        logging.info(f"Interview plan keys: {list(interview_plan.keys())}")
-        logging.info(f"Metadata: {interview_plan.get('metadata', {})}")
-        logging.info(f"Has prioritized_topics: {'prioritized_topics' in interview_plan}")
-        logging.info(f"Code challenges keys: {list(code_challenges.keys()) if code_challenges else 'None'}")
+    return jsonify(response_data), 200
 
-        logging.info("Interview plan generated successfully")
-        return jsonify(response_data), 200
+def plan_response(plan, **changed):
+    """Response body for a stored plan, with its workbook's download link."""
+    artifact = plan_workbook(plan)
+    return {
+        'status': 'success',
+        'plan_id': plan['plan_id'],
+        'revision': plan['revision'],
+        **changed,
+        'interview_plan': plan['interview_plan'],
+        'code_challenges': plan['code_challenges'],
+        'excel_file': excel_file_response(artifact) if artifact else None
+    }
+
+def stored_plan(plan_id):
+    """Look up a stored plan, raising PipelineError (404) if it is unknown or expired."""
+    plan = get_plan(plan_id)
+    if plan is None:
+        raise PipelineError('Plan not found or expired', 404)
+    return plan
+
+def checked_edit(updated):
+    """Return the plan updated by a plan edit, raising PipelineError if the edit failed."""
+    if "error" in updated:
+        raise PipelineError(updated['error'])
+    return updated
+
+@app.route('/plans/<plan_id>', methods=['GET'])
+def get_plan_endpoint(plan_id):
+    """Look up a generated plan by the plan_id returned with it."""
+    try:
+        return jsonify(plan_response(stored_plan(plan_id))), 200
+
+    except PipelineError as e:
+        return jsonify({'status': 'error', 'message': e.message}), e.status_code
+
+@app.route('/plans/<plan_id>/workbook', methods=['GET'])
+def download_plan_workbook_endpoint(plan_id):
+    """
+    Download a plan's workbook.
+
+    Unlike /artifacts/<artifact_id>, this link lasts as long as the plan: an expired or
+    evicted workbook is rebuilt from the stored plan, without LLM calls.
+    """
+    try:
+        artifact = plan_workbook(stored_plan(plan_id))
+        artifact = get_artifact(artifact['artifact_id']) if artifact else None
+        if artifact is None:
+            raise PipelineError('Failed to generate Excel file')
+        return send_artifact(artifact)
+
+    except PipelineError as e:
+        return jsonify({'status': 'error', 'message': e.message}), e.status_code
+
+@app.route('/plans/<plan_id>/topics/<int:topic_index>/questions', methods=['POST'])
+def regenerate_topic_questions_endpoint(plan_id, topic_index):
+    """
+    Regenerate the questions of one prioritized topic, with a single LLM call.
+
+    Optional JSON body: {"num_questions": 4} (3-5, defaults to the topic's current number).
+    Only the Questions and Evaluation sheets of the workbook are re-rendered; its
+    download_url stays the same.
+    """
+    body = request.get_json(silent=True) or {}
+    try:
+        plan = stored_plan(plan_id)
+        if topic_index >= len(plan['interview_plan'].get('prioritized_topics', [])):
+            raise PipelineError('Topic not found', 404)
+        try:
+            num_questions = int(body['num_questions']) if body.get('num_questions') else None
+        except (TypeError, ValueError):
+            raise PipelineError('num_questions must be a number', 400)
+
+        plan = checked_edit(regenerate_topic_questions(plan, topic_index, num_questions))
+        topic = plan['interview_plan']['prioritized_topics'][topic_index]
+        return jsonify(plan_response(plan, topic=topic)), 200
+
+    except PipelineError as e:
+        return jsonify({'status': 'error', 'message': e.message}), e.status_code
 
     except Exception as e:
-        logging.error(f"Error generating interview plan: {str(e)}")
+        logging.error(f"Error regenerating topic questions: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/plans/<plan_id>/challenges/<kind>', methods=['POST'])
+@app.route('/plans/<plan_id>/challenges/<kind>/<int:index>', methods=['POST'])
+def regenerate_challenge_endpoint(plan_id, kind, index=0):
+    """
+    Regenerate one code challenge, with a single LLM call.
+
+    kind is "coding" (index picks the coding challenge, 0 by default), "system_design"
+    or "debugging". A new coding challenge re-renders only the Code Challenges sheet;
+    the other kinds aren't in the workbook, which is left as it is.
+    """
+    try:
+        if kind not in CHALLENGE_KINDS:
+            raise PipelineError(f"Unknown challenge kind. Available: {', '.join(CHALLENGE_KINDS)}", 404)
+        plan = stored_plan(plan_id)
+        if kind == "coding" and index >= len(plan['code_challenges'].get('coding_challenges', [])):
+            raise PipelineError('Coding challenge not found', 404)
+
+        plan = checked_edit(regenerate_challenge(plan, kind, index))
+        challenges = plan['code_challenges']
+        challenge = challenges['coding_challenges'][index] if kind == "coding" else challenges[CHALLENGE_KINDS[kind]]
+        return jsonify(plan_response(plan, challenge=challenge)), 200
+
+    except PipelineError as e:
+        return jsonify({'status': 'error', 'message': e.message}), e.status_code
+
+    except Exception as e:
+        logging.error(f"Error regenerating {kind} challenge: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+@app.route('/plans/<plan_id>/rubric', methods=['POST'])
+def regenerate_rubric_endpoint(plan_id):
+    """Regenerate the evaluation rubric with a single LLM call, re-rendering only the Evaluation sheet."""
+    try:
+        plan = checked_edit(regenerate_rubric(stored_plan(plan_id)))
+        return jsonify(plan_response(plan, evaluation_rubric=plan['interview_plan']['evaluation_rubric'])), 200
+
+    except PipelineError as e:
+        return jsonify({'status': 'error', 'message': e.message}), e.status_code
+
+    except Exception as e:
+        logging.error(f"Error regenerating evaluation rubric: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/llm/status', methods=['GET'])
+def llm_status_endpoint():
+    """Report OpenAI requests in flight and waiting for rate limit capacity."""
+    return jsonify({'status': 'success', **governor.stats()}), 200
+
+registry.register(Gauge("llm_in_flight_requests", "OpenAI requests in flight.", lambda: governor.stats()["in_flight"]))
+registry.register(Gauge("llm_queue_depth", "OpenAI requests waiting for rate limit capacity or an in-flight slot.", governor.queue_depth))
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Expose stage latencies, LLM call latencies, tokens and cost in the Prometheus text format."""
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/documents/<content_hash>', methods=['GET'])
+def get_document_endpoint(content_hash):
+    """Look up the extracted text of a previously uploaded document by its SHA-256 content hash."""
+    document = get_document(content_hash)
+    if document is None:
+        return jsonify({'status': 'error', 'message': 'Document not found'}), 404
+
+    return jsonify({'status': 'success', **document}), 200
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import hashlib
+import logging
+import os
+import time
+import uuid
+from dotenv import load_dotenv
+from cache_backends import MemoryLRUBackend
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# How long generated files stay downloadable, and how many are kept at most
+ARTIFACT_TTL_SECONDS = float(os.getenv("ARTIFACT_TTL_SECONDS", "3600"))
+ARTIFACT_MAX_ENTRIES = int(os.getenv("ARTIFACT_MAX_ENTRIES", "200"))
+
+artifacts = MemoryLRUBackend(max_entries=ARTIFACT_MAX_ENTRIES, ttl_seconds=ARTIFACT_TTL_SECONDS)
+
+def put_artifact(content, filename, mimetype=XLSX_MIMETYPE, artifact_id=None):
+    """
+    Keep a generated file available for download.
+
+    Args:
+        content (bytes): File content
+        filename (str): Name offered to the browser when downloading
+        mimetype (str): Content type of the file
+        artifact_id (str): ID to store the file under; a new one if omitted. Storing under an
+            existing ID replaces that file, so its download link stays the same
+
+    Returns:
+        dict: Artifact metadata: artifact_id, name, size, etag and expires_at (epoch seconds)
+    """
+    artifact_id = artifact_id or uuid.uuid4().hex
+    created_at = time.time()
+    artifact = {
+        "artifact_id": artifact_id,
+        "name": filename,
+        "mimetype": mimetype,
+        "size": len(content),
+        "etag": hashlib.sha256(content).hexdigest(),
+        "created_at": created_at,
+        "expires_at": created_at + ARTIFACT_TTL_SECONDS,
+        "content": content
+    }
+    artifacts.set(artifact_id, artifact)
+    logging.info(f"Stored artifact {artifact_id} ({filename}, {len(content)} bytes)")
+
+    return {key: value for key, value in artifact.items() if key != "content"}
+
+def get_artifact(artifact_id):
+    """
+    Look up a stored artifact.
+
+    Args:
+        artifact_id (str): ID returned by put_artifact()
+
+    Returns:
+        dict: Artifact metadata plus its "content" bytes, or None if unknown or expired
+    """
+    return artifacts.get(artifact_id)
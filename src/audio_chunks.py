@@ -0,0 +1,142 @@
+import logging
+import os
+import re
+import shutil
+import subprocess
+from dotenv import load_dotenv
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Whisper rejects uploads above 25 MB
+WHISPER_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+
+# Recordings longer than one window are split into overlapping windows that are
+# transcribed concurrently; the overlap keeps words cut at a boundary intact in one of them
+TRANSCRIBE_CHUNK_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", "600"))
+TRANSCRIBE_CHUNK_OVERLAP_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_OVERLAP_SECONDS", "5"))
+
+def ffmpeg_available():
+    """Return True if the ffmpeg and ffprobe binaries needed for splitting are on PATH."""
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+def probe_duration(path):
+    """
+    Read the duration of an audio/video file with ffprobe.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        float: Duration in seconds, or None if it can't be determined
+    """
+    try:
+        output = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+            capture_output=True, text=True, check=True, timeout=60
+        ).stdout.strip()
+        return float(output)
+    except (subprocess.SubprocessError, ValueError, OSError) as e:
+        logging.warning(f"Could not read duration of {path}: {str(e)}")
+        return None
+
+def plan_windows(duration, chunk_seconds=TRANSCRIBE_CHUNK_SECONDS, overlap_seconds=TRANSCRIBE_CHUNK_OVERLAP_SECONDS):
+    """
+    Split a recording into overlapping time windows.
+
+    Args:
+        duration (float): Length of the recording in seconds
+        chunk_seconds (float): Length of each window
+        overlap_seconds (float): How far each window reaches back into the previous one
+
+    Returns:
+        list: (start, end) tuples in seconds, in order
+    """
+    step = max(chunk_seconds - overlap_seconds, 1.0)
+    windows = []
+    start = 0.0
+    while True:
+        end = min(start + chunk_seconds, duration)
+        windows.append((start, end))
+        if end >= duration:
+            return windows
+        start += step
+
+def cut_window(path, start, end, output_dir, index):
+    """
+    Cut one window out of a recording as a compact mono MP3.
+
+    Args:
+        path (str): Source recording
+        start (float): Window start in seconds
+        end (float): Window end in seconds
+        output_dir (str): Directory for the chunk file
+        index (int): Window number, used in the file name
+
+    Returns:
+        str: Path of the chunk file
+    """
+    chunk_path = os.path.join(output_dir, f"chunk_{index:04d}.mp3")
+    # 16 kHz mono at 64 kbit/s is what Whisper works at anyway and keeps
+    # a ten-minute window around 5 MB
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}", "-i", path,
+         "-vn", "-ac", "1", "-ar", "16000", "-b:a", "64k", chunk_path],
+        check=True, capture_output=True, timeout=600
+    )
+    return chunk_path
+
+def segment_to_dict(segment):
+    """Return a Whisper segment (SDK object or dict) as a plain dict."""
+    if isinstance(segment, dict):
+        return dict(segment)
+    if hasattr(segment, "model_dump"):
+        return segment.model_dump()
+    return dict(vars(segment))
+
+def normalize_text(text):
+    """Lower-case a segment's text and drop punctuation, for overlap comparison."""
+    return re.sub(r"[^\w\s]", "", text or "").lower().split()
+
+def merge_window_segments(windows, window_segments):
+    """
+    Merge the segments of overlapping windows into one timeline.
+
+    Timestamps are shifted by each window's start. In the overlap between two windows,
+    segments are taken from the earlier window before the overlap's midpoint and from
+    the later one after it, and a segment repeating the text of the one just kept
+    is dropped.
+
+    Args:
+        windows (list): (start, end) tuples from plan_windows()
+        window_segments (list): Segment lists returned by Whisper, one per window
+
+    Returns:
+        list: Segment dicts with absolute timestamps and sequential ids
+    """
+    merged = []
+    for index, ((start, end), segments) in enumerate(zip(windows, window_segments)):
+        # Midpoints of the overlaps with the previous and next window
+        lower = (start + windows[index - 1][1]) / 2 if index > 0 else float("-inf")
+        upper = (windows[index + 1][0] + end) / 2 if index + 1 < len(windows) else float("inf")
+
+        for segment in segments:
+            segment = segment_to_dict(segment)
+            segment["start"] = segment.get("start", 0.0) + start
+            segment["end"] = segment.get("end", 0.0) + start
+
+            midpoint = (segment["start"] + segment["end"]) / 2
+            if not lower <= midpoint < upper:
+                continue
+            if merged and normalize_text(segment.get("text")) == normalize_text(merged[-1].get("text")):
+                continue
+
+            merged.append(segment)
+
+    for new_id, segment in enumerate(merged):
+        segment["id"] = new_id
+
+    return merged
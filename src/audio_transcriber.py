@@ -1,8 +1,22 @@
-import openai
+import contextvars
 import os
 import logging
+import time
 from dotenv import load_dotenv
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from audio_chunks import (
+    TRANSCRIBE_CHUNK_OVERLAP_SECONDS, TRANSCRIBE_CHUNK_SECONDS, WHISPER_MAX_UPLOAD_BYTES, cut_window,
+    ffmpeg_available, merge_window_segments, plan_windows, probe_duration, segment_to_dict
+)
+from document_store import compute_content_hash
+from llm_cache import cached_chat_completion
+from llm_client import client
+from metrics import record_llm_call
+from model_routing import route_for
+from prompt_templates import PromptTemplate
+from transcript_chunks import estimate_tokens, merge_insights, split_transcript
+from transcript_store import get_insights, get_transcript, make_insights_key, make_transcript_key, store_insights, store_transcript
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,29 +24,52 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Load environment variables from .env file (project root)
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
-# Initialize the OpenAI client
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Number of windows of a long recording transcribed at the same time
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "4"))
+
+# Transcripts above this size are analyzed in chunks of at most this many tokens,
+# several chunks at a time
+INSIGHTS_CHUNK_TOKENS = int(os.getenv("INSIGHTS_CHUNK_TOKENS", "6000"))
+INSIGHTS_MAP_WORKERS = int(os.getenv("INSIGHTS_MAP_WORKERS", "4"))
+
+# Everything that changes a transcript; part of the transcript store key
+TRANSCRIPTION_PARAMS = {
+    "model": "whisper-1",
+    "language": "en",
+    "chunk_seconds": TRANSCRIBE_CHUNK_SECONDS,
+    "chunk_overlap_seconds": TRANSCRIBE_CHUNK_OVERLAP_SECONDS
+}
 
 def transcribe_audio(audio_file_path):
     """
     Transcribe audio/video file using OpenAI Whisper API.
 
+    Recordings longer than TRANSCRIBE_CHUNK_SECONDS or larger than the Whisper upload
+    limit are split into overlapping windows and transcribed concurrently when ffmpeg
+    is available (see transcribe_in_chunks).
+
     Args:
-        audio_file_path (str): Path to the audio/video file
+        audio_file_path (str or file): Path to the audio/video file, or an open binary
+            file object (its name attribute should carry the file extension)
 
     Returns:
         dict: Transcription result with text and metadata
     """
-    logging.info(f"Starting transcription for file: {audio_file_path}")
+    logging.info(f"Starting transcription for file: {getattr(audio_file_path, 'name', audio_file_path)}")
 
     try:
-        with open(audio_file_path, 'rb') as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="verbose_json",
-                language="en"  # Can be auto-detected if not specified
-            )
+        duration = None
+        if isinstance(audio_file_path, str):
+            duration = split_duration(audio_file_path)
+
+        if duration:
+            return transcribe_in_chunks(audio_file_path, duration)
+
+        if isinstance(audio_file_path, str):
+            with open(audio_file_path, 'rb') as audio_file:
+                transcript = request_transcription(audio_file)
+        else:
+            transcript = request_transcription(audio_file_path)
 
         logging.info("Transcription completed successfully")
 
@@ -40,13 +77,85 @@ def transcribe_audio(audio_file_path):
             "text": transcript.text,
             "language": transcript.language if hasattr(transcript, 'language') else "en",
             "duration": transcript.duration if hasattr(transcript, 'duration') else None,
-            "segments": transcript.segments if hasattr(transcript, 'segments') else []
+            "segments": [segment_to_dict(segment) for segment in getattr(transcript, 'segments', None) or []]
         }
 
     except Exception as e:
         logging.error(f"Error during transcription: {str(e)}")
         return {"error": f"Transcription failed: {str(e)}"}
 
+def split_duration(audio_file_path):
+    """
+    Decide whether a recording should be transcribed in windows.
+
+    Args:
+        audio_file_path (str): Path to the audio/video file
+
+    Returns:
+        float: Duration of the recording in seconds if it should be split, otherwise None
+    """
+    too_large = os.path.getsize(audio_file_path) > WHISPER_MAX_UPLOAD_BYTES
+    if not ffmpeg_available():
+        if too_large:
+            logging.warning("Recording exceeds the Whisper upload limit and ffmpeg is not installed to split it")
+        return None
+
+    duration = probe_duration(audio_file_path)
+    if duration and (too_large or duration > TRANSCRIBE_CHUNK_SECONDS):
+        return duration
+    return None
+
+def transcribe_in_chunks(audio_file_path, duration):
+    """
+    Transcribe a long recording as overlapping windows, several at a time.
+
+    Args:
+        audio_file_path (str): Path to the audio/video file
+        duration (float): Length of the recording in seconds
+
+    Returns:
+        dict: Transcription result with text and metadata; segment timestamps are
+            relative to the whole recording and the overlap between windows is removed
+    """
+    windows = plan_windows(duration)
+    logging.info(f"Transcribing {duration:.0f}s recording in {len(windows)} windows")
+
+    with tempfile.TemporaryDirectory(prefix="transcribe_") as chunk_dir:
+        def transcribe_window(index):
+            start, end = windows[index]
+            chunk_path = cut_window(audio_file_path, start, end, chunk_dir, index)
+            with open(chunk_path, 'rb') as chunk_file:
+                return request_transcription(chunk_file)
+
+        with ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS, thread_name_prefix="whisper") as executor:
+            transcripts = list(executor.map(transcribe_window, range(len(windows))))
+
+    segments = merge_window_segments(windows, [getattr(transcript, 'segments', None) or [] for transcript in transcripts])
+    logging.info("Transcription completed successfully")
+
+    return {
+        "text": " ".join(segment.get("text", "").strip() for segment in segments),
+        "language": getattr(transcripts[0], 'language', "en"),
+        "duration": duration,
+        "segments": segments
+    }
+
+def request_transcription(audio_file):
+    """Send one open audio file to Whisper."""
+    started = time.monotonic()
+    try:
+        transcript = client.audio.transcriptions.create(
+            model=TRANSCRIPTION_PARAMS["model"],
+            file=audio_file,
+            response_format="verbose_json",
+            language=TRANSCRIPTION_PARAMS["language"]  # Can be auto-detected if not specified
+        )
+    except Exception:
+        record_llm_call("transcription", TRANSCRIPTION_PARAMS["model"], time.monotonic() - started, cache_hit=False, status="error")
+        raise
+    record_llm_call("transcription", TRANSCRIPTION_PARAMS["model"], time.monotonic() - started, cache_hit=False)
+    return transcript
+
 def transcribe_from_base64(base64_content, file_extension="mp3"):
     """
     Transcribe audio from base64 encoded content.
@@ -65,28 +174,42 @@ def transcribe_from_base64(base64_content, file_extension="mp3"):
     try:
         # Decode base64 content
         audio_data = base64.b64decode(base64_content)
+        return transcribe_bytes(audio_data, file_extension)
 
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
-            temp_file.write(audio_data)
-            temp_file_path = temp_file.name
+    except Exception as e:
+        logging.error(f"Error transcribing from base64: {str(e)}")
+        return {"error": f"Failed to transcribe from base64: {str(e)}"}
 
-        # Transcribe
-        result = transcribe_audio(temp_file_path)
+def transcribe_bytes(audio_data, file_extension="mp3"):
+    """
+    Transcribe audio held in memory.
 
-        # Clean up temporary file
-        os.unlink(temp_file_path)
+    Args:
+        audio_data (bytes): Raw audio/video content
+        file_extension (str): File extension (mp3, wav, m4a, etc.)
 
-        return result
+    Returns:
+        dict: Transcription result
+    """
+    # Create temporary file
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
+        temp_file.write(audio_data)
+        temp_file_path = temp_file.name
 
-    except Exception as e:
-        logging.error(f"Error transcribing from base64: {str(e)}")
-        return {"error": f"Failed to transcribe from base64: {str(e)}"}
+    try:
+        return transcribe_audio(temp_file_path)
+    finally:
+        # Clean up temporary file
+        os.unlink(temp_file_path)
 
 def extract_meeting_insights(transcript_text):
     """
     Extract key insights from meeting transcript using GPT.
 
+    Transcripts longer than INSIGHTS_CHUNK_TOKENS are split into chunks whose partial
+    insights are extracted concurrently and merged deterministically (map-reduce), so
+    latency stays bounded however long the meeting was.
+
     Args:
         transcript_text (str): Full meeting transcript
 
@@ -95,9 +218,57 @@ def extract_meeting_insights(transcript_text):
     """
     logging.info("Extracting meeting insights from transcript")
 
+    if estimate_tokens(transcript_text) > INSIGHTS_CHUNK_TOKENS:
+        return extract_meeting_insights_in_chunks(transcript_text)
+
     try:
-        prompt = f"""
-        Analyze the following meeting transcript between a client and recruiter about a job position.
+        insights = request_meeting_insights(transcript_text)
+        logging.info("Meeting insights extracted successfully")
+
+        return insights
+
+    except Exception as e:
+        logging.error(f"Error extracting meeting insights: {str(e)}")
+        return {"error": f"Failed to extract insights: {str(e)}"}
+
+def extract_meeting_insights_in_chunks(transcript_text):
+    """
+    Extract meeting insights chunk by chunk and merge them.
+
+    Args:
+        transcript_text (str): Full meeting transcript
+
+    Returns:
+        dict: Merged insights; chunks that fail are left out, and an error is only
+            returned if every chunk failed
+    """
+    chunks = split_transcript(transcript_text, INSIGHTS_CHUNK_TOKENS)
+    logging.info(f"Extracting meeting insights from {len(chunks)} transcript chunks")
+
+    context = contextvars.copy_context()
+
+    def extract_chunk(index):
+        try:
+            # Copies of the caller's context, so every chunk is routed like the request
+            return context.copy().run(request_meeting_insights, chunks[index], part=(index + 1, len(chunks)))
+        except Exception as e:
+            logging.error(f"Error extracting meeting insights from chunk {index + 1}: {str(e)}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=INSIGHTS_MAP_WORKERS, thread_name_prefix="insights") as executor:
+        partials = [partial for partial in executor.map(extract_chunk, range(len(chunks))) if partial is not None]
+
+    if not partials:
+        return {"error": "Failed to extract insights: every transcript chunk failed"}
+
+    insights = merge_insights(partials)
+    logging.info("Meeting insights extracted successfully")
+    return insights
+
+MEETING_INSIGHTS_PROMPT = PromptTemplate(
+    system="You are an expert at analyzing meeting transcripts and extracting structured information about job interviews.",
+    instructions="""
+        Analyze the meeting transcript at the end of this message between a client and recruiter about a job position.
         Extract and structure the following information:
 
         1. Job Requirements (technical skills, experience level, education)
@@ -107,9 +278,6 @@ def extract_meeting_insights(transcript_text):
         5. Red Flags to Watch For (concerns mentioned by client)
         6. Code Challenge Requirements (if live coding is needed)
 
-        Transcript:
-        {transcript_text}
-
         Provide the response in JSON format with these keys:
         - job_requirements
         - candidate_expectations
@@ -118,57 +286,120 @@ def extract_meeting_insights(transcript_text):
         - red_flags (array)
         - code_challenge_needed (boolean)
         - code_challenge_details (if applicable)
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert at analyzing meeting transcripts and extracting structured information about job interviews."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,
-            response_format={"type": "json_object"}
-        )
+    """,
+    context="""
+        {part_note}Transcript:
+        {transcript_text}
+    """,
+    name="meeting_insights"
+)
 
-        import json
-        insights = json.loads(response.choices[0].message.content)
-        logging.info("Meeting insights extracted successfully")
+def request_meeting_insights(transcript_text, part=None):
+    """
+    Ask GPT for the insights of one transcript, or of one part of it.
 
-        return insights
+    Args:
+        transcript_text (str): Transcript or transcript chunk
+        part (tuple): (number, total) when transcript_text is one chunk of a longer transcript
 
-    except Exception as e:
-        logging.error(f"Error extracting meeting insights: {str(e)}")
-        return {"error": f"Failed to extract insights: {str(e)}"}
+    Returns:
+        dict: Parsed insights
+
+    Raises:
+        Exception: If the API call fails or the response isn't valid JSON
+    """
+    part_note = ""
+    if part:
+        part_note = (f"This is part {part[0]} of {part[1]} of a longer transcript. Only report what this part "
+                     "mentions; leave fields it doesn't cover empty (null, empty string or empty array).\n\n")
+
+    route = route_for("meeting_insights")
+
+    content = cached_chat_completion(
+        client,
+        model=route["model"],
+        messages=MEETING_INSIGHTS_PROMPT.messages(part_note=part_note, transcript_text=transcript_text),
+        temperature=0.2,
+        response_format={"type": "json_object"},
+        max_tokens=route["max_tokens"],
+        stage=route["stage"]
+    )
+
+    import json
+    return json.loads(content)
+
+def insights_params():
+    """Everything that changes the insights of a transcript; part of the insights store key."""
+    return {
+        "model": route_for("meeting_insights")["model"],
+        "prompt": MEETING_INSIGHTS_PROMPT.fingerprint,
+        "chunk_tokens": INSIGHTS_CHUNK_TOKENS
+    }
 
 def process_meeting_recording(audio_file_path_or_base64, is_base64=False, file_extension="mp3"):
     """
     Complete pipeline: transcribe meeting and extract insights.
 
     Args:
-        audio_file_path_or_base64: File path or base64 content
+        audio_file_path_or_base64: File path, open binary file object or base64 content
         is_base64 (bool): Whether input is base64 encoded
         file_extension (str): File extension if using base64
 
     Returns:
-        dict: Complete analysis with transcript and insights
+        dict: Complete analysis with transcript, insights and the audio_hash of the recording
     """
     logging.info("Starting meeting recording processing")
 
-    # Transcribe
     if is_base64:
-        transcription = transcribe_from_base64(audio_file_path_or_base64, file_extension)
+        import base64
+        try:
+            audio_source = base64.b64decode(audio_file_path_or_base64)
+        except Exception as e:
+            logging.error(f"Error decoding base64 recording: {str(e)}")
+            return {"error": f"Failed to transcribe from base64: {str(e)}"}
+    else:
+        audio_source = audio_file_path_or_base64
+
+    # The same recording is usually reused for every candidate of a role
+    audio_hash = compute_content_hash(audio_source)
+    store_key = make_transcript_key(audio_hash, TRANSCRIPTION_PARAMS)
+    stored = get_transcript(store_key)
+
+    # Insights depend on the routed model and the prompt as well as the recording
+    insights_key = make_insights_key(audio_hash, insights_params())
+    stored_insights = get_insights(insights_key) if stored else None
+    if stored_insights:
+        logging.info(f"Transcript store hit for recording {audio_hash[:12]}")
+        return {"transcript": stored["transcript"], "insights": stored_insights["insights"], "audio_hash": audio_hash}
+
+    # Transcribe
+    if stored:
+        logging.info(f"Reusing stored transcript for recording {audio_hash[:12]}")
+        transcription = stored["transcript"]
     else:
-        transcription = transcribe_audio(audio_file_path_or_base64)
+        if is_base64:
+            try:
+                transcription = transcribe_bytes(audio_source, file_extension)
+            except Exception as e:
+                logging.error(f"Error transcribing from base64: {str(e)}")
+                transcription = {"error": f"Failed to transcribe from base64: {str(e)}"}
+        else:
+            transcription = transcribe_audio(audio_source)
+
+        if "error" in transcription:
+            return transcription
 
-    if "error" in transcription:
-        return transcription
+        store_transcript(store_key, audio_hash, transcription)
 
     # Extract insights
     insights = extract_meeting_insights(transcription["text"])
+    if "error" not in insights:
+        store_insights(insights_key, audio_hash, insights)
 
     result = {
         "transcript": transcription,
-        "insights": insights
+        "insights": insights,
+        "audio_hash": audio_hash
     }
 
     logging.info("Meeting recording processing completed")
@@ -0,0 +1,166 @@
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from artifact_store import get_artifact
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Candidates processed at the same time; each one already runs its own stages in parallel
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+# CV formats picked up from a directory
+CV_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+def list_candidates(source):
+    """
+    List the CVs of a batch.
+
+    Args:
+        source (str): Directory of CV files, or a manifest file with one CV path
+            per line (relative paths are resolved against the manifest's directory)
+
+    Returns:
+        list: candidate_cv dicts with "name" and the local "upload_path"
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in sorted(os.listdir(source))
+                 if name.lower().endswith(CV_EXTENSIONS)]
+    else:
+        base_dir = os.path.dirname(os.path.abspath(source))
+        with open(source, 'r', encoding='utf-8') as manifest:
+            paths = [os.path.join(base_dir, line.strip()) for line in manifest
+                     if line.strip() and not line.startswith('#')]
+
+    return [{'name': os.path.basename(path), 'upload_path': path} for path in paths]
+
+def run_batch(run_pipeline, candidates, job_fields, max_concurrency=BATCH_CONCURRENCY, output_dir=None):
+    """
+    Generate interview plans for many candidates against the same job.
+
+    Args:
+        run_pipeline (callable): The single-candidate pipeline, called with one
+            /generate_interview_plan payload; app.run_pipeline_stages, which leaves
+            upload_path files in place for the caller to remove. Rate limits are handled
+            per OpenAI call by the governed client (llm_client), not per candidate
+        candidates (list): candidate_cv dicts as accepted by the pipeline
+        job_fields (dict): Payload fields shared by all candidates, typically
+            job_profile_id plus include_code_challenges
+        max_concurrency (int): Number of candidates processed at the same time
+        output_dir (str): If set, each workbook and summary.json are written here
+
+    Returns:
+        dict: Summary with totals and one entry per candidate, in input order
+    """
+    started = time.time()
+    results = [None] * len(candidates)
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    def run_candidate(index):
+        candidate = candidates[index]
+        name = candidate.get('name') or f"candidate_{index + 1}"
+        candidate_started = time.time()
+        result = {'candidate': name, 'status': 'failed'}
+
+        try:
+            response_data = run_pipeline({**job_fields, 'candidate_cv': candidate})
+        except Exception as e:
+            result['error'] = getattr(e, 'message', str(e))
+        else:
+            excel_file = response_data['excel_file']
+            plan_id = response_data.get('plan_id')
+            result.update({
+                'status': 'succeeded',
+                'candidate_cv_hash': response_data.get('candidate_cv_hash'),
+                'plan_id': plan_id,
+                'workbook': excel_file['name'],
+                # Artifacts expire and share a small LRU with other traffic, so a large batch
+                # could outlive its first workbooks; the plan's link rebuilds them when needed
+                'download_url': f"/plans/{plan_id}/workbook" if plan_id else excel_file['download_url']
+            })
+            if output_dir:
+                artifact = get_artifact(excel_file['artifact_id'])
+                workbook_path = os.path.join(output_dir, f"{index + 1:03d}_{os.path.splitext(name)[0]}.xlsx")
+                with open(workbook_path, 'wb') as workbook:
+                    workbook.write(artifact['content'])
+                result['workbook'] = workbook_path
+
+        result['seconds'] = round(time.time() - candidate_started, 2)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="batch") as executor:
+        futures = {executor.submit(run_candidate, index): index for index in range(len(candidates))}
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            logging.info(f"Batch candidate {index + 1}/{len(candidates)} {results[index]['status']}: {results[index]['candidate']}")
+
+    summary = {
+        'total': len(results),
+        'succeeded': sum(1 for result in results if result['status'] == 'succeeded'),
+        'failed': sum(1 for result in results if result['status'] == 'failed'),
+        'elapsed_seconds': round(time.time() - started, 2),
+        'candidates': results
+    }
+
+    if output_dir:
+        with open(os.path.join(output_dir, 'summary.json'), 'w', encoding='utf-8') as summary_file:
+            json.dump(summary, summary_file, indent=2)
+
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate interview plans for a batch of CVs against one job.")
+    parser.add_argument("cvs", help="Directory of CV files, or a manifest with one CV path per line")
+    parser.add_argument("--output-dir", default="batch_output", help="Where workbooks and summary.json are written")
+    parser.add_argument("--job-profile-id", help="Existing job profile to plan against")
+    parser.add_argument("--job-position", default="", help="Job title")
+    parser.add_argument("--job-requirements-file", help="Text file with the job requirements")
+    parser.add_argument("--meeting-transcript-file", help="Text file with the client meeting transcript")
+    parser.add_argument("--interview-duration", type=int, help="Interview length in minutes")
+    parser.add_argument("--no-code-challenges", action="store_true", help="Skip code challenge generation")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Candidates processed at the same time")
+    args = parser.parse_args()
+
+    # Imported here so that importing this module doesn't start the web app's executors
+    from app import create_profile_from_payload, run_pipeline_stages
+
+    job_profile_id = args.job_profile_id
+    if not job_profile_id:
+        job_data = {'job_position': args.job_position}
+        if args.job_requirements_file:
+            with open(args.job_requirements_file, 'r', encoding='utf-8') as f:
+                job_data['job_requirements'] = f.read()
+        if args.meeting_transcript_file:
+            with open(args.meeting_transcript_file, 'r', encoding='utf-8') as f:
+                job_data['meeting_transcript'] = f.read()
+        if args.interview_duration:
+            job_data['interview_duration_minutes'] = args.interview_duration
+
+        # The job is analyzed once, not once per candidate
+        job_profile_id = create_profile_from_payload(job_data)['job_profile_id']
+
+    candidates = list_candidates(args.cvs)
+    logging.info(f"Generating {len(candidates)} interview plans with concurrency {args.concurrency}")
+
+    summary = run_batch(
+        run_pipeline_stages,
+        candidates,
+        {'job_profile_id': job_profile_id, 'include_code_challenges': not args.no_code_challenges},
+        max_concurrency=args.concurrency,
+        output_dir=args.output_dir
+    )
+    print(f"{summary['succeeded']}/{summary['total']} plans generated in {summary['elapsed_seconds']}s, "
+          f"{summary['failed']} failed. Summary: {os.path.join(args.output_dir, 'summary.json')}")
+
+if __name__ == '__main__':
+    main()
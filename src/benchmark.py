@@ -0,0 +1,199 @@
+import argparse
+import io
+import json
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Fixtures the benchmark requests are built from
+DETAILS_DIR = os.path.join(os.path.dirname(__file__), '..', 'details')
+
+# Candidate/job combinations from details/, used round-robin
+SCENARIOS = [
+    {
+        "job_position": "Senior .NET Developer",
+        "cv": "CV_NET-dev.pdf",
+        "job_requirements": "job_requirements_NET.txt",
+        "meeting_transcript": "meeting_transcript_NET.txt"
+    },
+    {
+        "job_position": "Senior Manual QA Engineer",
+        "cv": "QA_Test Kandidat.docx",
+        "job_requirements": "QA Test_Client_Info.txt",
+        "meeting_transcript": None
+    },
+]
+
+def percentile(samples, q):
+    """Return the q-th percentile (0-100) of samples by the nearest-rank method."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))]
+
+def summarize(samples):
+    """Count and p50/p95/p99 (seconds) of a list of latencies."""
+    return {
+        "count": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99)
+    }
+
+def read_fixture(details_dir, name):
+    with open(os.path.join(details_dir, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def scenario_form(scenario, details_dir, include_code_challenges, model_profile=None):
+    """Build the multipart form the frontend would send for a scenario."""
+    with open(os.path.join(details_dir, scenario["cv"]), 'rb') as f:
+        cv_bytes = f.read()
+
+    form = {
+        "job_position": scenario["job_position"],
+        "job_requirements": read_fixture(details_dir, scenario["job_requirements"]),
+        "interview_duration_minutes": "60",
+        "include_code_challenges": "true" if include_code_challenges else "false"
+    }
+    if scenario["meeting_transcript"]:
+        form["meeting_transcript"] = read_fixture(details_dir, scenario["meeting_transcript"])
+    if model_profile:
+        form["model_profile"] = model_profile
+    return form, cv_bytes, scenario["cv"]
+
+def record_samples(histogram, samples, label):
+    """Also keep every value observed by a metrics histogram, grouped by one of its labels."""
+    observe = histogram.observe
+    lock = threading.Lock()
+
+    def observe_and_record(value, **labels):
+        observe(value, **labels)
+        with lock:
+            samples.setdefault(labels.get(label, ""), []).append(value)
+
+    histogram.observe = observe_and_record
+
+def run_benchmark(flask_app, forms, total_requests, concurrency):
+    """
+    Send total_requests POST /generate_interview_plan requests, concurrency at a time.
+
+    Args:
+        flask_app: The Flask app, driven through its test client
+        forms (list): (form, cv_bytes, cv_name) tuples, used round-robin
+        total_requests (int): Number of requests to send
+        concurrency (int): Requests in flight at the same time
+
+    Returns:
+        dict: End-to-end latencies, failures and throughput
+    """
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+
+    def send(index):
+        form, cv_bytes, cv_name = forms[index % len(forms)]
+        client = flask_app.test_client()
+        started = time.monotonic()
+        response = client.post(
+            '/generate_interview_plan',
+            data={**form, "candidate_cv": (io.BytesIO(cv_bytes), cv_name)},
+            content_type='multipart/form-data'
+        )
+        elapsed = time.monotonic() - started
+        body = response.get_json(silent=True) or {}
+        with lock:
+            if response.status_code == 200 and body.get('status') == 'success':
+                latencies.append(elapsed)
+            else:
+                failures.append({"request": index, "status_code": response.status_code, "message": body.get('message')})
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(total_requests)))
+    elapsed = time.monotonic() - started
+
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "succeeded": len(latencies),
+        "failed": len(failures),
+        "failures": failures[:10],
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "end_to_end": summarize(latencies)
+    }
+
+def format_table(title, rows):
+    lines = [title, f"  {'name':<24}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}"]
+    for name, stats in sorted(rows.items()):
+        lines.append(f"  {name:<24}{stats['count']:>7}" + "".join(
+            f"{stats[key]:>10.3f}" if stats[key] is not None else f"{'-':>10}" for key in ("p50", "p95", "p99")))
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark /generate_interview_plan offline, against a local stand-in for the OpenAI API.")
+    parser.add_argument("--requests", type=int, default=20, help="Number of requests to send")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at the same time")
+    parser.add_argument("--latency", type=float, default=1.0, help="Simulated base LLM latency in seconds (scaled per model)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Latency jitter, as a fraction of the latency")
+    parser.add_argument("--seed", type=int, help="Random seed for the simulated latencies")
+    parser.add_argument("--details-dir", default=DETAILS_DIR, help="Directory with the CV, job and transcript fixtures")
+    parser.add_argument("--model-profile", help="Routing profile to request (see model_routing)")
+    parser.add_argument("--no-code-challenges", action="store_true", help="Skip code challenge generation")
+    parser.add_argument("--no-rate-limits", action="store_true",
+                        help="Don't apply the per-model RPM/TPM limits (the in-flight cap still applies)")
+    parser.add_argument("--llm-cache", action="store_true", help="Keep the LLM response cache on (off by default, so every call is timed)")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    # Must be set before the pipeline modules read their settings
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    if not args.llm_cache:
+        os.environ["LLM_CACHE_BACKEND"] = "none"
+
+    # Imported here so the settings above apply
+    import llm_client
+    import metrics
+    from app import app
+    from fake_openai import FakeOpenAI
+
+    # Requests still go through the rate governor, retries and metrics; only the API is replaced
+    fake = FakeOpenAI(latency=args.latency, jitter=args.jitter, seed=args.seed)
+    llm_client.client.client = fake
+    if args.no_rate_limits:
+        # The empty prefix matches every model; 0 means no limit
+        llm_client.governor.rate_limits = {"": (0, 0)}
+
+    stage_samples = {}
+    llm_samples = {}
+    record_samples(metrics.stage_duration, stage_samples, "stage")
+    record_samples(metrics.llm_call_duration, llm_samples, "stage")
+
+    forms = [scenario_form(scenario, args.details_dir, not args.no_code_challenges, args.model_profile)
+             for scenario in SCENARIOS]
+    results = run_benchmark(app, forms, args.requests, args.concurrency)
+    results["llm_calls"] = fake.calls
+    results["stages"] = {name: summarize(samples) for name, samples in stage_samples.items()}
+    results["llm_stages"] = {name: summarize(samples) for name, samples in llm_samples.items()}
+
+    print(f"{results['succeeded']}/{results['requests']} requests succeeded in {results['elapsed_seconds']}s "
+          f"at concurrency {args.concurrency}: {results['requests_per_second']} requests/s, {fake.calls} LLM calls")
+    print(format_table("End to end (s)", {"generate_interview_plan": results["end_to_end"]}))
+    print(format_table("Pipeline stages (s)", results["stages"]))
+    print(format_table("LLM calls by stage (s)", results["llm_stages"]))
+    for failure in results["failures"]:
+        print(f"Request {failure['request']} failed ({failure['status_code']}): {failure['message']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Directory shared by all on-disk caches
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(__file__), '..', '.cache'))
+
+class MemoryLRUBackend:
+    """
+    In-process cache backend with least-recently-used eviction.
+
+    Args:
+        max_entries (int): Maximum number of entries kept before evicting the oldest
+        ttl_seconds (float): Default time-to-live for entries (None = no expiry)
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl_seconds=None):
+        """Store value under key, evicting the least recently used entries if full."""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.time() + ttl if ttl else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+class SQLiteBackend:
+    """
+    On-disk cache backend stored in a single SQLite file.
+
+    Values must be JSON-serializable. Entries survive restarts and are shared by
+    every worker process pointing at the same file.
+
+    Args:
+        path (str): Path of the SQLite database file
+        max_entries (int): Maximum number of entries kept before evicting the least recently used
+        ttl_seconds (float): Default time-to-live for entries (None = no expiry)
+    """
+
+    def __init__(self, path, max_entries=10000, ttl_seconds=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries (last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        return json.loads(value)
+
+    def set(self, key, value, ttl_seconds=None):
+        """Store value under key, evicting expired and least recently used entries if full."""
+        now = time.time()
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = now + ttl if ttl else None
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now)
+            )
+            self._conn.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                " SELECT key FROM cache_entries ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def delete(self, key):
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+class TieredBackend:
+    """
+    Two-level cache: a small in-memory tier in front of a persistent tier.
+
+    Reads check memory first and promote disk hits into memory; writes go to both.
+
+    Args:
+        memory: Fast, bounded backend (usually MemoryLRUBackend)
+        disk: Persistent backend (usually SQLiteBackend)
+    """
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key):
+        """Return the cached value for key from the fastest tier that has it."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key, value, ttl_seconds=None):
+        """Store value under key in both tiers."""
+        self.memory.set(key, value, ttl_seconds)
+        self.disk.set(key, value, ttl_seconds)
+
+    def delete(self, key):
+        """Remove key from both tiers."""
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        self.memory.clear()
+        self.disk.clear()
+
+    def __len__(self):
+        return len(self.disk)
+
+def create_backend(kind, path=None, max_entries=1024, ttl_seconds=None, memory_entries=256):
+    """
+    Create a cache backend by name.
+
+    Args:
+        kind (str): 'memory', 'sqlite', 'tiered' or 'none'
+        path (str): Database path for the 'sqlite' and 'tiered' backends
+        max_entries (int): Size bound for the backend (the disk tier for 'tiered')
+        ttl_seconds (float): Default time-to-live for entries
+        memory_entries (int): Size bound for the memory tier of 'tiered'
+
+    Returns:
+        Backend instance, or None if caching is disabled
+    """
+    kind = (kind or "memory").lower()
+
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryLRUBackend(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if kind in ("sqlite", "tiered"):
+        try:
+            disk = SQLiteBackend(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+        except (sqlite3.Error, OSError) as e:
+            logging.error(f"Could not open SQLite cache at {path}, falling back to memory: {str(e)}")
+            return MemoryLRUBackend(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+        if kind == "sqlite":
+            return disk
+        return TieredBackend(MemoryLRUBackend(max_entries=memory_entries, ttl_seconds=ttl_seconds), disk)
+
+    raise ValueError(f"Unknown cache backend: {kind}")
@@ -1,8 +1,15 @@
-import openai
+import contextvars
 import os
 import logging
 from dotenv import load_dotenv
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from functools import partial
+from llm_cache import cached_chat_completion
+from llm_client import client
+from model_routing import route_for
+from prompt_templates import PromptTemplate
+from skill_extractor import select_tech_stack
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,36 +17,13 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Load environment variables from project root
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
-# Initialize OpenAI client
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Seconds a whole challenge suite may take; challenges still generating after that are dropped
+CHALLENGE_SUITE_DEADLINE_SECONDS = float(os.getenv("CHALLENGE_SUITE_DEADLINE_SECONDS", "120"))
 
-def generate_code_challenge(job_details, candidate_experience_level, technology_stack, difficulty="medium", duration_minutes=30):
-    """
-    Generate a code challenge tailored to the job and candidate.
-
-    Args:
-        job_details (dict): Job description and requirements
-        candidate_experience_level (str): 'junior', 'mid', 'senior', 'lead'
-        technology_stack (list): List of technologies (e.g., ['.NET', 'C#', 'SQL'])
-        difficulty (str): 'easy', 'medium', 'hard'
-        duration_minutes (int): Time allocated for the challenge
-
-    Returns:
-        dict: Code challenge with problem, solution, test cases, and evaluation criteria
-    """
-    logging.info(f"Generating code challenge for {candidate_experience_level} level in {technology_stack}")
-
-    try:
-        prompt = f"""
-        Create a practical code challenge for a live coding interview.
-
-        JOB CONTEXT:
-        {json.dumps(job_details, indent=2)}
-
-        CANDIDATE LEVEL: {candidate_experience_level}
-        TECHNOLOGY STACK: {', '.join(technology_stack)}
-        DIFFICULTY: {difficulty}
-        TIME LIMIT: {duration_minutes} minutes
+CODING_CHALLENGE_PROMPT = PromptTemplate(
+    system="You are an expert technical interviewer specializing in creating effective code challenges.",
+    instructions="""
+        Create a practical code challenge for a live coding interview, for the job and candidate described at the end of this message.
 
         Generate a challenge that:
         1. Is realistic and relevant to the job
@@ -49,7 +33,7 @@ def generate_code_challenge(job_details, candidate_experience_level, technology_
         5. Includes edge cases to consider
 
         REQUIRED JSON STRUCTURE:
-        {{
+        {
             "problem_description": "Clear description of the problem",
             "input_output_examples": "Examples showing input and expected output",
             "constraints": "Any constraints or requirements",
@@ -59,24 +43,64 @@ def generate_code_challenge(job_details, candidate_experience_level, technology_
             "common_mistakes": ["Common mistakes to watch for"],
             "follow_up_questions": ["Questions to deepen discussion"],
             "hints": ["Hints if candidate gets stuck"]
-        }}
+        }
 
         CRITICAL: The "solution" field MUST contain a complete, production-quality code solution.
         The solution should be well-commented and demonstrate best practices.
         If the solution is complex, you may provide it as an object with "code" and "explanation" fields.
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert technical interviewer specializing in creating effective code challenges."},
-                {"role": "user", "content": prompt}
-            ],
+    """,
+    context="""
+        JOB CONTEXT:
+        {job_details}
+
+        CANDIDATE LEVEL: {candidate_experience_level}
+        TECHNOLOGY STACK: {technology_stack}
+        DIFFICULTY: {difficulty}
+        TIME LIMIT: {duration_minutes} minutes
+    """,
+    name="coding_challenge",
+    priorities={"technology_stack": 2, "job_details": 1}
+)
+
+def generate_code_challenge(job_details, candidate_experience_level, technology_stack, difficulty="medium", duration_minutes=30, variant=0):
+    """
+    Generate a code challenge tailored to the job and candidate.
+
+    Args:
+        job_details (dict): Job description and requirements
+        candidate_experience_level (str): 'junior', 'mid', 'senior', 'lead'
+        technology_stack (list): List of technologies (e.g., ['.NET', 'C#', 'SQL'])
+        difficulty (str): 'easy', 'medium', 'hard'
+        duration_minutes (int): Time allocated for the challenge
+        variant: Index of this challenge among identical requests (or another cache
+            discriminator), so repeats aren't served the same cached challenge
+
+    Returns:
+        dict: Code challenge with problem, solution, test cases, and evaluation criteria
+    """
+    logging.info(f"Generating code challenge for {candidate_experience_level} level in {technology_stack}")
+
+    try:
+        route = route_for("coding_challenge")
+
+        content = cached_chat_completion(
+            client,
+            model=route["model"],
+            messages=CODING_CHALLENGE_PROMPT.messages(
+                job_details=job_details,
+                candidate_experience_level=candidate_experience_level,
+                technology_stack=', '.join(technology_stack),
+                difficulty=difficulty,
+                duration_minutes=duration_minutes
+            ),
             temperature=0.4,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            max_tokens=route["max_tokens"],
+            stage=route["stage"],
+            variant=variant
         )
 
-        challenge = json.loads(response.choices[0].message.content)
+        challenge = json.loads(content)
 
         # Add metadata
         challenge["metadata"] = {
@@ -93,68 +117,118 @@ def generate_code_challenge(job_details, candidate_experience_level, technology_
         logging.error(f"Error generating code challenge: {str(e)}")
         return {"error": f"Failed to generate code challenge: {str(e)}"}
 
-def generate_multiple_challenges(job_details, candidate_experience_level, technology_stack, count=3):
+def coding_challenge_tasks(job_details, candidate_experience_level, technology_stack, count=3):
     """
-    Generate multiple code challenges of varying difficulty (medium to hard).
+    Build one ("coding", callable) task per coding challenge, alternating medium and hard.
 
     Args:
         job_details (dict): Job details
         candidate_experience_level (str): Experience level
         technology_stack (list): Technologies to use
-        count (int): Number of challenges to generate (default 3)
+        count (int): Number of challenges to generate (capped at 3)
 
     Returns:
-        list: List of code challenges with solutions
+        list: (kind, callable) pairs for run_challenge_tasks()
     """
-    logging.info(f"Generating {count} code challenges (medium to hard)")
-
     # Generate challenges from medium to hard difficulty
     difficulties = ["medium", "hard"]
     durations = [30, 45]
-    challenges = []
+    tasks = []
 
     # Generate at least 2 challenges (medium and hard), up to count
     num_to_generate = min(count, 3)  # Generate 2-3 challenges
-    
+
     for i in range(num_to_generate):
         # Cycle through medium and hard if generating more than 2
         difficulty_idx = i % len(difficulties)
-        difficulty = difficulties[difficulty_idx]
-        duration = durations[difficulty_idx]
-
-        challenge = generate_code_challenge(
+        tasks.append(("coding", partial(
+            generate_code_challenge,
             job_details,
             candidate_experience_level,
             technology_stack,
-            difficulty,
-            duration
-        )
+            difficulties[difficulty_idx],
+            durations[difficulty_idx],
+            variant=i
+        )))
 
-        if "error" not in challenge:
-            challenges.append(challenge)
+    return tasks
 
-    logging.info(f"Generated {len(challenges)} challenges successfully")
-    return challenges
+def run_challenge_tasks(tasks, timeout_seconds=None, on_challenge=None):
+    """
+    Run independent challenge generators concurrently, giving up on stragglers at the deadline.
 
-def generate_system_design_challenge(job_details, candidate_experience_level):
+    Args:
+        tasks (list): (kind, callable) pairs; each callable returns a challenge dict
+        timeout_seconds (float): Deadline for the whole batch (defaults to CHALLENGE_SUITE_DEADLINE_SECONDS)
+        on_challenge (callable): Optional hook called as on_challenge(kind, challenge) for each
+            successful challenge, in completion order
+
+    Returns:
+        tuple: (results aligned with tasks, None where the deadline passed first;
+                kinds of the tasks that timed out)
     """
-    Generate a system design challenge for senior/lead positions.
+    timeout_seconds = CHALLENGE_SUITE_DEADLINE_SECONDS if timeout_seconds is None else timeout_seconds
+    results = [None] * len(tasks)
+    timed_out = []
+    if not tasks:
+        return results, timed_out
+
+    executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="challenge")
+    futures = {executor.submit(contextvars.copy_context().run, func): idx for idx, (_, func) in enumerate(tasks)}
+
+    try:
+        for future in as_completed(futures, timeout=timeout_seconds):
+            idx = futures[future]
+            kind = tasks[idx][0]
+            try:
+                challenge = future.result()
+            except Exception as e:
+                logging.error(f"Error generating {kind} challenge: {str(e)}")
+                challenge = {"error": f"Failed to generate {kind} challenge: {str(e)}"}
+
+            results[idx] = challenge
+            if on_challenge and "error" not in challenge:
+                on_challenge(kind, challenge)
+    except FuturesTimeoutError:
+        timed_out = [tasks[idx][0] for future, idx in futures.items() if not future.done()]
+        logging.warning(f"Challenge deadline of {timeout_seconds}s passed, continuing without: {', '.join(timed_out)}")
+    finally:
+        # Stragglers finish in the background; their results are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results, timed_out
+
+def generate_multiple_challenges(job_details, candidate_experience_level, technology_stack, count=3, on_challenge=None):
+    """
+    Generate multiple code challenges of varying difficulty (medium to hard), concurrently.
 
     Args:
         job_details (dict): Job details
         candidate_experience_level (str): Experience level
+        technology_stack (list): Technologies to use
+        count (int): Number of challenges to generate (default 3)
+        on_challenge (callable): Optional hook called as on_challenge("coding", challenge)
+            for each challenge as soon as it is generated
 
     Returns:
-        dict: System design challenge
+        list: List of code challenges with solutions, in difficulty order; challenges that
+            failed or missed CHALLENGE_SUITE_DEADLINE_SECONDS are left out
     """
-    logging.info("Generating system design challenge")
+    logging.info(f"Generating {count} code challenges (medium to hard)")
 
-    try:
-        prompt = f"""
-        Create a system design challenge for a {candidate_experience_level} level interview.
+    results, _ = run_challenge_tasks(
+        coding_challenge_tasks(job_details, candidate_experience_level, technology_stack, count),
+        on_challenge=on_challenge
+    )
+    challenges = [challenge for challenge in results if challenge and "error" not in challenge]
 
-        JOB CONTEXT:
-        {json.dumps(job_details, indent=2)}
+    logging.info(f"Generated {len(challenges)} challenges successfully")
+    return challenges
+
+SYSTEM_DESIGN_PROMPT = PromptTemplate(
+    system="You are an expert in system design interviews for senior engineering positions.",
+    instructions="""
+        Create a system design challenge for the candidate level and job described at the end of this message.
 
         Generate a realistic system design problem that:
         1. Is relevant to the job domain
@@ -174,19 +248,48 @@ def generate_system_design_challenge(job_details, candidate_experience_level):
         - Follow-up questions
 
         Return as structured JSON.
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert in system design interviews for senior engineering positions."},
-                {"role": "user", "content": prompt}
-            ],
+    """,
+    context="""
+        CANDIDATE LEVEL: {candidate_experience_level}
+
+        JOB CONTEXT:
+        {job_details}
+    """,
+    name="system_design"
+)
+
+def generate_system_design_challenge(job_details, candidate_experience_level, variant=None):
+    """
+    Generate a system design challenge for senior/lead positions.
+
+    Args:
+        job_details (dict): Job details
+        candidate_experience_level (str): Experience level
+        variant: Optional cache discriminator, so a regeneration isn't served the cached challenge
+
+    Returns:
+        dict: System design challenge
+    """
+    logging.info("Generating system design challenge")
+
+    try:
+        route = route_for("system_design")
+
+        content = cached_chat_completion(
+            client,
+            model=route["model"],
+            messages=SYSTEM_DESIGN_PROMPT.messages(
+                job_details=job_details,
+                candidate_experience_level=candidate_experience_level
+            ),
             temperature=0.4,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            max_tokens=route["max_tokens"],
+            stage=route["stage"],
+            variant=variant
         )
 
-        challenge = json.loads(response.choices[0].message.content)
+        challenge = json.loads(content)
         challenge["challenge_type"] = "system_design"
 
         logging.info("System design challenge generated successfully")
@@ -196,21 +299,10 @@ def generate_system_design_challenge(job_details, candidate_experience_level):
         logging.error(f"Error generating system design challenge: {str(e)}")
         return {"error": f"Failed to generate system design challenge: {str(e)}"}
 
-def generate_debugging_challenge(technology_stack):
-    """
-    Generate a debugging challenge with intentional bugs.
-
-    Args:
-        technology_stack (list): Technologies to use
-
-    Returns:
-        dict: Debugging challenge with buggy code and solutions
-    """
-    logging.info("Generating debugging challenge")
-
-    try:
-        prompt = f"""
-        Create a debugging challenge for technologies: {', '.join(technology_stack)}
+DEBUGGING_CHALLENGE_PROMPT = PromptTemplate(
+    system="You are an expert at creating effective debugging exercises.",
+    instructions="""
+        Create a debugging challenge for the technologies listed at the end of this message.
 
         Generate code with 3-5 intentional bugs that:
         1. Are realistic mistakes developers make
@@ -228,19 +320,41 @@ def generate_debugging_challenge(technology_stack):
         - What to look for in candidate's approach
 
         Return as structured JSON.
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert at creating effective debugging exercises."},
-                {"role": "user", "content": prompt}
-            ],
+    """,
+    context="""
+        TECHNOLOGIES: {technology_stack}
+    """,
+    name="debugging_challenge"
+)
+
+def generate_debugging_challenge(technology_stack, variant=None):
+    """
+    Generate a debugging challenge with intentional bugs.
+
+    Args:
+        technology_stack (list): Technologies to use
+        variant: Optional cache discriminator, so a regeneration isn't served the cached challenge
+
+    Returns:
+        dict: Debugging challenge with buggy code and solutions
+    """
+    logging.info("Generating debugging challenge")
+
+    try:
+        route = route_for("debugging_challenge")
+
+        content = cached_chat_completion(
+            client,
+            model=route["model"],
+            messages=DEBUGGING_CHALLENGE_PROMPT.messages(technology_stack=', '.join(technology_stack)),
             temperature=0.3,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            max_tokens=route["max_tokens"],
+            stage=route["stage"],
+            variant=variant
         )
 
-        challenge = json.loads(response.choices[0].message.content)
+        challenge = json.loads(content)
         challenge["challenge_type"] = "debugging"
 
         logging.info("Debugging challenge generated successfully")
@@ -250,7 +364,30 @@ def generate_debugging_challenge(technology_stack):
         logging.error(f"Error generating debugging challenge: {str(e)}")
         return {"error": f"Failed to generate debugging challenge: {str(e)}"}
 
-def create_challenge_suite(job_details, resume_analysis, meeting_insights):
+def challenge_candidate_level(resume_analysis):
+    """Experience level the challenges are pitched at, from the resume analysis."""
+    # Extract candidate info
+    candidate_level = resume_analysis.get("analysis", {}).get("key_info", {}).get("current_role", "mid")
+
+    # Determine if senior/lead
+    years_exp = resume_analysis.get("analysis", {}).get("key_info", {}).get("years_of_experience", 3)
+    if years_exp >= 7:
+        candidate_level = "senior"
+    elif years_exp >= 10:
+        candidate_level = "lead"
+
+    return candidate_level
+
+def challenge_tech_stack(job_details, meeting_insights):
+    """Technology stack of the challenges: the technologies the job text and client mention most."""
+    job_text = " ".join(filter(None, [
+        job_details.get("title", ""),
+        job_details.get("description", ""),
+        str(meeting_insights.get("insights", {}).get("job_requirements") or "")
+    ]))
+    return select_tech_stack(job_text)
+
+def create_challenge_suite(job_details, resume_analysis, meeting_insights, on_challenge=None):
     """
     Create a complete suite of code challenges based on all inputs.
 
@@ -258,6 +395,8 @@ def create_challenge_suite(job_details, resume_analysis, meeting_insights):
         job_details (dict): Job details
         resume_analysis (dict): Candidate resume analysis
         meeting_insights (dict): Client meeting insights
+        on_challenge (callable): Optional hook called as on_challenge(kind, challenge) for each
+            challenge ("coding", "system_design" or "debugging") as soon as it is generated
 
     Returns:
         dict: Complete challenge suite with multiple types
@@ -265,30 +404,9 @@ def create_challenge_suite(job_details, resume_analysis, meeting_insights):
     logging.info("Creating complete challenge suite")
 
     try:
-        # Extract candidate info
-        candidate_level = resume_analysis.get("analysis", {}).get("key_info", {}).get("current_role", "mid")
-
-        # Determine if senior/lead
-        years_exp = resume_analysis.get("analysis", {}).get("key_info", {}).get("years_of_experience", 3)
-        if years_exp >= 7:
-            candidate_level = "senior"
-        elif years_exp >= 10:
-            candidate_level = "lead"
-
-        # Extract technology stack from job details
-        tech_stack = []
-        job_title = job_details.get("title", "").lower()
-
-        if ".net" in job_title or "c#" in job_title:
-            tech_stack = [".NET", "C#", "SQL Server"]
-        elif "java" in job_title:
-            tech_stack = ["Java", "Spring", "SQL"]
-        elif "python" in job_title:
-            tech_stack = ["Python", "Django/Flask", "PostgreSQL"]
-        elif "javascript" in job_title or "react" in job_title or "node" in job_title:
-            tech_stack = ["JavaScript", "React", "Node.js"]
-        else:
-            tech_stack = ["General Programming"]
+        candidate_level = challenge_candidate_level(resume_analysis)
+        tech_stack = challenge_tech_stack(job_details, meeting_insights)
+        logging.info(f"Technology stack for challenges: {', '.join(tech_stack)}")
 
         suite = {
             "coding_challenges": [],
@@ -298,23 +416,27 @@ def create_challenge_suite(job_details, resume_analysis, meeting_insights):
 
         # Check if code challenges are needed
         if meeting_insights.get("insights", {}).get("code_challenge_needed", True):
-            # Generate coding challenges (medium to hard, 2-3 challenges)
-            suite["coding_challenges"] = generate_multiple_challenges(
-                job_details,
-                candidate_level,
-                tech_stack,
-                count=3  # Generate 2-3 challenges (medium and hard)
-            )
-
-            # Generate system design for senior+
+            # Coding challenges (medium to hard, 2-3 challenges), system design for
+            # senior+ and debugging are independent, so they are all generated at once
+            tasks = coding_challenge_tasks(job_details, candidate_level, tech_stack, count=3)
             if candidate_level in ["senior", "lead"]:
-                suite["system_design"] = generate_system_design_challenge(
-                    job_details,
-                    candidate_level
-                )
-
-            # Generate debugging challenge
-            suite["debugging_challenge"] = generate_debugging_challenge(tech_stack)
+                tasks.append(("system_design", partial(generate_system_design_challenge, job_details, candidate_level)))
+            tasks.append(("debugging", partial(generate_debugging_challenge, tech_stack)))
+
+            results, timed_out = run_challenge_tasks(tasks, on_challenge=on_challenge)
+
+            for (kind, _), challenge in zip(tasks, results):
+                if kind == "coding":
+                    if challenge and "error" not in challenge:
+                        suite["coding_challenges"].append(challenge)
+                elif kind == "system_design":
+                    suite["system_design"] = challenge
+                elif kind == "debugging":
+                    suite["debugging_challenge"] = challenge
+
+            if timed_out:
+                # Partial suite: let callers tell "timed out" apart from "not needed"
+                suite["timed_out"] = timed_out
 
         logging.info("Complete challenge suite created successfully")
         return suite
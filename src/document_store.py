@@ -0,0 +1,108 @@
+import hashlib
+import logging
+import os
+from cache_backends import CACHE_DIR, create_backend
+from uploads import iter_source_chunks
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Extracted CV text keyed by the SHA-256 of the uploaded bytes: a bounded memory
+# tier in front of a persistent SQLite tier
+text_store = create_backend(
+    os.getenv("DOCUMENT_CACHE_BACKEND", "tiered"),
+    path=os.getenv("DOCUMENT_CACHE_PATH", os.path.join(CACHE_DIR, "documents.sqlite3")),
+    max_entries=int(os.getenv("DOCUMENT_CACHE_MAX_ENTRIES", "5000")),
+    ttl_seconds=float(os.getenv("DOCUMENT_CACHE_TTL_SECONDS", "0")) or None,
+    memory_entries=int(os.getenv("DOCUMENT_CACHE_MEMORY_ENTRIES", "128"))
+)
+
+def compute_content_hash(source):
+    """
+    Compute the content hash used to address a document.
+
+    Args:
+        source: Raw bytes of the file, a file path or a binary file object (read in chunks)
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for chunk in iter_source_chunks(source):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def get_document(content_hash):
+    """
+    Look up a previously extracted document by its content hash.
+
+    Args:
+        content_hash (str): SHA-256 hex digest of the original file bytes
+
+    Returns:
+        dict: {"content_hash", "filename", "format", "text"}, or None if unknown
+    """
+    if text_store is None:
+        return None
+    return text_store.get(content_hash)
+
+def get_extracted_text(content_hash):
+    """
+    Look up the extracted text of a document by its content hash.
+
+    Args:
+        content_hash (str): SHA-256 hex digest of the original file bytes
+
+    Returns:
+        str: Extracted text, or None if the document hasn't been parsed yet
+    """
+    document = get_document(content_hash)
+    return document["text"] if document else None
+
+def store_document(content_hash, filename, text):
+    """
+    Store the extracted text of a document under its content hash.
+
+    Args:
+        content_hash (str): SHA-256 hex digest of the original file bytes
+        filename (str): Original file name
+        text (str): Extracted text
+    """
+    if text_store is None:
+        return
+    text_store.set(content_hash, {
+        "content_hash": content_hash,
+        "filename": filename,
+        "format": get_file_format(filename),
+        "text": text
+    })
+
+def get_file_format(filename):
+    """Return the lower-cased extension used to pick a parser."""
+    return filename.lower().split('.')[-1]
+
+def extract_text_once(source, filename, extract):
+    """
+    Extract text from a document, parsing each distinct file only once.
+
+    Args:
+        source: Raw bytes of the file, a file path or a binary file object
+        filename (str): Name of the file (used to determine format)
+        extract (callable): Parser called as extract(source, filename) on a miss
+
+    Returns:
+        tuple: (content_hash, extracted text or None if extraction failed)
+    """
+    content_hash = compute_content_hash(source)
+
+    document = get_document(content_hash)
+    # The same bytes uploaded under another extension are parsed with a different parser
+    if document and document.get("format") == get_file_format(filename):
+        logging.info(f"Document cache hit for {filename} ({content_hash[:12]})")
+        return content_hash, document["text"]
+
+    text = extract(source, filename)
+    if text:
+        store_document(content_hash, filename, text)
+
+    return content_hash, text
@@ -1,6 +1,7 @@
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+import io
 import logging
 import os
 from datetime import datetime
@@ -8,7 +9,90 @@ from datetime import datetime
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def create_interview_excel(interview_plan, code_challenges, output_path=None):
+# Workbook sheets, in order
+SHEET_ORDER = ["Overview", "Questions", "Evaluation", "Code Challenges", "Notes"]
+
+def build_interview_workbook(interview_plan, code_challenges):
+    """
+    Build the interview plan workbook in memory.
+
+    Args:
+        interview_plan (dict): Complete interview plan
+        code_challenges (dict): Code challenges suite
+
+    Returns:
+        openpyxl.Workbook: Workbook with all sheets
+    """
+    # Create workbook
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)  # Remove default sheet
+
+    # Create sheets
+    create_overview_sheet(wb, interview_plan)
+    topic_score_ranges = create_questions_sheet(wb, interview_plan)
+    create_evaluation_sheet(wb, interview_plan, topic_score_ranges)
+    create_code_challenges_sheet(wb, code_challenges)
+    create_notes_sheet(wb, interview_plan)
+
+    return wb
+
+def rerender_sheets(workbook_bytes, interview_plan, code_challenges, sheets):
+    """
+    Rebuild some sheets of an existing workbook and keep the others as they are.
+
+    Args:
+        workbook_bytes (bytes): Workbook created by create_interview_excel()
+        interview_plan (dict): Complete interview plan, with the changes
+        code_challenges (dict): Code challenges suite, with the changes
+        sheets (list): Names of the sheets to rebuild (see SHEET_ORDER)
+
+    Returns:
+        bytes: The updated workbook, or None if it couldn't be updated
+    """
+    logging.info(f"Re-rendering workbook sheets: {', '.join(sheets)}")
+
+    try:
+        wb = openpyxl.load_workbook(io.BytesIO(workbook_bytes))
+
+        topic_score_ranges = None
+        if "Evaluation" in sheets and "Questions" not in sheets:
+            # The Evaluation formulas point at the score cells of the Questions sheet, which
+            # are laid out from the plan alone; lay out a scratch copy to find them
+            topic_score_ranges = create_questions_sheet(openpyxl.Workbook(), interview_plan)
+
+        for name in [name for name in SHEET_ORDER if name in sheets]:
+            index = wb.sheetnames.index(name) if name in wb.sheetnames else SHEET_ORDER.index(name)
+            if name in wb.sheetnames:
+                wb.remove(wb[name])
+
+            if name == "Overview":
+                create_overview_sheet(wb, interview_plan)
+            elif name == "Questions":
+                topic_score_ranges = create_questions_sheet(wb, interview_plan)
+            elif name == "Evaluation":
+                create_evaluation_sheet(wb, interview_plan, topic_score_ranges)
+            elif name == "Code Challenges":
+                create_code_challenges_sheet(wb, code_challenges)
+            elif name == "Notes":
+                create_notes_sheet(wb, interview_plan)
+
+            wb.move_sheet(name, offset=min(index, len(wb.sheetnames) - 1) - wb.sheetnames.index(name))
+
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+
+    except Exception as e:
+        logging.error(f"Error re-rendering workbook sheets: {str(e)}")
+        return None
+
+def default_excel_filename(interview_plan):
+    """Return the default workbook file name for a plan, based on candidate name and time."""
+    candidate_name = interview_plan.get("metadata", {}).get("candidate_name", "Candidate")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"interview_plan_{candidate_name.replace(' ', '_')}_{timestamp}.xlsx"
+
+def create_interview_excel(interview_plan, code_challenges, output_path=None, in_memory=False):
     """
     Create a comprehensive Excel file with interview plan and evaluation form.
 
@@ -16,29 +100,26 @@ def create_interview_excel(interview_plan, code_challenges, output_path=None):
         interview_plan (dict): Complete interview plan
         code_challenges (dict): Code challenges suite
         output_path (str): Output file path (optional)
+        in_memory (bool): Return the workbook as bytes instead of writing it to disk
 
     Returns:
-        str: Path to the generated Excel file
+        str: Path to the generated Excel file, or bytes of the workbook if in_memory is set
+            (None if generation failed)
     """
     logging.info("Creating Excel interview plan")
 
     try:
-        # Create workbook
-        wb = openpyxl.Workbook()
-        wb.remove(wb.active)  # Remove default sheet
+        wb = build_interview_workbook(interview_plan, code_challenges)
 
-        # Create sheets
-        create_overview_sheet(wb, interview_plan)
-        topic_score_ranges = create_questions_sheet(wb, interview_plan)
-        create_evaluation_sheet(wb, interview_plan, topic_score_ranges)
-        create_code_challenges_sheet(wb, code_challenges)
-        create_notes_sheet(wb, interview_plan)
+        if in_memory:
+            buffer = io.BytesIO()
+            wb.save(buffer)
+            logging.info(f"Excel workbook created in memory ({buffer.tell()} bytes)")
+            return buffer.getvalue()
 
         # Generate output path if not provided
         if not output_path:
-            candidate_name = interview_plan.get("metadata", {}).get("candidate_name", "Candidate")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = f"interview_plan_{candidate_name.replace(' ', '_')}_{timestamp}.xlsx"
+            output_path = default_excel_filename(interview_plan)
 
         # Ensure output directory exists
         output_dir = os.path.dirname(output_path) if os.path.dirname(output_path) else "."
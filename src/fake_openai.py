@@ -0,0 +1,231 @@
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from transcript_chunks import estimate_tokens
+
+# Latency of each model relative to the configured base latency
+MODEL_LATENCY_FACTORS = {"gpt-4o-mini": 0.5, "gpt-4o": 1.0, "gpt-4": 2.0, "whisper-1": 3.0}
+
+# Characters per streamed chunk
+STREAM_CHUNK_CHARS = 40
+
+def resume_analysis_response(prompt):
+    return {
+        "key_info": {
+            "name": "Alex Candidate",
+            "current_role": "Senior Software Engineer",
+            "years_of_experience": 8,
+            "education": "BS in Computer Science"
+        },
+        "skills": ["C#", ".NET", "ASP.NET Core", "SQL Server", "Azure", "Docker"],
+        "employment_gaps": ["No significant gaps identified"],
+        "career_progression": "Steady progression from developer to senior engineer",
+        "anomalies": ["None detected"]
+    }
+
+def meeting_insights_response(prompt):
+    return {
+        "job_requirements": "Senior engineer with strong backend and cloud experience",
+        "candidate_expectations": "Technical leadership, clear communication, ownership",
+        "interview_duration_minutes": 60,
+        "topics_to_cover": ["Backend architecture", "Cloud services", "Databases", "Testing", "Leadership"],
+        "red_flags": ["Vague answers about past responsibilities"],
+        "code_challenge_needed": True,
+        "code_challenge_details": "One live coding exercise of 20-30 minutes"
+    }
+
+def interview_plan_response(prompt):
+    return {
+        "interview_overview": {
+            "objectives": ["Assess technical depth", "Assess architecture skills", "Assess leadership"],
+            "key_focus_areas": ["Backend", "Cloud", "Data"]
+        },
+        "time_allocation": {"introduction": 3, "technical_topics": 45, "candidate_questions": 5, "wrap_up": 2},
+        "red_flags": ["Cannot explain own design decisions", "No testing discipline"],
+        "candidate_questions": ["What does the team look like?", "How are releases done?"]
+    }
+
+def prioritized_topics_response(prompt):
+    match = re.search(r"AVAILABLE TIME FOR TOPICS: (\d+)", prompt)
+    available_time = int(match.group(1)) if match else 40
+    names = ["System architecture", "Backend development", "Databases", "Cloud and DevOps", "Testing and quality"]
+    allocations = [available_time // len(names)] * len(names)
+    allocations[0] += available_time - sum(allocations)
+    return {
+        "topics": [
+            {
+                "topic_name": name,
+                "priority": 5 - index,
+                "allocated_time": allocations[index],
+                "rationale": f"{name} is central to the role",
+                "questions": [
+                    {
+                        "question": f"Question {number} about {name.lower()}",
+                        "what_to_look_for": "Concrete examples and trade-offs",
+                        "follow_up": "What would you do differently today?",
+                        "scoring_criteria": "1 = no experience, 5 = deep hands-on expertise"
+                    }
+                    for number in range(1, 4)
+                ]
+            }
+            for index, name in enumerate(names)
+        ]
+    }
+
+def evaluation_rubric_response(prompt):
+    return {
+        "scoring_scale": {"1": "Poor", "2": "Weak", "3": "Adequate", "4": "Strong", "5": "Excellent"},
+        "overall_guidelines": "Score each topic independently, then weight by priority",
+        "decision_framework": {"hire_threshold": 70, "no_hire_threshold": 50},
+        "special_considerations": ["Consider seniority when scoring leadership"]
+    }
+
+def additional_questions_response(prompt):
+    match = re.search(r"Number of questions: (\d+)", prompt)
+    count = int(match.group(1)) if match else 3
+    return {
+        "questions": [
+            {
+                "question": f"Additional question {number}",
+                "what_to_look_for": "Depth and clarity",
+                "follow_up": "Can you give an example?"
+            }
+            for number in range(1, count + 1)
+        ]
+    }
+
+def coding_challenge_response(prompt):
+    return {
+        "problem_description": "Implement an in-memory rate limiter for an API gateway.",
+        "input_output_examples": "allow('client-1') -> true, ... 11th call within a minute -> false",
+        "constraints": "At most 10 requests per client per minute; O(1) per call",
+        "solution": "class RateLimiter:\n    # Sliding window per client\n    ...",
+        "test_cases": ["Single client under limit", "Single client over limit", "Window rollover"],
+        "evaluation_criteria": ["Correctness", "Complexity", "Thread safety"],
+        "common_mistakes": ["Never evicting old timestamps"],
+        "follow_up_questions": ["How would you distribute this across instances?"],
+        "hints": ["Keep a queue of timestamps per client"]
+    }
+
+def system_design_response(prompt):
+    return {
+        "problem_statement": "Design a payment processing service.",
+        "requirements": {"functional": ["Accept payments", "Refunds"], "non_functional": ["99.95% availability"]},
+        "constraints": "10k transactions per second at peak",
+        "discussion_points": ["Idempotency", "Ledger design", "Reconciliation"],
+        "evaluation_criteria": ["Clear component boundaries", "Failure handling"],
+        "trade_offs": ["Consistency vs availability"],
+        "red_flags": ["No idempotency keys"],
+        "follow_up_questions": ["How do you handle a partial outage of the card network?"]
+    }
+
+def debugging_challenge_response(prompt):
+    return {
+        "buggy_code": "1 def average(values):\n2     return sum(values) / len(values) + 1",
+        "expected_behavior": "Returns the mean of the values",
+        "actual_behavior": "Off by one, and fails on an empty list",
+        "bugs": [{"line": 2, "description": "Adds 1 to the result"}, {"line": 2, "description": "Division by zero"}],
+        "fixed_code": "def average(values):\n    return sum(values) / len(values) if values else 0",
+        "explanations": ["Stray + 1", "Empty input not handled"],
+        "what_to_look_for": ["Reads the code before running it", "Checks edge cases"]
+    }
+
+# Canned response per system prompt, matched by a phrase unique to each LLM stage
+CANNED_RESPONSES = [
+    ("resume analyzer", resume_analysis_response),
+    ("analyzing meeting transcripts", meeting_insights_response),
+    ("planning efficient and effective interviews", prioritized_topics_response),
+    ("evaluation criteria", evaluation_rubric_response),
+    ("Generate interview questions", additional_questions_response),
+    ("technical recruiter", interview_plan_response),
+    ("creating effective code challenges", coding_challenge_response),
+    ("system design", system_design_response),
+    ("debugging exercises", debugging_challenge_response),
+]
+
+def canned_response(messages):
+    """
+    Build the JSON answer a pipeline stage expects for a chat request.
+
+    Args:
+        messages (list): Chat messages of the request
+
+    Returns:
+        dict: Response in the shape the calling stage parses
+    """
+    system = " ".join(message["content"] for message in messages if message["role"] == "system")
+    prompt = " ".join(message["content"] for message in messages if message["role"] != "system")
+    for phrase, build in CANNED_RESPONSES:
+        if phrase.lower() in system.lower():
+            return build(prompt)
+    return {"result": "ok"}
+
+class FakeOpenAI:
+    """
+    Local stand-in for the OpenAI client that answers every request with a canned
+    response after a simulated latency, without network access or token spend.
+
+    Exposes the same subset of the client as llm_client.GovernedClient wraps:
+    chat.completions.create() (including stream=True) and audio.transcriptions.create().
+
+    Args:
+        latency (float): Base latency in seconds, scaled per model by MODEL_LATENCY_FACTORS
+        jitter (float): Each call's latency varies uniformly by up to this fraction of it
+        seed (int): Optional random seed, for repeatable runs
+    """
+
+    def __init__(self, latency=1.0, jitter=0.3, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create_chat_completion))
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self.create_transcription))
+
+    def simulated_latency(self, model):
+        """Pick the latency of one call to `model`."""
+        base = self.latency * MODEL_LATENCY_FACTORS.get(model, 1.0)
+        with self._lock:
+            self.calls += 1
+            return max(0.0, base * (1 + self._random.uniform(-self.jitter, self.jitter)))
+
+    def create_chat_completion(self, model, messages, stream=False, **kwargs):
+        content = json.dumps(canned_response(messages))
+        usage = SimpleNamespace(
+            prompt_tokens=estimate_tokens("".join(message["content"] for message in messages)),
+            completion_tokens=estimate_tokens(content)
+        )
+        usage.total_tokens = usage.prompt_tokens + usage.completion_tokens
+        latency = self.simulated_latency(model)
+
+        if stream:
+            return self.stream_chunks(content, usage, latency)
+
+        time.sleep(latency)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, finish_reason="stop", message=SimpleNamespace(role="assistant", content=content))],
+            usage=usage
+        )
+
+    def stream_chunks(self, content, usage, latency):
+        """Yield the content in chunks spread over the latency, then a usage-only chunk."""
+        pieces = [content[start:start + STREAM_CHUNK_CHARS] for start in range(0, len(content), STREAM_CHUNK_CHARS)]
+        for piece in pieces:
+            time.sleep(latency / len(pieces))
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=piece))], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+    def create_transcription(self, model, file, **kwargs):
+        time.sleep(self.simulated_latency(model))
+        text = "Client: We need a senior engineer for our platform team. The interview should take an hour."
+        return SimpleNamespace(
+            text=text,
+            language="en",
+            duration=30.0,
+            segments=[{"id": 0, "start": 0.0, "end": 30.0, "text": text}]
+        )
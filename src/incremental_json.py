@@ -0,0 +1,81 @@
+import json
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class JsonArrayStreamParser:
+    """
+    Incrementally parses a streamed JSON object and returns the items of one of its
+    top-level arrays as soon as each item is complete.
+
+    For {"topics": [{...}, {...}]} with key "topics", feed() returns each topic object
+    once its closing brace has arrived, long before the whole document is complete.
+
+    Args:
+        key (str): Name of the top-level array whose items are wanted
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.text = ""
+        self.position = 0
+        self.in_string = False
+        self.escaped = False
+        self.string_start = None
+        self.last_string = None
+        self.current_key = None
+        # One (bracket, key in parent object, start offset) entry per open object/array
+        self.stack = []
+
+    def feed(self, chunk):
+        """
+        Consume the next piece of the document.
+
+        Args:
+            chunk (str): Newly received text
+
+        Returns:
+            list: Items of the target array completed by this chunk, in order
+        """
+        self.text += chunk
+        items = []
+
+        for index in range(self.position, len(self.text)):
+            char = self.text[index]
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    self.last_string = self.text[self.string_start + 1:index]
+                continue
+
+            if char == '"':
+                self.in_string = True
+                self.string_start = index
+            elif char == ":":
+                self.current_key = self.last_string
+            elif char in "{[":
+                parent_is_object = bool(self.stack) and self.stack[-1][0] == "{"
+                self.stack.append((char, self.current_key if parent_is_object else None, index))
+                self.current_key = None
+            elif char in "}]":
+                if not self.stack:
+                    continue
+                _, _, start = self.stack.pop()
+                # An item of the target array: root object > target array > this value
+                if (len(self.stack) == 2 and self.stack[0][0] == "{"
+                        and self.stack[1][0] == "[" and self.stack[1][1] == self.key):
+                    try:
+                        items.append(json.loads(self.text[start:index + 1]))
+                    except ValueError as e:
+                        logging.warning(f"Skipping unparsable streamed {self.key} item: {str(e)}")
+            elif char == ",":
+                self.current_key = None
+
+        self.position = len(self.text)
+        return items
@@ -1,8 +1,14 @@
-import openai
+import copy
 import os
 import logging
 from dotenv import load_dotenv
 import json
+from incremental_json import JsonArrayStreamParser
+from llm_cache import cached_chat_completion
+from llm_client import client
+from model_routing import route_for
+from prompt_templates import PromptTemplate
+from stage_graph import run_stage_graph
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,10 +16,47 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Load environment variables from project root
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
-# Initialize OpenAI client
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Parts of a process_resume() result that only the voice interviewer uses
+INTERVIEWER_ONLY_KEYS = ("system_prompt", "structured_data_schema")
 
-def generate_additional_questions_for_topic(topic_name, num_questions, resume_analysis, job_details):
+def resume_prompt_context(resume_analysis):
+    """
+    Trim a resume analysis for use in a prompt: the LLM analysis and the locally extracted
+    candidate profile, without the interviewer prompt and schema derived from them.
+    """
+    if not isinstance(resume_analysis, dict):
+        return resume_analysis
+    return {key: value for key, value in resume_analysis.items() if key not in INTERVIEWER_ONLY_KEYS}
+
+ADDITIONAL_QUESTIONS_PROMPT = PromptTemplate(
+    system="You are an expert technical interviewer. Generate interview questions in JSON format only.",
+    instructions="""
+        Generate interview questions for the topic given at the end of this message, exactly as many as requested there.
+
+        Each question object must have this structure:
+        {"question": "The interview question text", "what_to_look_for": "What the interviewer should look for in the answer", "follow_up": "A relevant follow-up question"}
+
+        Return ONLY the JSON array, no other text.
+        Example format:
+        [{"question": "...", "what_to_look_for": "...", "follow_up": "..."}, {"question": "...", "what_to_look_for": "...", "follow_up": "..."}]
+    """,
+    context="""
+        Topic: "{topic_name}"
+        Number of questions: {num_questions}
+
+        Context:
+        - Job: {job_title}
+        - Job Requirements: {job_requirements}
+        - Candidate Skills: {candidate_skills}
+
+        CRITICAL: Return a JSON array with EXACTLY {num_questions} question objects.
+    """,
+    name="additional_questions",
+    priorities={"topic_name": 3, "job_title": 3, "candidate_skills": 2, "job_requirements": 1}
+)
+
+def generate_additional_questions_for_topic(topic_name, num_questions, resume_analysis, job_details, variant=None,
+                                            fallback=True):
     """
     Generate additional interview questions for a specific topic.
 
@@ -22,6 +65,8 @@ def generate_additional_questions_for_topic(topic_name, num_questions, resume_an
         num_questions (int): Number of questions to generate
         resume_analysis (dict): Candidate's resume analysis
         job_details (dict): Job details
+        variant: Optional cache discriminator, so a regeneration isn't served the cached questions
+        fallback (bool): Return placeholder questions if generation fails, instead of an empty list
 
     Returns:
         list: List of question objects with question, what_to_look_for, and follow_up
@@ -29,43 +74,26 @@ def generate_additional_questions_for_topic(topic_name, num_questions, resume_an
     logging.info(f"Generating {num_questions} additional questions for topic: {topic_name}")
 
     try:
-        prompt = f"""
-        Generate exactly {num_questions} interview questions for the topic: "{topic_name}"
-
-        Context:
-        - Job: {job_details.get('title', 'Technical Position')}
-        - Job Requirements: {job_details.get('description', 'N/A')}
-        - Candidate Skills: {', '.join(resume_analysis.get('skills', [])[:10])}
-
-        CRITICAL: Return a JSON array with EXACTLY {num_questions} question objects.
-
-        Each question object must have this structure:
-        {{
-            "question": "The interview question text",
-            "what_to_look_for": "What the interviewer should look for in the answer",
-            "follow_up": "A relevant follow-up question"
-        }}
-
-        Return ONLY the JSON array, no other text.
-        Example format:
-        [
-            {{"question": "...", "what_to_look_for": "...", "follow_up": "..."}},
-            {{"question": "...", "what_to_look_for": "...", "follow_up": "..."}}
-        ]
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert technical interviewer. Generate interview questions in JSON format only."},
-                {"role": "user", "content": prompt}
-            ],
+        route = route_for("additional_questions")
+
+        content = cached_chat_completion(
+            client,
+            model=route["model"],
+            messages=ADDITIONAL_QUESTIONS_PROMPT.messages(
+                topic_name=topic_name,
+                num_questions=num_questions,
+                job_title=job_details.get('title', 'Technical Position'),
+                job_requirements=job_details.get('description', 'N/A'),
+                candidate_skills=', '.join(resume_analysis.get('skills', [])[:10])
+            ),
             temperature=0.7,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            max_tokens=route["max_tokens"],
+            stage=route["stage"],
+            variant=variant
         )
 
-        content = response.choices[0].message.content
-        logging.info(f"GPT-4 response for additional questions: {content[:200]}...")
+        logging.info(f"{route['model']} response for additional questions: {content[:200]}...")
 
         # Parse the response
         data = json.loads(content)
@@ -101,6 +129,8 @@ def generate_additional_questions_for_topic(topic_name, num_questions, resume_an
 
     except Exception as e:
         logging.error(f"Error generating additional questions: {str(e)}")
+        if not fallback:
+            return []
         # Return fallback questions if generation fails
         fallback_questions = []
         for i in range(num_questions):
@@ -111,37 +141,11 @@ def generate_additional_questions_for_topic(topic_name, num_questions, resume_an
             })
         return fallback_questions
 
-def generate_interview_plan(resume_analysis, meeting_insights, job_details, time_limit_minutes=30):
-    """
-    Generate a comprehensive interview plan based on all inputs.
-
-    Args:
-        resume_analysis (dict): Analysis of candidate's resume
-        meeting_insights (dict): Insights extracted from client meeting
-        job_details (dict): Job description and requirements
-        time_limit_minutes (int): Interview duration in minutes
-
-    Returns:
-        dict: Structured interview plan with topics, questions, and evaluation criteria
-    """
-    logging.info("Generating interview plan")
-
-    try:
-        # Prepare context for GPT
-        context = f"""
+INTERVIEW_PLAN_PROMPT = PromptTemplate(
+    system="You are an expert technical recruiter and interview preparation specialist with deep knowledge of software engineering roles.",
+    instructions="""
         You are an expert interview preparation assistant for senior technical positions.
-        Generate a comprehensive, structured interview plan based on the following information:
-
-        CANDIDATE RESUME ANALYSIS:
-        {json.dumps(resume_analysis, indent=2)}
-
-        CLIENT MEETING INSIGHTS:
-        {json.dumps(meeting_insights, indent=2)}
-
-        JOB DETAILS:
-        {json.dumps(job_details, indent=2)}
-
-        INTERVIEW DURATION: {time_limit_minutes} minutes
+        Generate a comprehensive, structured interview plan based on the information at the end of this message.
 
         Generate a detailed interview plan with the following structure:
         1. Interview Overview (objectives, key focus areas)
@@ -168,19 +172,57 @@ def generate_interview_plan(resume_analysis, meeting_insights, job_details, time
         - Focused on technical depth for senior roles
 
         Return the complete interview plan as a structured JSON object.
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4o",  # Using GPT-4 for better quality
-            messages=[
-                {"role": "system", "content": "You are an expert technical recruiter and interview preparation specialist with deep knowledge of software engineering roles."},
-                {"role": "user", "content": context}
-            ],
+    """,
+    context="""
+        CANDIDATE RESUME ANALYSIS:
+        {resume_analysis}
+
+        CLIENT MEETING INSIGHTS:
+        {meeting_insights}
+
+        JOB DETAILS:
+        {job_details}
+
+        INTERVIEW DURATION: {time_limit_minutes} minutes
+    """,
+    name="interview_plan",
+    priorities={"meeting_insights": 3, "resume_analysis": 2, "job_details": 1}
+)
+
+def generate_interview_plan(resume_analysis, meeting_insights, job_details, time_limit_minutes=30):
+    """
+    Generate a comprehensive interview plan based on all inputs.
+
+    Args:
+        resume_analysis (dict): Analysis of candidate's resume
+        meeting_insights (dict): Insights extracted from client meeting
+        job_details (dict): Job description and requirements
+        time_limit_minutes (int): Interview duration in minutes
+
+    Returns:
+        dict: Structured interview plan with topics, questions, and evaluation criteria
+    """
+    logging.info("Generating interview plan")
+
+    try:
+        route = route_for("interview_plan")
+
+        content = cached_chat_completion(
+            client,
+            model=route["model"],
+            messages=INTERVIEW_PLAN_PROMPT.messages(
+                resume_analysis=resume_prompt_context(resume_analysis),
+                meeting_insights=meeting_insights,
+                job_details=job_details,
+                time_limit_minutes=time_limit_minutes
+            ),
             temperature=0.3,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            max_tokens=route["max_tokens"],
+            stage=route["stage"]
         )
 
-        plan = json.loads(response.choices[0].message.content)
+        plan = json.loads(content)
         logging.info("Interview plan generated successfully")
 
         # Log the full plan structure for debugging
@@ -223,51 +265,21 @@ def generate_interview_plan(resume_analysis, meeting_insights, job_details, time
         logging.error(f"Error generating interview plan: {str(e)}")
         return {"error": f"Failed to generate interview plan: {str(e)}"}
 
-def prioritize_topics(resume_analysis, meeting_insights, time_limit_minutes, job_details=None):
-    """
-    Prioritize topics based on importance and time available.
-
-    Args:
-        resume_analysis (dict): Candidate resume analysis
-        meeting_insights (dict): Client meeting insights
-        time_limit_minutes (int): Available interview time
-        job_details (dict): Job requirements and details
-
-    Returns:
-        list: Prioritized list of topics with time allocations
-    """
-    logging.info("Prioritizing interview topics")
-
-    try:
-        # Calculate available time for topics (reserve time for intro, questions, wrap-up)
-        reserved_time = 10  # 3 intro + 5 candidate questions + 2 wrap-up
-        available_time = time_limit_minutes - reserved_time
-
-        context = f"""
-        Based on the following information, create a prioritized list of topics to cover in the interview.
-
-        CANDIDATE BACKGROUND:
-        {json.dumps(resume_analysis, indent=2)}
-
-        CLIENT REQUIREMENTS:
-        {json.dumps(meeting_insights, indent=2)}
-
-        JOB DETAILS:
-        {json.dumps(job_details, indent=2) if job_details else "N/A"}
-
-        TOTAL INTERVIEW TIME: {time_limit_minutes} minutes
-        AVAILABLE TIME FOR TOPICS: {available_time} minutes (after reserving {reserved_time} minutes for intro/outro)
+PRIORITIZED_TOPICS_PROMPT = PromptTemplate(
+    system="You are an expert at planning efficient and effective interviews. You ALWAYS generate 3-5 questions for each topic without exception.",
+    instructions="""
+        Based on the information at the end of this message, create a prioritized list of topics to cover in the interview.
 
         CRITICAL INSTRUCTIONS FOR TIME ALLOCATION:
         1. Generate 5-8 topics based on importance and relevance
-        2. Allocate time to each topic so that the SUM of all allocated_time equals {available_time} minutes
+        2. Allocate time to each topic so that the SUM of all allocated_time equals the AVAILABLE TIME FOR TOPICS
         3. Higher priority topics should get more time
         4. Each topic should have at least 5 minutes and at most 15 minutes
 
         For EACH topic, you MUST provide:
         - topic_name: Name of the topic
         - priority: Priority level (1-5, where 5 is highest)
-        - allocated_time: Time allocated in minutes (ensure total = {available_time})
+        - allocated_time: Time allocated in minutes (ensure the total equals the AVAILABLE TIME FOR TOPICS)
         - rationale: Why this topic is important
         - questions: Array of 3-5 DIVERSE interview questions for THIS SPECIFIC TOPIC
 
@@ -281,23 +293,80 @@ def prioritize_topics(resume_analysis, meeting_insights, time_limit_minutes, job
         - Check that EVERY topic has a 'questions' array
         - Check that EVERY questions array has 3-5 questions (not less, not more)
         - Check that questions are specific and relevant to their topic
-        - Check that SUM of all allocated_time equals {available_time} minutes
+        - Check that SUM of all allocated_time equals the AVAILABLE TIME FOR TOPICS
         - If validation fails, fix the issues before responding
 
         Return as JSON with a 'topics' array. Each topic MUST have 3-5 questions and correct time allocation.
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert at planning efficient and effective interviews. You ALWAYS generate 3-5 questions for each topic without exception."},
-                {"role": "user", "content": context}
-            ],
+    """,
+    context="""
+        CANDIDATE BACKGROUND:
+        {resume_analysis}
+
+        CLIENT REQUIREMENTS:
+        {meeting_insights}
+
+        JOB DETAILS:
+        {job_details}
+
+        TOTAL INTERVIEW TIME: {time_limit_minutes} minutes
+        AVAILABLE TIME FOR TOPICS: {available_time} minutes (after reserving {reserved_time} minutes for intro/outro)
+    """,
+    name="prioritized_topics",
+    priorities={"meeting_insights": 3, "resume_analysis": 2, "job_details": 1}
+)
+
+def prioritize_topics(resume_analysis, meeting_insights, time_limit_minutes, job_details=None, on_topic=None):
+    """
+    Prioritize topics based on importance and time available.
+
+    Args:
+        resume_analysis (dict): Candidate resume analysis
+        meeting_insights (dict): Client meeting insights
+        time_limit_minutes (int): Available interview time
+        job_details (dict): Job requirements and details
+        on_topic (callable): Optional hook; if set, the completion is streamed and
+            on_topic(topic) is called with each raw topic as soon as it has been generated,
+            before time allocations are validated
+
+    Returns:
+        list: Prioritized list of topics with time allocations
+    """
+    logging.info("Prioritizing interview topics")
+
+    try:
+        # Calculate available time for topics (reserve time for intro, questions, wrap-up)
+        reserved_time = 10  # 3 intro + 5 candidate questions + 2 wrap-up
+        available_time = time_limit_minutes - reserved_time
+
+        route = route_for("prioritized_topics")
+
+        on_text = None
+        if on_topic:
+            parser = JsonArrayStreamParser("topics")
+
+            def on_text(delta):
+                for topic in parser.feed(delta):
+                    on_topic(topic)
+
+        content = cached_chat_completion(
+            client,
+            model=route["model"],
+            messages=PRIORITIZED_TOPICS_PROMPT.messages(
+                resume_analysis=resume_prompt_context(resume_analysis),
+                meeting_insights=meeting_insights,
+                job_details=job_details or "N/A",
+                time_limit_minutes=time_limit_minutes,
+                available_time=available_time,
+                reserved_time=reserved_time
+            ),
             temperature=0.3,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            max_tokens=route["max_tokens"],
+            stage=route["stage"],
+            on_text=on_text
         )
 
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(content)
         topics = result.get("topics", [])
 
         # Log topic structure for debugging
@@ -326,22 +395,10 @@ def prioritize_topics(resume_analysis, meeting_insights, time_limit_minutes, job
         logging.error(f"Error prioritizing topics: {str(e)}")
         return []
 
-def generate_evaluation_rubric(topics):
-    """
-    Generate scoring rubric for interview evaluation.
-
-    Args:
-        topics (list): List of topics to be covered
-
-    Returns:
-        dict: Evaluation rubric with scoring guidelines
-    """
-    logging.info("Generating evaluation rubric")
-
-    try:
-        prompt = f"""
-        Create a comprehensive evaluation rubric for an interview covering these topics:
-        {json.dumps(topics, indent=2)}
+EVALUATION_RUBRIC_PROMPT = PromptTemplate(
+    system="You are an expert at creating fair and effective evaluation criteria.",
+    instructions="""
+        Create a comprehensive evaluation rubric for an interview covering the topics at the end of this message.
 
         For each topic, provide:
         - Scoring scale (1-5)
@@ -355,19 +412,42 @@ def generate_evaluation_rubric(topics):
         - Special considerations
 
         Return as structured JSON.
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert at creating fair and effective evaluation criteria."},
-                {"role": "user", "content": prompt}
-            ],
+    """,
+    context="""
+        TOPICS:
+        {topics}
+    """,
+    name="evaluation_rubric"
+)
+
+def generate_evaluation_rubric(topics, variant=None):
+    """
+    Generate scoring rubric for interview evaluation.
+
+    Args:
+        topics (list): List of topics to be covered
+        variant: Optional cache discriminator, so a regeneration isn't served the cached rubric
+
+    Returns:
+        dict: Evaluation rubric with scoring guidelines
+    """
+    logging.info("Generating evaluation rubric")
+
+    try:
+        route = route_for("evaluation_rubric")
+
+        content = cached_chat_completion(
+            client,
+            model=route["model"],
+            messages=EVALUATION_RUBRIC_PROMPT.messages(topics=topics),
             temperature=0.2,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            max_tokens=route["max_tokens"],
+            stage=route["stage"],
+            variant=variant
         )
 
-        rubric = json.loads(response.choices[0].message.content)
+        rubric = json.loads(content)
         logging.info("Evaluation rubric generated successfully")
         logging.info(f"Rubric keys: {list(rubric.keys()) if isinstance(rubric, dict) else 'Not a dict'}")
         logging.info(f"Rubric structure (first 500 chars): {json.dumps(rubric, indent=2)[:500]}")
@@ -400,7 +480,81 @@ def generate_evaluation_rubric(topics):
         logging.error(f"Error generating evaluation rubric: {str(e)}")
         return {}
 
-def create_complete_interview_plan(resume_analysis, meeting_insights, job_details, time_limit_minutes=30):
+def normalize_topics(prioritized_topics):
+    """
+    Validate and normalize the questions and time allocation of prioritized topics in place.
+
+    Args:
+        prioritized_topics (list): Topics returned by prioritize_topics()
+
+    Returns:
+        list: The same topics, each with 3-5 question objects and an integer allocated_time_minutes
+    """
+    # Validate and normalize questions in prioritized_topics
+    # Questions should already be generated by prioritize_topics() function
+    for idx, topic in enumerate(prioritized_topics):
+        topic_name = topic.get('topic_name') or topic.get('topic') or ''
+        logging.info(f"Processing topic #{idx}: '{topic_name}'")
+
+        # Check if topic has questions from GPT
+        questions = topic.get('questions', [])
+        if not isinstance(questions, list):
+            questions = []
+            topic['questions'] = questions
+
+        logging.info(f"Topic '{topic_name}' has {len(questions)} questions from GPT")
+
+        # Validate that we have 3-5 questions per topic
+        if len(questions) < 3:
+            logging.error(f"ERROR: Topic '{topic_name}' has only {len(questions)} questions! Expected 3-5.")
+            # Generate fallback questions if GPT failed
+            logging.info(f"Generating {3 - len(questions)} fallback questions for topic '{topic_name}'")
+            for i in range(3 - len(questions)):
+                questions.append({
+                    "question": f"Can you discuss your experience with {topic_name.lower()}?",
+                    "what_to_look_for": "Depth of experience, specific examples, problem-solving approach",
+                    "follow_up": "Can you provide a specific example from your work?",
+                    "scoring_criteria": "1=No experience, 3=Some experience, 5=Expert level with concrete examples"
+                })
+        elif len(questions) > 5:
+            logging.warning(f"Topic '{topic_name}' has {len(questions)} questions, keeping first 5")
+            topic['questions'] = questions[:5]
+
+        logging.info(f"Final: topic '{topic_name}' has {len(topic['questions'])} questions")
+
+        # Normalize time field - GPT might return allocated_time instead of allocated_time_minutes
+        if 'allocated_time' in topic and 'allocated_time_minutes' not in topic:
+            topic['allocated_time_minutes'] = topic['allocated_time']
+
+        # Ensure time is in correct format
+        if 'allocated_time_minutes' in topic:
+            try:
+                topic['allocated_time_minutes'] = int(topic['allocated_time_minutes'])
+            except (ValueError, TypeError):
+                topic['allocated_time_minutes'] = 0
+        else:
+            topic['allocated_time_minutes'] = 0
+
+        # Normalize question structure if needed
+        if 'questions' in topic and topic['questions']:
+            logging.info(f"Topic '{topic_name}' has {len(topic['questions'])} questions")
+            for i, question in enumerate(topic['questions']):
+                # Ensure question has expected fields
+                if isinstance(question, str):
+                    # If question is just a string, convert to object
+                    topic['questions'][i] = {
+                        'question': question,
+                        'what_to_look_for': '',
+                        'scoring_criteria': ''
+                    }
+                    logging.info(f"Converted question {i+1} from string to object")
+        else:
+            logging.warning(f"Topic '{topic_name}' has no questions!")
+
+    return prioritized_topics
+
+def create_complete_interview_plan(resume_analysis, meeting_insights, job_details, time_limit_minutes=30, on_topics=None,
+                                   on_topic=None):
     """
     Create a complete interview plan with all components.
 
@@ -409,6 +563,11 @@ def create_complete_interview_plan(resume_analysis, meeting_insights, job_detail
         meeting_insights (dict): Meeting insights
         job_details (dict): Job details
         time_limit_minutes (int): Interview duration
+        on_topics (callable): Optional hook called with the normalized prioritized topics
+            as soon as they are ready, before the rest of the plan is finished
+        on_topic (callable): Optional hook called with each normalized topic while the
+            topics are still being generated (a preview: time allocations may still be
+            rebalanced in the final topics)
 
     Returns:
         dict: Complete interview plan ready for export
@@ -421,18 +580,31 @@ def create_complete_interview_plan(resume_analysis, meeting_insights, job_detail
         if isinstance(resume_analysis, dict):
             logging.info(f"Resume analysis structure (first 500 chars): {json.dumps(resume_analysis, indent=2)[:500]}")
 
-        # Generate main plan
-        main_plan = generate_interview_plan(resume_analysis, meeting_insights, job_details, time_limit_minutes)
+        def preview_topic(topic):
+            # prioritize_topics keeps adjusting its own copy of the topic
+            on_topic(normalize_topics([copy.deepcopy(topic)])[0])
+
+        def topics_stage():
+            topics = normalize_topics(prioritize_topics(resume_analysis, meeting_insights, time_limit_minutes, job_details,
+                                                        on_topic=preview_topic if on_topic else None))
+            if on_topics:
+                on_topics(topics)
+            return topics
+
+        # Main plan and topic prioritization don't depend on each other, and the
+        # rubric only needs the topics, so all three overlap
+        results = run_stage_graph({
+            "main_plan": (lambda: generate_interview_plan(resume_analysis, meeting_insights, job_details, time_limit_minutes), []),
+            "prioritized_topics": (topics_stage, []),
+            "rubric": (generate_evaluation_rubric, ["prioritized_topics"]),
+        })
+        main_plan = results["main_plan"]
+        prioritized_topics = results["prioritized_topics"]
+        rubric = results["rubric"]
 
         if "error" in main_plan:
             return main_plan
 
-        # Prioritize topics
-        prioritized_topics = prioritize_topics(resume_analysis, meeting_insights, time_limit_minutes, job_details)
-
-        # Generate evaluation rubric
-        rubric = generate_evaluation_rubric(prioritized_topics)
-
         # Log the raw main_plan structure first
         logging.info("=" * 80)
         logging.info("RAW MAIN_PLAN STRUCTURE FROM GPT-4:")
@@ -466,67 +638,6 @@ def create_complete_interview_plan(resume_analysis, meeting_insights, job_detail
         interview_overview = interview_plan_data.get('interviewOverview') or interview_plan_data.get('interview_overview') or {}
         logging.info(f"Extracted interview_overview keys: {list(interview_overview.keys()) if isinstance(interview_overview, dict) else 'Not a dict'}")
 
-        # Validate and normalize questions in prioritized_topics
-        # Questions should already be generated by prioritize_topics() function
-        for idx, topic in enumerate(prioritized_topics):
-            topic_name = topic.get('topic_name') or topic.get('topic') or ''
-            logging.info(f"Processing topic #{idx}: '{topic_name}'")
-
-            # Check if topic has questions from GPT
-            questions = topic.get('questions', [])
-            if not isinstance(questions, list):
-                questions = []
-                topic['questions'] = questions
-
-            logging.info(f"Topic '{topic_name}' has {len(questions)} questions from GPT")
-
-            # Validate that we have 3-5 questions per topic
-            if len(questions) < 3:
-                logging.error(f"ERROR: Topic '{topic_name}' has only {len(questions)} questions! Expected 3-5.")
-                # Generate fallback questions if GPT failed
-                logging.info(f"Generating {3 - len(questions)} fallback questions for topic '{topic_name}'")
-                for i in range(3 - len(questions)):
-                    questions.append({
-                        "question": f"Can you discuss your experience with {topic_name.lower()}?",
-                        "what_to_look_for": "Depth of experience, specific examples, problem-solving approach",
-                        "follow_up": "Can you provide a specific example from your work?",
-                        "scoring_criteria": "1=No experience, 3=Some experience, 5=Expert level with concrete examples"
-                    })
-            elif len(questions) > 5:
-                logging.warning(f"Topic '{topic_name}' has {len(questions)} questions, keeping first 5")
-                topic['questions'] = questions[:5]
-
-            logging.info(f"Final: topic '{topic_name}' has {len(topic['questions'])} questions")
-
-            # Normalize time field - GPT might return allocated_time instead of allocated_time_minutes
-            if 'allocated_time' in topic and 'allocated_time_minutes' not in topic:
-                topic['allocated_time_minutes'] = topic['allocated_time']
-
-            # Ensure time is in correct format
-            if 'allocated_time_minutes' in topic:
-                try:
-                    topic['allocated_time_minutes'] = int(topic['allocated_time_minutes'])
-                except (ValueError, TypeError):
-                    topic['allocated_time_minutes'] = 0
-            else:
-                topic['allocated_time_minutes'] = 0
-
-            # Normalize question structure if needed
-            if 'questions' in topic and topic['questions']:
-                logging.info(f"Topic '{topic_name}' has {len(topic['questions'])} questions")
-                for i, question in enumerate(topic['questions']):
-                    # Ensure question has expected fields
-                    if isinstance(question, str):
-                        # If question is just a string, convert to object
-                        topic['questions'][i] = {
-                            'question': question,
-                            'what_to_look_for': '',
-                            'scoring_criteria': ''
-                        }
-                        logging.info(f"Converted question {i+1} from string to object")
-            else:
-                logging.warning(f"Topic '{topic_name}' has no questions!")
-
         # Combine everything
         complete_plan = {
             "metadata": main_plan.get("metadata", {}),
@@ -0,0 +1,80 @@
+import logging
+import os
+import time
+import uuid
+from cache_backends import CACHE_DIR, create_backend
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Job profiles: a job's requirements and the insights of its client meeting, analyzed
+# once per recruiting campaign and referenced by every candidate's plan request
+profile_store = create_backend(
+    os.getenv("JOB_PROFILE_BACKEND", "tiered"),
+    path=os.getenv("JOB_PROFILE_PATH", os.path.join(CACHE_DIR, "job_profiles.sqlite3")),
+    max_entries=int(os.getenv("JOB_PROFILE_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.getenv("JOB_PROFILE_TTL_SECONDS", "0")) or None,
+    memory_entries=int(os.getenv("JOB_PROFILE_MEMORY_ENTRIES", "64"))
+)
+
+def create_job_profile(job_position, job_requirements, meeting_insights, interview_duration_minutes=None):
+    """
+    Store a job profile.
+
+    Args:
+        job_position (str): Job title
+        job_requirements (str): Job requirements text
+        meeting_insights (dict): Insights extracted from the client meeting
+        interview_duration_minutes (int): Requested interview length, or None to use
+            the length from the meeting insights
+
+    Returns:
+        dict: The stored profile, including its job_profile_id
+
+    Raises:
+        RuntimeError: If profile storage is disabled (JOB_PROFILE_BACKEND=none)
+    """
+    if profile_store is None:
+        raise RuntimeError("Job profiles are disabled")
+
+    profile = {
+        "job_profile_id": uuid.uuid4().hex,
+        "job_position": job_position,
+        "job_requirements": job_requirements,
+        "interview_duration_minutes": interview_duration_minutes,
+        "meeting_insights": meeting_insights,
+        "created_at": time.time()
+    }
+    profile_store.set(profile["job_profile_id"], profile)
+    logging.info(f"Created job profile {profile['job_profile_id']} ({job_position})")
+
+    return profile
+
+def get_job_profile(job_profile_id):
+    """
+    Look up a job profile.
+
+    Args:
+        job_profile_id (str): ID returned by create_job_profile()
+
+    Returns:
+        dict: The profile, or None if unknown or expired
+    """
+    if profile_store is None:
+        return None
+    return profile_store.get(job_profile_id)
+
+def delete_job_profile(job_profile_id):
+    """
+    Delete a job profile.
+
+    Args:
+        job_profile_id (str): ID returned by create_job_profile()
+
+    Returns:
+        bool: True if the profile existed
+    """
+    if get_job_profile(job_profile_id) is None:
+        return False
+    profile_store.delete(job_profile_id)
+    return True
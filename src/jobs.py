@@ -0,0 +1,136 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+class JobQueueFull(Exception):
+    """Raised when the job queue has no room for another job."""
+
+class JobManager:
+    """
+    Runs long pipeline jobs on a bounded background executor and tracks their progress.
+
+    Args:
+        stage_names (list): Stages every job reports on, in display order
+        max_workers (int): Number of jobs running at the same time
+        max_pending (int): Maximum number of queued or running jobs before submissions are rejected
+        result_ttl_seconds (float): How long finished jobs are kept for polling
+    """
+
+    def __init__(self, stage_names, max_workers=4, max_pending=20, result_ttl_seconds=3600):
+        self.stage_names = list(stage_names)
+        self.max_pending = max_pending
+        self.result_ttl_seconds = result_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """
+        Queue func(*args, on_stage=...) as a background job.
+
+        Args:
+            func (callable): Job body; receives an on_stage(name, status, result) progress hook
+            *args: Positional arguments for func
+
+        Returns:
+            str: ID of the new job
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running
+        """
+        self.purge_expired()
+
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if job["state"] in ("queued", "running"))
+            if active >= self.max_pending:
+                raise JobQueueFull(f"{active} jobs are already queued or running")
+
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "state": "queued",
+                "stages": {name: "pending" for name in self.stage_names},
+                "result": None,
+                "error": None,
+                "created_at": now,
+                "updated_at": now,
+                "finished_at": None
+            }
+
+        self._executor.submit(self._run, job_id, func, args)
+        logging.info(f"Queued job {job_id}")
+        return job_id
+
+    def get(self, job_id):
+        """
+        Return a snapshot of a job's progress.
+
+        Args:
+            job_id (str): Job ID returned by submit()
+
+        Returns:
+            dict: Job state, per-stage status, the currently running stages and, once
+                finished, the result or error; None if the job is unknown or expired
+        """
+        self.purge_expired()
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            snapshot = dict(job)
+            snapshot["stages"] = dict(job["stages"])
+            snapshot["current_stages"] = [name for name, status in job["stages"].items() if status == "running"]
+            return snapshot
+
+    def purge_expired(self):
+        """Forget finished jobs older than result_ttl_seconds."""
+        cutoff = time.time() - self.result_ttl_seconds
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job["finished_at"] is not None and job["finished_at"] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+                job["updated_at"] = time.time()
+
+    def _run(self, job_id, func, args):
+        self._update(job_id, state="running")
+
+        def on_stage(name, status, result):
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job["stages"][name] = status
+                    job["updated_at"] = time.time()
+
+        try:
+            result = func(*args, on_stage=on_stage)
+            self._update(job_id, state="succeeded", result=result, finished_at=time.time())
+            logging.info(f"Job {job_id} succeeded")
+        except Exception as e:
+            logging.error(f"Job {job_id} failed: {str(e)}")
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    for name, status in job["stages"].items():
+                        if status == "running":
+                            job["stages"][name] = "failed"
+            self._update(job_id, state="failed", error=e, finished_at=time.time())
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from dotenv import load_dotenv
+from cache_backends import CACHE_DIR, create_backend
+from metrics import record_llm_call
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# LLM_CACHE_BACKEND: 'memory' (default), 'sqlite', 'tiered' or 'none'
+cache_backend = create_backend(
+    os.getenv("LLM_CACHE_BACKEND", "memory"),
+    path=os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite3")),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+)
+
+def make_cache_key(model, messages, temperature=None, response_format=None, max_tokens=None, variant=None):
+    """
+    Build a content-addressed cache key for a chat completion request.
+
+    Args:
+        model (str): Model name
+        messages (list): Chat messages
+        temperature (float): Sampling temperature
+        response_format (dict): Response format, e.g. {"type": "json_object"}
+        max_tokens (int): Completion token limit (it can truncate the output, so it is part of the key)
+        variant: Optional discriminator for callers that deliberately repeat a request
+            to get different samples
+
+    Returns:
+        str: SHA-256 hex digest of the canonical request
+    """
+    canonical = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "response_format": response_format,
+            "max_tokens": max_tokens,
+            "variant": variant
+        },
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def cached_chat_completion(client, model, messages, temperature=None, response_format=None, max_tokens=None, variant=None,
+                           on_text=None, stage=None):
+    """
+    Run a chat completion, serving byte-identical requests from the cache.
+
+    Args:
+        client: OpenAI client used on a cache miss
+        model (str): Model name
+        messages (list): Chat messages
+        temperature (float): Sampling temperature
+        response_format (dict): Response format, e.g. {"type": "json_object"}
+        max_tokens (int): Completion token limit
+        variant: Optional discriminator so repeated identical requests get separate cache entries
+        on_text (callable): If set, the completion is streamed and on_text(delta) is called with
+            each piece of content as it arrives (once with the whole content on a cache hit)
+        stage (str): Routing stage making the call, used to label its metrics
+
+    Returns:
+        str: Content of the first completion choice
+    """
+    key = make_cache_key(model, messages, temperature, response_format, max_tokens, variant)
+    stage = stage or "unknown"
+    started = time.monotonic()
+
+    if cache_backend is not None:
+        cached = cache_backend.get(key)
+        if cached is not None:
+            logging.info(f"LLM cache hit for {model} ({key[:12]})")
+            if on_text:
+                on_text(cached)
+            record_llm_call(stage, model, time.monotonic() - started, cache_hit=True)
+            return cached
+
+    request = {"model": model, "messages": messages}
+    if temperature is not None:
+        request["temperature"] = temperature
+    if response_format is not None:
+        request["response_format"] = response_format
+    if max_tokens is not None:
+        request["max_tokens"] = max_tokens
+
+    try:
+        if on_text:
+            content, usage = stream_chat_completion(client, request, on_text)
+        else:
+            response = client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+    except Exception:
+        record_llm_call(stage, model, time.monotonic() - started, cache_hit=False, status="error")
+        raise
+    record_llm_call(
+        stage, model, time.monotonic() - started, cache_hit=False,
+        prompt_tokens=getattr(usage, "prompt_tokens", None) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", None) or 0
+    )
+
+    if cache_backend is not None and content is not None and is_cacheable(content, response_format):
+        cache_backend.set(key, content)
+
+    return content
+
+def stream_chat_completion(client, request, on_text):
+    """
+    Run a chat completion with stream=True, passing each content delta to on_text.
+
+    Returns:
+        tuple: The full content of the completion and its usage (None if not reported)
+    """
+    parts = []
+    usage = None
+    for chunk in client.chat.completions.create(**request, stream=True):
+        usage = getattr(chunk, "usage", None) or usage
+        if not chunk.choices:
+            continue  # e.g. the final usage-only chunk
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            on_text(delta)
+    return "".join(parts), usage
+
+def is_cacheable(content, response_format):
+    """Only keep JSON-mode responses that actually parse, so a truncated answer isn't replayed forever."""
+    if (response_format or {}).get("type") != "json_object":
+        return True
+    try:
+        json.loads(content)
+        return True
+    except json.JSONDecodeError:
+        return False
@@ -0,0 +1,310 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+import openai
+from dotenv import load_dotenv
+from llm_policy import LLM_TIMEOUT_SECONDS, call_with_retries, hedged_call, latency_tracker
+from transcript_chunks import estimate_tokens
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Requests and tokens per minute allowed per model (matched by longest prefix). Override
+# with OPENAI_RATE_LIMITS="gpt-4o-mini=500/200000,gpt-4=500/10000"; 0 tokens = no TPM limit
+DEFAULT_RATE_LIMITS = {
+    "gpt-4o-mini": (500, 200000),
+    "gpt-4o": (500, 30000),
+    "gpt-4": (500, 10000),
+    "whisper-1": (50, 0),
+}
+
+# Limits for models missing from the table
+FALLBACK_RATE_LIMIT = (int(os.getenv("OPENAI_DEFAULT_RPM", "500")), int(os.getenv("OPENAI_DEFAULT_TPM", "30000")))
+
+# Maximum number of OpenAI requests in flight across the whole process
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+
+# Completion size assumed for requests without max_tokens, until the real usage is known
+DEFAULT_COMPLETION_TOKENS = 1000
+
+def parse_rate_limits(spec):
+    """
+    Parse an OPENAI_RATE_LIMITS value.
+
+    Args:
+        spec (str): Comma-separated "model=rpm/tpm" entries
+
+    Returns:
+        dict: Mapping of model prefix to an (rpm, tpm) tuple
+    """
+    limits = {}
+    for entry in filter(None, (part.strip() for part in (spec or "").split(","))):
+        model, _, rates = entry.partition("=")
+        rpm, _, tpm = rates.partition("/")
+        limits[model.strip()] = (int(rpm), int(tpm or 0))
+    return limits
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute, holding at most one minute's worth.
+
+    Capacity is reserved up front: reserve() always succeeds and returns how long the
+    caller has to wait, so callers that reserve in order are served in order.
+    """
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.rate_per_second = rate_per_minute / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate_per_second)
+        self.updated = now
+
+    def reserve(self, amount):
+        """
+        Take amount from the bucket, going into debt if needed.
+
+        Returns:
+            float: Seconds to wait before the reserved capacity is actually available
+        """
+        with self._lock:
+            self._refill()
+            # A single request larger than the bucket would otherwise wait forever
+            self.available -= min(amount, self.capacity)
+            return max(0.0, -self.available / self.rate_per_second)
+
+    def adjust(self, amount):
+        """Give back (positive) or take (negative) tokens once the real usage is known."""
+        with self._lock:
+            self._refill()
+            self.available = min(self.capacity, self.available + amount)
+
+class FairSemaphore:
+    """Semaphore that hands out slots strictly in the order they were requested."""
+
+    def __init__(self, value):
+        self._value = value
+        self._waiters = deque()
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            ticket = object()
+            self._waiters.append(ticket)
+            while self._waiters[0] is not ticket or self._value == 0:
+                self._condition.wait()
+            self._waiters.popleft()
+            self._value -= 1
+            self._condition.notify_all()
+
+    def release(self):
+        with self._condition:
+            self._value += 1
+            self._condition.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    @property
+    def waiting(self):
+        """Number of callers waiting for a slot."""
+        return len(self._waiters)
+
+class RateGovernor:
+    """
+    Keeps OpenAI traffic within per-model RPM/TPM limits and a global in-flight cap.
+
+    Args:
+        rate_limits (dict): Mapping of model prefix to an (rpm, tpm) tuple
+        max_in_flight (int): Maximum number of requests sent at the same time
+    """
+
+    def __init__(self, rate_limits, max_in_flight):
+        self.rate_limits = dict(rate_limits)
+        self.max_in_flight = max_in_flight
+        self._slots = FairSemaphore(max_in_flight)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._waiting_for_rate = {}
+        self._in_flight = 0
+
+    def _buckets_for(self, model):
+        with self._lock:
+            if model not in self._buckets:
+                prefixes = [prefix for prefix in self.rate_limits if model.startswith(prefix)]
+                rpm, tpm = self.rate_limits[max(prefixes, key=len)] if prefixes else FALLBACK_RATE_LIMIT
+                self._buckets[model] = (TokenBucket(rpm) if rpm else None, TokenBucket(tpm) if tpm else None)
+            return self._buckets[model]
+
+    def acquire(self, model, tokens):
+        """
+        Wait until a request of about `tokens` tokens may be sent to `model`.
+
+        Returns:
+            int: The number of tokens reserved, to pass to release()
+        """
+        requests_bucket, tokens_bucket = self._buckets_for(model)
+        wait = requests_bucket.reserve(1) if requests_bucket else 0.0
+        if tokens_bucket and tokens:
+            wait = max(wait, tokens_bucket.reserve(tokens))
+
+        if wait > 0:
+            logging.info(f"Rate limiting {model}: waiting {wait:.2f}s")
+            with self._lock:
+                self._waiting_for_rate[model] = self._waiting_for_rate.get(model, 0) + 1
+            try:
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self._waiting_for_rate[model] -= 1
+
+        self._slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+        return tokens
+
+    def release(self, model, reserved_tokens, used_tokens=None):
+        """Free the request's slot and settle its token reservation against the real usage."""
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+        _, tokens_bucket = self._buckets_for(model)
+        if tokens_bucket and used_tokens is not None:
+            tokens_bucket.adjust(reserved_tokens - used_tokens)
+
+    def queue_depth(self):
+        """Number of requests waiting for rate limit capacity or an in-flight slot."""
+        with self._lock:
+            return sum(self._waiting_for_rate.values()) + self._slots.waiting
+
+    def stats(self):
+        """Snapshot of the governor's state."""
+        with self._lock:
+            waiting_for_rate = {model: count for model, count in self._waiting_for_rate.items() if count}
+            in_flight = self._in_flight
+        return {
+            "in_flight": in_flight,
+            "max_in_flight": self.max_in_flight,
+            "waiting_for_slot": self._slots.waiting,
+            "waiting_for_rate_limit": waiting_for_rate,
+            "queue_depth": sum(waiting_for_rate.values()) + self._slots.waiting
+        }
+
+def estimate_request_tokens(request):
+    """Estimate the tokens a chat completion request will consume (prompt plus completion)."""
+    prompt = "".join(str(message.get("content", "")) for message in request.get("messages", []))
+    return estimate_tokens(prompt) + (request.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+class GovernedClient:
+    """
+    OpenAI client whose requests all pass through a RateGovernor and the call policy
+    of llm_policy: a per-attempt timeout, retries with jittered backoff and, for chat
+    completions, optional hedging.
+
+    Exposes the subset of the OpenAI client used in this project, with the same call
+    signatures: chat.completions.create() and audio.transcriptions.create().
+    """
+
+    def __init__(self, client, governor):
+        self.client = client
+        self.governor = governor
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create_chat_completion))
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self.create_transcription))
+
+    def create_chat_completion(self, **request):
+        model = request["model"]
+        request.setdefault("timeout", LLM_TIMEOUT_SECONDS)
+        if request.get("stream"):
+            # Only opening the stream is retried; streams are not hedged
+            return call_with_retries(lambda: self.open_chat_stream(request), description=f"{model} chat stream")
+        return call_with_retries(
+            lambda: hedged_call(lambda: self.send_chat_completion(request), model),
+            description=f"{model} chat completion"
+        )
+
+    def send_chat_completion(self, request):
+        """Send one chat completion attempt within the rate limits."""
+        model = request["model"]
+        reserved = self.governor.acquire(model, estimate_request_tokens(request))
+        used = None
+        try:
+            started = time.monotonic()
+            response = self.client.chat.completions.create(**request)
+            latency_tracker.record(model, time.monotonic() - started)
+            usage = getattr(response, "usage", None)
+            used = getattr(usage, "total_tokens", None)
+            return response
+        finally:
+            self.governor.release(model, reserved, used)
+
+    def open_chat_stream(self, request):
+        """
+        Open a streamed chat completion within the rate limits.
+
+        Returns:
+            generator: The stream's chunks; the in-flight slot is held until it is
+                exhausted or closed
+        """
+        model = request["model"]
+        request = {**request, "stream_options": {"include_usage": True}}
+        reserved = self.governor.acquire(model, estimate_request_tokens(request))
+        try:
+            started = time.monotonic()
+            stream = self.client.chat.completions.create(**request)
+        except Exception:
+            self.governor.release(model, reserved)
+            raise
+
+        def chunks():
+            used = None
+            try:
+                for chunk in stream:
+                    usage = getattr(chunk, "usage", None)
+                    if usage is not None:
+                        used = getattr(usage, "total_tokens", None)
+                    yield chunk
+                latency_tracker.record(model, time.monotonic() - started)
+            finally:
+                self.governor.release(model, reserved, used)
+
+        return chunks()
+
+    def create_transcription(self, **request):
+        model = request["model"]
+        request.setdefault("timeout", LLM_TIMEOUT_SECONDS * 5)
+
+        def send_transcription():
+            # A retry has to upload the file from the start again
+            if hasattr(request.get("file"), "seek"):
+                request["file"].seek(0)
+            reserved = self.governor.acquire(model, 0)
+            try:
+                return self.client.audio.transcriptions.create(**request)
+            finally:
+                self.governor.release(model, reserved)
+
+        return call_with_retries(send_transcription, description=f"{model} transcription")
+
+governor = RateGovernor(
+    {**DEFAULT_RATE_LIMITS, **parse_rate_limits(os.getenv("OPENAI_RATE_LIMITS"))},
+    max_in_flight=LLM_MAX_IN_FLIGHT
+)
+
+# The one OpenAI client shared by every module
+# Retries are handled by llm_policy, not by the SDK
+client = GovernedClient(openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0), governor)
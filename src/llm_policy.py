@@ -0,0 +1,139 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import openai
+from dotenv import load_dotenv
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Per-attempt timeout, and retries of attempts that failed with a retryable error
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+
+# Backoff before retry n is a random delay between 0 and min(cap, base * 2**n)
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_CAP_SECONDS = float(os.getenv("LLM_BACKOFF_CAP_SECONDS", "20"))
+
+# Hedging: once a chat completion has been running longer than the model's p95 latency
+# (and at least LLM_HEDGE_MIN_DELAY_SECONDS), a duplicate is sent and the first answer wins.
+# The slower request still runs to completion and is paid for, so it is off by default
+LLM_HEDGING = os.getenv("LLM_HEDGING", "false").lower() in ("1", "true", "yes", "on")
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "2"))
+
+# Latency samples needed per model before its p95 is trusted for hedging
+HEDGE_MIN_SAMPLES = 20
+
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+
+def is_retryable(error):
+    """Return True for errors worth retrying: timeouts, connection errors, 429 and 5xx."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, TimeoutError)
+
+def retry_after_seconds(error):
+    """Return the delay the server asked for in a Retry-After header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def backoff_seconds(attempt):
+    """Jittered exponential backoff ("full jitter") before retry number `attempt` (0-based)."""
+    return random.uniform(0, min(LLM_BACKOFF_CAP_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+def call_with_retries(call, description, max_retries=LLM_MAX_RETRIES):
+    """
+    Call `call()` and retry it on retryable errors with jittered exponential backoff.
+
+    Args:
+        call (callable): One attempt; raises on failure
+        description (str): What is being called, for logging
+        max_retries (int): Retries after the first attempt
+
+    Returns:
+        The result of the first successful attempt
+
+    Raises:
+        Exception: The last error, once it isn't retryable or retries are exhausted
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return call()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = max(backoff_seconds(attempt), retry_after_seconds(e) or 0)
+            logging.warning(f"{description} failed ({type(e).__name__}: {str(e)}), retrying in {delay:.1f}s "
+                            f"({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+class LatencyTracker:
+    """Keeps the most recent request latencies per model to estimate their p95."""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, model, seconds):
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def p95(self, model):
+        """Return the model's p95 latency in seconds, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+latency_tracker = LatencyTracker()
+
+# Threads for hedged requests; the caller waits on them instead of calling directly
+hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+def hedged_call(call, model):
+    """
+    Call `call()`, and send a duplicate if the first attempt is slower than the model's p95.
+
+    Args:
+        call (callable): One request; raises on failure
+        model (str): Model name, used to look up its latency distribution
+
+    Returns:
+        The result of whichever request succeeds first
+
+    Raises:
+        Exception: The error of the first request if every request failed
+    """
+    p95 = latency_tracker.p95(model) if LLM_HEDGING else None
+    if p95 is None:
+        return call()
+
+    primary = hedge_executor.submit(call)
+    done, _ = wait([primary], timeout=max(p95, LLM_HEDGE_MIN_DELAY_SECONDS))
+    if done:
+        return primary.result()
+
+    logging.info(f"Hedging {model} request after {max(p95, LLM_HEDGE_MIN_DELAY_SECONDS):.1f}s")
+    pending = {primary, hedge_executor.submit(call)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+
+    return primary.result()
@@ -0,0 +1,180 @@
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Latency buckets in seconds, from a cache hit to a slow gpt-4 completion
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+# USD per million (prompt, completion) tokens, matched by longest model prefix
+PRICES_PER_MILLION_TOKENS = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4": (30.00, 60.00),
+}
+
+def format_labels(names, values, extra=None):
+    """Render a Prometheus label set, escaping values."""
+    pairs = list(zip(names, values)) + (list(extra.items()) if extra else [])
+    if not pairs:
+        return ""
+    escaped = [(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in pairs]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(self.labelnames, key)} {value}")
+        return lines
+
+class Histogram:
+    """Histogram with cumulative buckets and labels."""
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(f"{self.name}_bucket{format_labels(self.labelnames, key, {'le': bound})} {count}")
+                lines.append(f"{self.name}_bucket{format_labels(self.labelnames, key, {'le': '+Inf'})} {series['count']}")
+                lines.append(f"{self.name}_sum{format_labels(self.labelnames, key)} {series['sum']}")
+                lines.append(f"{self.name}_count{format_labels(self.labelnames, key)} {series['count']}")
+        return lines
+
+class Gauge:
+    """Gauge whose value is read from a callback when metrics are scraped."""
+
+    def __init__(self, name, help_text, callback):
+        self.name = name
+        self.help_text = help_text
+        self.callback = callback
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {self.callback()}"]
+
+class Registry:
+    """The set of metrics exposed on /metrics."""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logging.error(f"Error rendering metric {metric.name}: {str(e)}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+stage_duration = registry.register(Histogram(
+    "pipeline_stage_duration_seconds", "Duration of pipeline stages.", ["stage", "status"]))
+llm_call_duration = registry.register(Histogram(
+    "llm_call_duration_seconds", "Duration of LLM calls, including rate limit waits and retries.", ["stage", "model", "cache"]))
+llm_calls = registry.register(Counter(
+    "llm_calls_total", "LLM calls by outcome and cache result.", ["stage", "model", "cache", "status"]))
+llm_tokens = registry.register(Counter(
+    "llm_tokens_total", "Tokens used by LLM calls (cache misses only).", ["stage", "model", "kind"]))
+llm_cost = registry.register(Counter(
+    "llm_cost_usd_total", "Estimated cost of LLM calls in USD.", ["stage", "model"]))
+
+def call_cost(model, prompt_tokens, completion_tokens):
+    """Estimate the USD cost of one call from PRICES_PER_MILLION_TOKENS (0 for unknown models)."""
+    prefixes = [prefix for prefix in PRICES_PER_MILLION_TOKENS if model.startswith(prefix)]
+    if not prefixes:
+        return 0.0
+    prompt_price, completion_price = PRICES_PER_MILLION_TOKENS[max(prefixes, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+def record_llm_call(stage, model, seconds, cache_hit, status="success", prompt_tokens=0, completion_tokens=0):
+    """
+    Record one LLM call.
+
+    Args:
+        stage (str): Routing stage that made the call (see model_routing)
+        model (str): Model name
+        seconds (float): Wall time of the call
+        cache_hit (bool): Whether the response came from the LLM cache
+        status (str): "success" or "error"
+        prompt_tokens (int): Prompt tokens reported by the API
+        completion_tokens (int): Completion tokens reported by the API
+    """
+    cache = "hit" if cache_hit else "miss"
+    llm_call_duration.observe(seconds, stage=stage, model=model, cache=cache)
+    llm_calls.inc(stage=stage, model=model, cache=cache, status=status)
+    if prompt_tokens or completion_tokens:
+        llm_tokens.inc(prompt_tokens, stage=stage, model=model, kind="prompt")
+        llm_tokens.inc(completion_tokens, stage=stage, model=model, kind="completion")
+        llm_cost.inc(call_cost(model, prompt_tokens, completion_tokens), stage=stage, model=model)
+
+@contextmanager
+def stage_timer(stage):
+    """Time the enclosed block as one pipeline stage, labelled with its outcome."""
+    started = time.monotonic()
+    status = "success"
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        stage_duration.observe(time.monotonic() - started, stage=stage, status=status)
+
+def timed_stage(stage):
+    """Decorator form of stage_timer."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
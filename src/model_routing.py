@@ -0,0 +1,138 @@
+import contextvars
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from llm_policy import latency_tracker
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Model and max_tokens used by each LLM stage, per routing profile. "default" keeps
+# the stronger models where quality matters most; "fast" uses small models everywhere
+ROUTING_PROFILES = {
+    "default": {
+        "resume_analysis": {"model": "gpt-4o-mini", "max_tokens": 1000},
+        "meeting_insights": {"model": "gpt-4o-mini", "max_tokens": None},
+        "interview_plan": {"model": "gpt-4o", "max_tokens": None},
+        "prioritized_topics": {"model": "gpt-4o", "max_tokens": None},
+        "evaluation_rubric": {"model": "gpt-4o-mini", "max_tokens": None},
+        "additional_questions": {"model": "gpt-4", "max_tokens": None},
+        "coding_challenge": {"model": "gpt-4o", "max_tokens": None},
+        "system_design": {"model": "gpt-4o", "max_tokens": None},
+        "debugging_challenge": {"model": "gpt-4o-mini", "max_tokens": None},
+    },
+    "fast": {
+        "resume_analysis": {"model": "gpt-4o-mini", "max_tokens": 1000},
+        "meeting_insights": {"model": "gpt-4o-mini", "max_tokens": None},
+        "interview_plan": {"model": "gpt-4o-mini", "max_tokens": 3000},
+        "prioritized_topics": {"model": "gpt-4o-mini", "max_tokens": 4000},
+        "evaluation_rubric": {"model": "gpt-4o-mini", "max_tokens": 1500},
+        "additional_questions": {"model": "gpt-4o-mini", "max_tokens": 1500},
+        "coding_challenge": {"model": "gpt-4o-mini", "max_tokens": 2500},
+        "system_design": {"model": "gpt-4o-mini", "max_tokens": 2500},
+        "debugging_challenge": {"model": "gpt-4o-mini", "max_tokens": 2000},
+    },
+}
+
+# Profile used when a request doesn't pick one
+MODEL_PROFILE = os.getenv("MODEL_PROFILE", "default")
+
+# Faster model each model falls back to when a request's latency budget is running out
+DOWNGRADE_MODELS = {"gpt-4": "gpt-4o-mini", "gpt-4o": "gpt-4o-mini"}
+
+# Latency assumed for a model until enough calls have been observed (rough p95, seconds)
+EXPECTED_LATENCY_SECONDS = {"gpt-4": 45.0, "gpt-4o": 20.0, "gpt-4o-mini": 10.0}
+
+# End-to-end latency budget of a pipeline run; 0 disables automatic downgrades
+PIPELINE_LATENCY_BUDGET_SECONDS = float(os.getenv("PIPELINE_LATENCY_BUDGET_SECONDS", "0"))
+
+# Routing state of the current request: {"profile", "deadline"}. Thread pools that run
+# LLM stages copy the context of the thread that submits the work
+current_routing = contextvars.ContextVar("current_routing", default=None)
+
+def parse_model_routes(spec):
+    """
+    Parse a MODEL_ROUTES value.
+
+    Args:
+        spec (str): Comma-separated "stage=model" or "stage=model:max_tokens" entries
+
+    Returns:
+        dict: Mapping of stage to a partial route dict
+    """
+    routes = {}
+    for entry in filter(None, (part.strip() for part in (spec or "").split(","))):
+        stage, _, target = entry.partition("=")
+        model, _, max_tokens = target.partition(":")
+        route = {"model": model.strip()}
+        if max_tokens:
+            route["max_tokens"] = int(max_tokens)
+        routes[stage.strip()] = route
+    return routes
+
+# Operator overrides of the default profile, e.g. MODEL_ROUTES="additional_questions=gpt-4o"
+for stage, override in parse_model_routes(os.getenv("MODEL_ROUTES")).items():
+    ROUTING_PROFILES["default"].setdefault(stage, {"model": None, "max_tokens": None}).update(override)
+
+@contextmanager
+def routing_context(profile=None, latency_budget_seconds=None):
+    """
+    Route the LLM calls made inside the block with the given profile and latency budget.
+
+    Args:
+        profile (str): Routing profile name, or None for MODEL_PROFILE
+        latency_budget_seconds (float): Seconds the block may take before stages are
+            downgraded to faster models; None for PIPELINE_LATENCY_BUDGET_SECONDS, 0 for none
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    profile = profile or MODEL_PROFILE
+    if profile not in ROUTING_PROFILES:
+        raise ValueError(f"Unknown model profile '{profile}'. Available: {', '.join(ROUTING_PROFILES)}")
+
+    budget = PIPELINE_LATENCY_BUDGET_SECONDS if latency_budget_seconds is None else latency_budget_seconds
+    token = current_routing.set({
+        "profile": profile,
+        "deadline": time.monotonic() + budget if budget else None
+    })
+    try:
+        yield
+    finally:
+        current_routing.reset(token)
+
+def expected_latency(model):
+    """Return the observed p95 latency of a model, or its assumed latency."""
+    return latency_tracker.p95(model) or EXPECTED_LATENCY_SECONDS.get(model, 10.0)
+
+def route_for(stage):
+    """
+    Pick the model and max_tokens for an LLM stage.
+
+    A stage whose model is not expected to answer before the request's latency budget
+    runs out is downgraded to a faster model (see DOWNGRADE_MODELS).
+
+    Args:
+        stage (str): Stage name, a key of the routing profiles
+
+    Returns:
+        dict: {"model", "max_tokens", "stage"}
+    """
+    routing = current_routing.get() or {"profile": MODEL_PROFILE, "deadline": None}
+    route = dict(ROUTING_PROFILES[routing["profile"]][stage], stage=stage)
+
+    deadline = routing["deadline"]
+    while deadline is not None and route["model"] in DOWNGRADE_MODELS:
+        remaining = deadline - time.monotonic()
+        if remaining >= expected_latency(route["model"]):
+            break
+        downgraded = DOWNGRADE_MODELS[route["model"]]
+        logging.info(f"Latency budget: routing {stage} to {downgraded} instead of {route['model']} ({remaining:.1f}s left)")
+        route["model"] = downgraded
+
+    return route
@@ -0,0 +1,132 @@
+import atexit
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+from PyPDF2 import PdfReader
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Number of worker processes for page-parallel extraction (0 or 1 = always extract in-process)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Documents with fewer pages than this are extracted in-process; spreading them isn't worth the IPC
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+# Only the first PDF_MAX_PAGES pages are extracted (0 = no limit)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "100"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_process_pool():
+    """Return the shared extraction process pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Forking a multi-threaded Flask worker can copy held locks into the child,
+            # so workers are spawned fresh; the pool is long-lived, so this is paid once
+            context = multiprocessing.get_context(os.getenv("PDF_WORKER_START_METHOD", "spawn"))
+            _pool = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS, mp_context=context)
+        return _pool
+
+def shutdown_process_pool():
+    """Stop the extraction process pool (it is started again on next use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+atexit.register(shutdown_process_pool)
+
+def open_pdf(source):
+    """Open a PDF from raw bytes or a file path."""
+    return PdfReader(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+
+def extract_page_range(source, start, end):
+    """
+    Extract the text of pages [start, end) of a PDF.
+
+    Runs inside worker processes, so it has to stay a picklable module-level function.
+
+    Args:
+        source: Raw bytes of the PDF or its file path
+        start (int): Index of the first page
+        end (int): Index one past the last page
+
+    Returns:
+        list: Text of each page, in order
+    """
+    reader = open_pdf(source)
+    return [(reader.pages[i].extract_text() or "") for i in range(start, end)]
+
+def split_page_ranges(page_count, parts):
+    """Split page_count pages into at most `parts` contiguous, evenly sized ranges."""
+    parts = max(1, min(parts, page_count))
+    size, remainder = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < remainder else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def extract_pdf_text(source, max_pages=None, parallel=True):
+    """
+    Extract text from a PDF, spreading page ranges across worker processes for long documents.
+
+    Args:
+        source: Raw bytes of the PDF, its file path (workers then read the file themselves)
+            or a binary file object
+        max_pages (int): Maximum number of pages to extract (defaults to PDF_MAX_PAGES, 0 = all)
+        parallel (bool): Allow the page-parallel mode (PDF_EXTRACT_WORKERS sets the worker count)
+
+    Returns:
+        tuple: (extracted text, number of pages in the document)
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+
+    if hasattr(source, 'read'):
+        # File objects can't be shared with worker processes
+        source.seek(0)
+        source = source.read()
+
+    reader = open_pdf(source)
+    page_count = len(reader.pages)
+    pages_to_extract = min(page_count, max_pages) if max_pages else page_count
+
+    if pages_to_extract < page_count:
+        logging.warning(f"PDF has {page_count} pages, extracting only the first {pages_to_extract}")
+
+    page_texts = None
+    if parallel and PDF_EXTRACT_WORKERS > 1 and pages_to_extract >= PDF_PARALLEL_MIN_PAGES:
+        try:
+            page_texts = run_page_ranges(get_process_pool(), source, pages_to_extract, PDF_EXTRACT_WORKERS)
+            logging.info(f"Extracted {pages_to_extract} PDF pages across {PDF_EXTRACT_WORKERS} worker processes")
+        except BrokenProcessPool as e:
+            logging.error(f"PDF worker pool failed, extracting in-process: {str(e)}")
+            shutdown_process_pool()
+
+    if page_texts is None:
+        page_texts = [(reader.pages[i].extract_text() or "") for i in range(pages_to_extract)]
+
+    return "\n".join(page_texts).strip(), page_count
+
+def run_page_ranges(pool, source, page_count, parts):
+    """Submit one task per page range and join the page texts back in order."""
+    futures = [
+        pool.submit(extract_page_range, source, start, end)
+        for start, end in split_page_ranges(page_count, parts)
+    ]
+    page_texts = []
+    for future in futures:
+        page_texts.extend(future.result())
+    return page_texts
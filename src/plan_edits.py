@@ -0,0 +1,210 @@
+import copy
+import logging
+import threading
+from artifact_store import get_artifact, put_artifact
+from code_challenge_generator import (
+    challenge_candidate_level,
+    challenge_tech_stack,
+    generate_code_challenge,
+    generate_debugging_challenge,
+    generate_system_design_challenge
+)
+from excel_generator import create_interview_excel, rerender_sheets
+from interview_plan_generator import generate_additional_questions_for_topic, generate_evaluation_rubric, normalize_topics
+from metrics import timed_stage
+from model_routing import routing_context
+from plan_store import get_plan, update_plan
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Challenge kinds that can be regenerated, and where each is kept in the challenge suite
+CHALLENGE_KINDS = {"coding": "coding_challenges", "system_design": "system_design", "debugging": "debugging_challenge"}
+
+# Workbook sheets each edit changes; the other sheets are kept as they are. Evaluation
+# formulas point at the Questions score cells, so new questions re-render both
+TOPIC_SHEETS = ["Questions", "Evaluation"]
+RUBRIC_SHEETS = ["Evaluation"]
+CHALLENGE_SHEETS = {"coding": ["Code Challenges"], "system_design": [], "debugging": []}
+
+# Serializes the read-modify-write of stored plans, so concurrent edits of one plan
+# don't overwrite each other; the LLM calls happen outside of it
+plan_lock = threading.Lock()
+
+def regeneration_variant(plan):
+    """Cache discriminator of an edit, so regenerating doesn't return the cached content."""
+    return f"revision-{plan.get('revision', 0) + 1}"
+
+def plan_workbook(plan):
+    """
+    Look up the workbook artifact of a stored plan.
+
+    The workbook is rebuilt from the plan (no LLM calls) under the same artifact ID
+    if it has expired, so the plan's download link keeps working.
+
+    Args:
+        plan (dict): Stored plan
+
+    Returns:
+        dict: Artifact metadata, or None if the workbook couldn't be rebuilt
+    """
+    excel_file = plan["excel_file"]
+    artifact = get_artifact(excel_file["artifact_id"])
+    if artifact is not None:
+        return {key: value for key, value in artifact.items() if key != "content"}
+
+    logging.info(f"Workbook of plan {plan['plan_id']} expired, rebuilding it")
+    content = create_interview_excel(plan["interview_plan"], plan["code_challenges"], in_memory=True)
+    if not content:
+        return None
+    return put_artifact(content, excel_file["name"], artifact_id=excel_file["artifact_id"])
+
+def rerender_workbook(plan, sheets):
+    """Re-render the given sheets of a plan's workbook, keeping its artifact ID."""
+    excel_file = plan["excel_file"]
+    artifact = get_artifact(excel_file["artifact_id"])
+    if artifact is None:
+        # Nothing to patch; the whole workbook is rebuilt from the plan
+        return plan_workbook(plan)
+
+    content = rerender_sheets(artifact["content"], plan["interview_plan"], plan["code_challenges"], sheets)
+    if not content:
+        return None
+    return put_artifact(content, excel_file["name"], artifact_id=excel_file["artifact_id"])
+
+def apply_edit(plan_id, edit, sheets):
+    """
+    Apply an edit to the latest revision of a stored plan and re-render the sheets it changes.
+
+    Args:
+        plan_id (str): ID of the plan
+        edit (callable): Called as edit(interview_plan, code_challenges) to change the plan in place
+        sheets (list): Workbook sheets the edit changes
+
+    Returns:
+        dict: The updated plan, or {"error": ...} if it couldn't be stored
+    """
+    with plan_lock:
+        plan = get_plan(plan_id)
+        if plan is None:
+            return {"error": "Plan not found or expired"}
+
+        # The memory tier hands out the stored object itself
+        plan = copy.deepcopy(plan)
+        edit(plan["interview_plan"], plan["code_challenges"])
+        # Stored as JSON, the alias is a copy of its own
+        plan["interview_plan"]["topics_to_cover"] = plan["interview_plan"].get("prioritized_topics", [])
+
+        if sheets and rerender_workbook(plan, sheets) is None:
+            return {"error": "Failed to update the Excel file"}
+
+        return update_plan(plan)
+
+@timed_stage("regenerate_topic")
+def regenerate_topic_questions(plan, topic_index, num_questions=None):
+    """
+    Replace the questions of one prioritized topic with newly generated ones (one LLM call).
+
+    Args:
+        plan (dict): Stored plan
+        topic_index (int): Index of the topic in the plan's prioritized_topics
+        num_questions (int): Number of questions (3-5); defaults to the topic's current number
+
+    Returns:
+        dict: The updated plan, or {"error": ...} if generation failed
+    """
+    topic = plan["interview_plan"]["prioritized_topics"][topic_index]
+    topic_name = topic.get('topic_name') or topic.get('topic') or ''
+    num_questions = min(max(num_questions or len(topic.get('questions', [])), 3), 5)
+    logging.info(f"Regenerating the questions of topic '{topic_name}' in plan {plan['plan_id']}")
+
+    with routing_context(plan.get("model_profile")):
+        questions = generate_additional_questions_for_topic(
+            topic_name,
+            num_questions,
+            plan["resume_analysis"],
+            plan["job_details"],
+            variant=regeneration_variant(plan),
+            fallback=False
+        )
+    if not questions:
+        return {"error": f"Failed to generate questions for topic '{topic_name}'"}
+
+    def edit(interview_plan, code_challenges):
+        topic = interview_plan["prioritized_topics"][topic_index]
+        topic["questions"] = questions
+        normalize_topics([topic])
+
+    return apply_edit(plan["plan_id"], edit, TOPIC_SHEETS)
+
+@timed_stage("regenerate_challenge")
+def regenerate_challenge(plan, kind, index=0):
+    """
+    Replace one code challenge with a newly generated one (one LLM call).
+
+    A coding challenge keeps the difficulty, duration and technology stack of the one it replaces.
+
+    Args:
+        plan (dict): Stored plan
+        kind (str): One of CHALLENGE_KINDS
+        index (int): Index of the coding challenge (coding challenges only)
+
+    Returns:
+        dict: The updated plan, or {"error": ...} if generation failed
+    """
+    job_details = plan["job_details"]
+    resume_analysis = plan["resume_analysis"]
+    meeting_insights = {'insights': plan["meeting_insights"]}
+    variant = regeneration_variant(plan)
+    logging.info(f"Regenerating {kind} challenge in plan {plan['plan_id']}")
+
+    with routing_context(plan.get("model_profile")):
+        if kind == "coding":
+            metadata = plan["code_challenges"]["coding_challenges"][index].get("metadata", {})
+            challenge = generate_code_challenge(
+                job_details,
+                metadata.get("candidate_level") or challenge_candidate_level(resume_analysis),
+                metadata.get("technology_stack") or challenge_tech_stack(job_details, meeting_insights),
+                metadata.get("difficulty", "medium"),
+                metadata.get("duration_minutes", 30),
+                variant=variant
+            )
+        elif kind == "system_design":
+            challenge = generate_system_design_challenge(job_details, challenge_candidate_level(resume_analysis), variant=variant)
+        else:
+            challenge = generate_debugging_challenge(challenge_tech_stack(job_details, meeting_insights), variant=variant)
+
+    if "error" in challenge:
+        return challenge
+
+    def edit(interview_plan, code_challenges):
+        if kind == "coding":
+            code_challenges["coding_challenges"][index] = challenge
+        else:
+            code_challenges[CHALLENGE_KINDS[kind]] = challenge
+
+    return apply_edit(plan["plan_id"], edit, CHALLENGE_SHEETS[kind])
+
+@timed_stage("regenerate_rubric")
+def regenerate_rubric(plan):
+    """
+    Replace the evaluation rubric with a newly generated one (one LLM call).
+
+    Args:
+        plan (dict): Stored plan
+
+    Returns:
+        dict: The updated plan, or {"error": ...} if generation failed
+    """
+    logging.info(f"Regenerating the evaluation rubric of plan {plan['plan_id']}")
+
+    with routing_context(plan.get("model_profile")):
+        rubric = generate_evaluation_rubric(plan["interview_plan"].get("prioritized_topics", []),
+                                            variant=regeneration_variant(plan))
+    if not rubric:
+        return {"error": "Failed to generate the evaluation rubric"}
+
+    def edit(interview_plan, code_challenges):
+        interview_plan["evaluation_rubric"] = rubric
+
+    return apply_edit(plan["plan_id"], edit, RUBRIC_SHEETS)
@@ -0,0 +1,88 @@
+import logging
+import os
+import time
+import uuid
+from cache_backends import CACHE_DIR, create_backend
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Generated plans, with the inputs they were generated from, so that one topic, challenge
+# or the rubric can be regenerated later without rerunning the pipeline
+plan_store = create_backend(
+    os.getenv("PLAN_STORE_BACKEND", "tiered"),
+    path=os.getenv("PLAN_STORE_PATH", os.path.join(CACHE_DIR, "plans.sqlite3")),
+    max_entries=int(os.getenv("PLAN_STORE_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.getenv("PLAN_TTL_SECONDS", "604800")) or None,
+    memory_entries=int(os.getenv("PLAN_STORE_MEMORY_ENTRIES", "64"))
+)
+
+def save_plan(job_details, resume_analysis, meeting_insights, interview_plan, code_challenges, excel_file,
+              model_profile=None):
+    """
+    Store a generated plan.
+
+    Args:
+        job_details (dict): Job title and description the plan was generated for
+        resume_analysis (dict): Candidate's resume analysis
+        meeting_insights (dict): Meeting insights
+        interview_plan (dict): Complete interview plan
+        code_challenges (dict): Code challenges suite
+        excel_file (dict): Workbook artifact metadata (artifact_id and name)
+        model_profile (str): Routing profile of the request, reused when regenerating
+
+    Returns:
+        dict: The stored plan, including its plan_id, or None if plan storage is disabled
+            (PLAN_STORE_BACKEND=none)
+    """
+    if plan_store is None:
+        return None
+
+    now = time.time()
+    plan = {
+        "plan_id": uuid.uuid4().hex,
+        "job_details": job_details,
+        "resume_analysis": resume_analysis,
+        "meeting_insights": meeting_insights,
+        "interview_plan": interview_plan,
+        "code_challenges": code_challenges,
+        "excel_file": {"artifact_id": excel_file["artifact_id"], "name": excel_file["name"]},
+        "model_profile": model_profile,
+        "revision": 0,
+        "created_at": now,
+        "updated_at": now
+    }
+    plan_store.set(plan["plan_id"], plan)
+    logging.info(f"Stored plan {plan['plan_id']}")
+
+    return plan
+
+def get_plan(plan_id):
+    """
+    Look up a stored plan.
+
+    Args:
+        plan_id (str): ID returned by save_plan()
+
+    Returns:
+        dict: The plan, or None if unknown or expired
+    """
+    if plan_store is None:
+        return None
+    return plan_store.get(plan_id)
+
+def update_plan(plan):
+    """
+    Store a changed plan under its plan_id, as its next revision.
+
+    Args:
+        plan (dict): Plan returned by get_plan(), with the changes
+
+    Returns:
+        dict: The stored plan
+    """
+    plan = {**plan, "revision": plan.get("revision", 0) + 1, "updated_at": time.time()}
+    plan_store.set(plan["plan_id"], plan)
+    logging.info(f"Updated plan {plan['plan_id']} to revision {plan['revision']}")
+
+    return plan
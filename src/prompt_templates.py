@@ -0,0 +1,53 @@
+import hashlib
+import textwrap
+from token_budget import PROMPT_CONTEXT_TOKEN_BUDGET, compact_json, fit_to_budget
+
+class PromptTemplate:
+    """
+    Chat prompt split into a static part, compiled once when the template is defined,
+    and a per-call context.
+
+    Messages are ordered static first: the system message, then a user message that opens
+    with the static instructions and ends with the per-call context. Requests that share a
+    template therefore share their whole prompt prefix, which providers that cache prompt
+    prefixes (OpenAI does for prompts of 1024 tokens or more) can reuse.
+
+    Args:
+        system (str): System message
+        instructions (str): Static part of the user message
+        context (str): str.format() template of the per-call part of the user message;
+            dict and list values are filled in as compact JSON
+        name (str): Prompt name, for token budget logs and metrics
+        priorities (dict): Priority of each context field when the context is over its
+            token budget; higher-priority fields are cut last
+        budget (int): Tokens the context values may use (see token_budget)
+    """
+
+    def __init__(self, system, instructions, context, name="prompt", priorities=None, budget=PROMPT_CONTEXT_TOKEN_BUDGET):
+        self.system = system
+        self.instructions = textwrap.dedent(instructions).strip()
+        self.context = textwrap.dedent(context).strip()
+        self.name = name
+        self.priorities = priorities or {}
+        self.budget = budget
+        # Changes whenever the prompt's wording does; part of keys of stored LLM results
+        self.fingerprint = hashlib.sha256(
+            "\n\n".join([self.system, self.instructions, self.context]).encode("utf-8")).hexdigest()
+
+    def messages(self, **values):
+        """
+        Build the chat messages for one call.
+
+        Args:
+            **values: Values of the context template's fields
+
+        Returns:
+            list: System and user messages
+        """
+        values = fit_to_budget(values, self.budget, self.priorities, prompt_name=self.name)
+        rendered = {key: compact_json(value) if isinstance(value, (dict, list)) else value
+                    for key, value in values.items()}
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": f"{self.instructions}\n\n{self.context.format(**rendered)}"}
+        ]
@@ -1,8 +1,12 @@
-import openai
 import json
 import os
 from dotenv import load_dotenv
 import logging
+from llm_cache import cached_chat_completion
+from llm_client import client
+from model_routing import route_for
+from prompt_templates import PromptTemplate, compact_json
+from skill_extractor import extract_profile
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,57 +14,73 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Load environment variables from .env file (project root)
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
-# Initialize the OpenAI client with the key from .env
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Worked examples shown to the model before the resume to analyze
+RESUME_FEW_SHOT_EXAMPLES = [
+    {
+        "resume": "John Doe\nSoftware Engineer\n\nExperience:\n2018-2021: Senior Developer at Tech Co\n2015-2018: Junior Developer at Start-Up Inc\n2013-2015: Intern at Big Corp\n\nEducation:\n2009-2013: BS in Computer Science, University of Technology",
+        "analysis": {
+            "key_info": {
+                "name": "John Doe",
+                "current_role": "Software Engineer",
+                "years_of_experience": 8,
+                "education": "BS in Computer Science"
+            },
+            "employment_gaps": ["No significant gaps identified"],
+            "career_progression": "Clear progression from intern to senior developer",
+            "anomalies": ["None detected"]
+        }
+    },
+    {
+        "resume": "Jane Smith\nMarketing Specialist\n\nExperience:\n2020-Present: Marketing Manager at Global Brand\n2017-2019: Marketing Coordinator at Local Business\n2015-2016: Sales Associate at Retail Store\n\nEducation:\n2011-2015: BA in Marketing, State University\n2019-2020: Digital Marketing Certificate, Online Academy",
+        "analysis": {
+            "key_info": {
+                "name": "Jane Smith",
+                "current_role": "Marketing Manager",
+                "years_of_experience": 6,
+                "education": "BA in Marketing, Digital Marketing Certificate"
+            },
+            "employment_gaps": ["1 year gap between 2016 and 2017"],
+            "career_progression": "Progressed from sales to marketing, with additional education to support career change",
+            "anomalies": ["Career change from sales to marketing"]
+        }
+    }
+]
+
+# The instructions and few-shot examples are the same for every resume, so they are
+# compiled once and sent as the prompt prefix
+RESUME_ANALYSIS_PROMPT = PromptTemplate(
+    system="You are an expert resume analyzer. Your task is to extract key information, identify gaps, and spot anomalies in resumes. Always return your analysis as a valid JSON object.",
+    instructions=f"""
+        Analyze the resume at the end of this message and provide a structured analysis similar to the examples below.
+
+        Few-shot examples:
+        {compact_json(RESUME_FEW_SHOT_EXAMPLES)}
+
+        Provide your analysis in the same JSON format as the examples. Return the result as a valid JSON object.
+    """,
+    context="""
+        Resume to analyze:
+        {resume_text}
+    """,
+    name="resume_analysis"
+)
 
 def analyze_resume(resume_text):
     logging.info("Starting resume analysis")
-    few_shot_examples = [
-        {
-            "resume": "John Doe\nSoftware Engineer\n\nExperience:\n2018-2021: Senior Developer at Tech Co\n2015-2018: Junior Developer at Start-Up Inc\n2013-2015: Intern at Big Corp\n\nEducation:\n2009-2013: BS in Computer Science, University of Technology",
-            "analysis": {
-                "key_info": {
-                    "name": "John Doe",
-                    "current_role": "Software Engineer",
-                    "years_of_experience": 8,
-                    "education": "BS in Computer Science"
-                },
-                "employment_gaps": ["No significant gaps identified"],
-                "career_progression": "Clear progression from intern to senior developer",
-                "anomalies": ["None detected"]
-            }
-        },
-        {
-            "resume": "Jane Smith\nMarketing Specialist\n\nExperience:\n2020-Present: Marketing Manager at Global Brand\n2017-2019: Marketing Coordinator at Local Business\n2015-2016: Sales Associate at Retail Store\n\nEducation:\n2011-2015: BA in Marketing, State University\n2019-2020: Digital Marketing Certificate, Online Academy",
-            "analysis": {
-                "key_info": {
-                    "name": "Jane Smith",
-                    "current_role": "Marketing Manager",
-                    "years_of_experience": 6,
-                    "education": "BA in Marketing, Digital Marketing Certificate"
-                },
-                "employment_gaps": ["1 year gap between 2016 and 2017"],
-                "career_progression": "Progressed from sales to marketing, with additional education to support career change",
-                "anomalies": ["Career change from sales to marketing"]
-            }
-        }
-    ]
-
-    messages = [
-        {"role": "system", "content": "You are an expert resume analyzer. Your task is to extract key information, identify gaps, and spot anomalies in resumes. Always return your analysis as a valid JSON object."},
-        {"role": "user", "content": f"Analyze the following resume and provide a structured analysis similar to the examples below.\n\nFew-shot examples:\n{json.dumps(few_shot_examples, indent=2)}\n\nResume to analyze:\n{resume_text}\n\nProvide your analysis in the same JSON format as the examples. Return the result as a valid JSON object."}
-    ]
+    messages = RESUME_ANALYSIS_PROMPT.messages(resume_text=resume_text)
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        route = route_for("resume_analysis")
+        response_content = cached_chat_completion(
+            client,
+            model=route["model"],
             messages=messages,
             temperature=0.2,
-            max_tokens=1000,
+            max_tokens=route["max_tokens"],
+            stage=route["stage"],
             response_format={"type": "json_object"}
         )
 
-        response_content = response.choices[0].message.content
         logging.info(f"Raw response from GPT (first 500 chars): {response_content[:500]}")
 
         analysis = json.loads(response_content)
@@ -68,7 +88,7 @@ def analyze_resume(resume_text):
         return analysis
     except json.JSONDecodeError as e:
         logging.error(f"Failed to parse the analysis: {str(e)}")
-        logging.error(f"Response content was: {response.choices[0].message.content if 'response' in locals() else 'No response'}")
+        logging.error(f"Response content was: {response_content if 'response_content' in locals() else 'No response'}")
         return {"error": f"Failed to parse the analysis: {str(e)}"}
     except Exception as e:
         logging.error(f"Unexpected error: {str(e)}")
@@ -227,9 +247,14 @@ def process_resume(resume_text, job_details=None):
         if isinstance(structured_data_schema, dict) and "error" in structured_data_schema:
             return {"error": structured_data_schema["error"]}
 
+        # Skills, titles and years found locally in the CV text; the LLM analysis doesn't list skills
+        candidate_profile = extract_profile(resume_text)
+
         # Combine results into a final output
         result = {
             "analysis": analysis,
+            "skills": analysis.get("skills") or candidate_profile["skills"],
+            "candidate_profile": candidate_profile,
             "system_prompt": system_prompt,
             "structured_data_schema": structured_data_schema
         }
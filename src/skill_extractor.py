@@ -0,0 +1,361 @@
+import logging
+import re
+from collections import Counter, deque
+from datetime import date
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Canonical skill name -> (category, aliases). Aliases are matched case-insensitively
+# as whole words; the canonical name itself is always an alias
+SKILLS_TAXONOMY = {
+    # Languages
+    "C#": ("language", ["c sharp", "csharp"]),
+    "Java": ("language", []),
+    "Python": ("language", []),
+    "JavaScript": ("language", ["js", "ecmascript"]),
+    "TypeScript": ("language", []),
+    "Golang": ("language", []),
+    "Rust": ("language", ["rustlang"]),
+    "C++": ("language", ["cpp"]),
+    "Kotlin": ("language", []),
+    "Swift": ("language", ["swiftui"]),
+    "PHP": ("language", []),
+    "Ruby": ("language", []),
+    "Scala": ("language", []),
+    "SQL": ("language", ["t-sql", "tsql", "pl/sql"]),
+    "Bash": ("language", ["shell scripting"]),
+    # Frameworks and runtimes
+    ".NET": ("framework", ["dotnet", ".net core", ".net framework", ".net 6", ".net 7", ".net 8"]),
+    "ASP.NET Core": ("framework", ["asp.net", "asp.net mvc", "asp.net web api"]),
+    "Entity Framework": ("framework", ["ef core", "entity framework core"]),
+    "Blazor": ("framework", []),
+    "Spring Boot": ("framework", ["spring framework", "spring mvc"]),
+    "Django": ("framework", []),
+    "Flask": ("framework", []),
+    "FastAPI": ("framework", []),
+    "Node.js": ("framework", ["nodejs"]),
+    "Express.js": ("framework", ["expressjs"]),
+    "React": ("framework", ["react.js", "reactjs"]),
+    "Angular": ("framework", ["angularjs"]),
+    "Vue": ("framework", ["vue.js", "vuejs"]),
+    "Next.js": ("framework", ["nextjs"]),
+    "Unity": ("framework", ["unity3d"]),
+    # Databases and messaging
+    "SQL Server": ("database", ["ms sql", "mssql", "microsoft sql server"]),
+    "PostgreSQL": ("database", ["postgres"]),
+    "MySQL": ("database", []),
+    "Oracle": ("database", ["oracle database", "oracle db"]),
+    "MongoDB": ("database", ["mongo"]),
+    "Redis": ("database", []),
+    "Elasticsearch": ("database", ["elastic search"]),
+    "Cosmos DB": ("database", ["cosmosdb"]),
+    "DynamoDB": ("database", []),
+    "Kafka": ("database", ["apache kafka"]),
+    "RabbitMQ": ("database", []),
+    # Cloud and DevOps
+    "Azure": ("cloud", ["microsoft azure", "azure devops", "azure functions", "azure service bus"]),
+    "AWS": ("cloud", ["amazon web services", "aws lambda"]),
+    "GCP": ("cloud", ["google cloud", "google cloud platform"]),
+    "Docker": ("devops", []),
+    "Kubernetes": ("devops", ["k8s", "aks", "eks", "gke"]),
+    "Terraform": ("devops", []),
+    "CI/CD": ("devops", ["ci / cd", "continuous integration", "continuous delivery", "continuous deployment"]),
+    "Jenkins": ("devops", []),
+    "GitHub Actions": ("devops", []),
+    "Git": ("devops", ["github", "gitlab", "bitbucket"]),
+    # Architecture
+    "Microservices": ("architecture", ["microservice", "micro-services"]),
+    "REST APIs": ("architecture", ["restful", "rest api", "rest apis", "web api", "web apis"]),
+    "GraphQL": ("architecture", []),
+    "gRPC": ("architecture", []),
+    "Event-driven architecture": ("architecture", ["event driven", "event-driven", "event sourcing", "cqrs"]),
+    "Domain-driven design": ("architecture", ["ddd", "domain driven design"]),
+    # Testing and QA
+    "Manual testing": ("testing", ["manual qa", "manual test", "exploratory testing"]),
+    "Regression testing": ("testing", ["regression suites", "regression suite"]),
+    "API testing": ("testing", []),
+    "Test automation": ("testing", ["automated testing", "automation testing"]),
+    "Unit testing": ("testing", ["unit tests", "xunit", "nunit", "mstest", "junit", "pytest"]),
+    "Selenium": ("testing", ["selenium webdriver"]),
+    "Cypress": ("testing", []),
+    "Playwright": ("testing", []),
+    "Appium": ("testing", []),
+    "Postman": ("testing", []),
+    "JMeter": ("testing", []),
+    "TestRail": ("testing", []),
+    "Jira": ("tool", []),
+    "Confluence": ("tool", []),
+    # Platforms
+    "iOS": ("platform", []),
+    "Android": ("platform", []),
+    "VR/AR": ("platform", ["virtual reality", "augmented reality", "meta quest", "oculus"]),
+    # Practices
+    "Agile": ("practice", ["scrum", "kanban"]),
+}
+
+# Aliases that are also ordinary words or surnames ("should react calmly", "Mr Jenkins",
+# "Rust belt"). They only count as skills when listed next to another skill ("Python,
+# Java, Docker"), or when capitalised with technical context nearby: an unambiguous
+# skill or a TECH_CONTEXT_WORDS term
+AMBIGUOUS_ALIASES = {
+    "java", "rust", "swift", "kotlin", "ruby", "scala", "bash", "c sharp",
+    "django", "flask", "react", "angular", "unity",
+    "oracle", "kafka",
+    "azure", "docker", "terraform", "jenkins", "git",
+    "cypress", "playwright", "postman", "selenium", "confluence",
+    "android", "oculus",
+    "agile", "scrum", "kanban",
+}
+
+# Terms that mark the text around an ambiguous alias as technical
+TECH_CONTEXT_WORDS = ["programming", "language", "languages", "framework", "frameworks", "library", "database",
+                      "databases", "sdk", "api", "apis", "game engine", "codebase", "tech stack", "backend", "back-end"]
+
+# Characters on either side of an ambiguous alias searched for technical context
+CONTEXT_WINDOW_CHARS = 80
+
+# Role titles recognised in CVs and job descriptions
+ROLE_TITLES = [
+    "software engineer", "software developer", "developer", "programmer", "solution architect",
+    "software architect", "architect", "tech lead", "technical lead", "team lead", "engineering manager",
+    "qa engineer", "qa analyst", "test engineer", "tester", "quality assurance engineer", "sdet",
+    "devops engineer", "site reliability engineer", "data engineer", "data scientist",
+    "full stack developer", "full-stack developer", "backend developer", "back-end developer",
+    "frontend developer", "front-end developer", "mobile developer", "project manager", "product manager",
+]
+
+# Seniority words and the level they indicate ("lead" on its own is too often a verb)
+SENIORITY_LEVELS = [("principal", "lead"), ("staff engineer", "lead"), ("tech lead", "lead"), ("technical lead", "lead"),
+                    ("team lead", "lead"), ("lead developer", "lead"), ("lead engineer", "lead"), ("senior", "senior"),
+                    ("sr.", "senior"), ("middle", "mid"), ("mid-level", "mid"), ("junior", "junior"),
+                    ("jr.", "junior"), ("intern", "junior")]
+
+# Categories that make up the tech stack of a coding challenge, in order of preference
+TECH_STACK_CATEGORIES = ("language", "framework", "database", "testing", "cloud")
+
+YEARS_PATTERN = re.compile(r"(\d{1,2})\s*\+?\s*(?:years|yrs)\b", re.IGNORECASE)
+YEAR_RANGE_PATTERN = re.compile(r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today)\b", re.IGNORECASE)
+
+# What may separate two entries of a skills list
+LIST_SEPARATOR_PATTERN = re.compile(r"[\s,;:/|&()*•+-]*(?:\b(?:and|or)\b[\s,;:/|&()*•+-]*)?", re.IGNORECASE)
+
+def is_word_char(char):
+    return char.isalnum() or char == "_"
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton that finds every occurrence of a set of keywords in one pass
+    over the text, however many keywords there are.
+
+    Matching is case-insensitive and only whole words count: a match must not be preceded
+    or followed by a letter, digit or underscore (so ".NET" matches in "C#/.NET" but "Java"
+    doesn't match in "JavaScript").
+
+    Args:
+        keywords (dict): Mapping of keyword to the value reported when it matches
+    """
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for keyword, value in keywords.items():
+            keyword = keyword.lower()
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((len(keyword), value))
+
+        # Breadth-first, so each state's failure link is final before its children need it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text):
+        """
+        Find the keywords in text.
+
+        Overlapping matches are resolved leftmost-longest, so "SQL Server" is reported
+        once rather than as both "SQL Server" and "SQL".
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            list: (start, end, value) tuples in order of appearance
+        """
+        lowered = text.lower()
+        matches = []
+        state = 0
+        for index, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._output[state]:
+                start, end = index - length + 1, index + 1
+                if (start == 0 or not is_word_char(lowered[start - 1])) and (end == len(lowered) or not is_word_char(lowered[end])):
+                    matches.append((start, end, value))
+
+        matches.sort(key=lambda match: (match[0], -(match[1] - match[0])))
+        selected = []
+        covered_until = 0
+        for start, end, value in matches:
+            if start >= covered_until:
+                selected.append((start, end, value))
+                covered_until = end
+        return selected
+
+def build_skill_matcher(taxonomy):
+    """Matcher reporting (skill, ambiguous) for every alias of every skill."""
+    keywords = {}
+    for skill, (_, aliases) in taxonomy.items():
+        for alias in [skill] + aliases:
+            keywords[alias] = (skill, alias.lower() in AMBIGUOUS_ALIASES)
+    return KeywordMatcher(keywords)
+
+# Compiled once; matching a CV takes well under a millisecond per page
+skill_matcher = build_skill_matcher(SKILLS_TAXONOMY)
+role_matcher = KeywordMatcher({title: title for title in ROLE_TITLES})
+seniority_matcher = KeywordMatcher(dict(SENIORITY_LEVELS))
+context_matcher = KeywordMatcher({word: word for word in TECH_CONTEXT_WORDS})
+
+def is_list_neighbour(text, first, second):
+    """Whether two matches are only separated by list punctuation or "and"/"or"."""
+    return LIST_SEPARATOR_PATTERN.fullmatch(text[first[1]:second[0]]) is not None
+
+def find_skills(text):
+    """
+    Find the skills mentioned in text, in order of appearance.
+
+    Ambiguous aliases (AMBIGUOUS_ALIASES) are dropped unless they are capitalised with an
+    unambiguous skill or a technical term within CONTEXT_WINDOW_CHARS ("Rust programming"),
+    or listed next to a skill that counts ("Python, java and docker"). So "Rust belt",
+    "should react calmly" and "a docker yard" don't count.
+
+    Returns:
+        list: Canonical skill names, one per mention
+    """
+    matches = skill_matcher.find_all(text)
+    accepted = [not ambiguous for _, _, (_, ambiguous) in matches]
+    if all(accepted):
+        return [skill for _, _, (skill, _) in matches]
+
+    anchors = [(start, end) for start, end, (_, ambiguous) in matches if not ambiguous]
+    anchors += [(start, end) for start, end, _ in context_matcher.find_all(text)]
+
+    def has_context(start, end):
+        return any(anchor_start < end + CONTEXT_WINDOW_CHARS and anchor_end > start - CONTEXT_WINDOW_CHARS
+                   for anchor_start, anchor_end in anchors)
+
+    for index, (start, end, _) in enumerate(matches):
+        if not accepted[index] and not text[start:end].islower() and has_context(start, end):
+            accepted[index] = True
+
+    # Lists spread acceptance along themselves, in either direction
+    changed = True
+    while changed:
+        changed = False
+        for index in range(len(matches)):
+            if accepted[index]:
+                continue
+            if (index > 0 and accepted[index - 1] and is_list_neighbour(text, matches[index - 1], matches[index])) or \
+                    (index + 1 < len(matches) and accepted[index + 1] and is_list_neighbour(text, matches[index], matches[index + 1])):
+                accepted[index] = changed = True
+
+    return [skill for (_, _, (skill, _)), keep in zip(matches, accepted) if keep]
+
+def extract_years_of_experience(text, today=None):
+    """
+    Estimate years of experience from explicit mentions ("8+ years") or, failing that,
+    from the span of the employment date ranges ("2015 - Present").
+
+    Returns:
+        int: Years of experience, or None if the text gives no clue
+    """
+    mentioned = [int(years) for years in YEARS_PATTERN.findall(text) if 0 < int(years) <= 50]
+    if mentioned:
+        return max(mentioned)
+
+    current_year = (today or date.today()).year
+    ranges = []
+    for start, end in YEAR_RANGE_PATTERN.findall(text):
+        end_year = current_year if not end[0].isdigit() else int(end)
+        if int(start) <= end_year <= current_year:
+            ranges.append((int(start), end_year))
+    if not ranges:
+        return None
+    return max(end for _, end in ranges) - min(start for start, _ in ranges)
+
+def extract_profile(text):
+    """
+    Pull skills, role titles, seniority and years of experience out of CV or job text,
+    locally and deterministically.
+
+    Args:
+        text (str): CV or job description text
+
+    Returns:
+        dict: {
+            "skills": canonical skill names, most mentioned first,
+            "skills_by_category": {category: [skills]},
+            "role_titles": role titles in order of appearance,
+            "seniority": "junior", "mid", "senior", "lead" or None,
+            "years_of_experience": int or None
+        }
+    """
+    text = text or ""
+    matched = find_skills(text)
+    skill_counts = Counter(matched)
+    first_seen = {}
+    for skill in matched:
+        first_seen.setdefault(skill, len(first_seen))
+    skills = sorted(skill_counts, key=lambda skill: (-skill_counts[skill], first_seen[skill]))
+
+    skills_by_category = {}
+    for skill in skills:
+        skills_by_category.setdefault(SKILLS_TAXONOMY[skill][0], []).append(skill)
+
+    role_titles = list(dict.fromkeys(title for _, _, title in role_matcher.find_all(text)))
+    levels = [level for _, _, level in seniority_matcher.find_all(text)]
+    seniority = next((level for level in ("lead", "senior", "mid", "junior") if level in levels), None)
+
+    return {
+        "skills": skills,
+        "skills_by_category": skills_by_category,
+        "role_titles": role_titles,
+        "seniority": seniority,
+        "years_of_experience": extract_years_of_experience(text)
+    }
+
+def select_tech_stack(text, max_items=4):
+    """
+    Pick the technology stack of a coding challenge from job text.
+
+    Args:
+        text (str): Job title, requirements and other job text
+        max_items (int): Maximum number of technologies
+
+    Returns:
+        list: Most mentioned skills of TECH_STACK_CATEGORIES, or ["General Programming"]
+            if the text names none
+    """
+    by_category = extract_profile(text)["skills_by_category"]
+    # The top skill of each category first, then the runners-up
+    ranked = [by_category.get(category, []) for category in TECH_STACK_CATEGORIES]
+    stack = [skills[0] for skills in ranked if skills]
+    stack += [skill for skills in ranked for skill in skills[1:]]
+    return stack[:max_items] or ["General Programming"]
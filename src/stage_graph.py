@@ -0,0 +1,77 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def run_stage_graph(stages, max_workers=4, on_stage=None):
+    """
+    Run a set of interdependent stages, starting each one as soon as its inputs are ready.
+
+    Most pipeline stages spend their time waiting on the network, so stages that
+    don't depend on each other run side by side on a thread pool.
+
+    Args:
+        stages (dict): Mapping of stage name to a (callable, dependencies) tuple.
+            The callable receives the results of its dependencies as positional
+            arguments, in the order the dependencies are listed.
+        max_workers (int): Maximum number of stages running at the same time
+        on_stage (callable): Optional progress hook, called as on_stage(name, "running", None)
+            when a stage starts and on_stage(name, "done", result) when it finishes
+
+    Returns:
+        dict: Mapping of stage name to the value returned by its callable
+
+    Raises:
+        ValueError: If a stage depends on an unknown stage or the graph has a cycle
+        Exception: The first exception raised by a stage is re-raised as is;
+            stages that haven't started yet are cancelled
+    """
+    for name, (_, dependencies) in stages.items():
+        unknown = [dep for dep in dependencies if dep not in stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(unknown)}")
+
+    results = {}
+    pending = dict(stages)
+    running = {}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage")
+
+    def submit_ready_stages():
+        for name, (func, dependencies) in list(pending.items()):
+            if all(dep in results for dep in dependencies):
+                del pending[name]
+                args = [results[dep] for dep in dependencies]
+                logging.info(f"Starting stage '{name}'")
+                if on_stage:
+                    on_stage(name, "running", None)
+                # Stages see the caller's context variables (e.g. the model routing of the request)
+                running[executor.submit(contextvars.copy_context().run, func, *args)] = name
+
+    try:
+        submit_ready_stages()
+        if pending and not running:
+            raise ValueError(f"Stage graph has a cycle between: {', '.join(pending)}")
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                logging.info(f"Finished stage '{name}'")
+                if on_stage:
+                    on_stage(name, "done", results[name])
+
+            submit_ready_stages()
+            if pending and not running:
+                raise ValueError(f"Stage graph has a cycle between: {', '.join(pending)}")
+
+    except Exception:
+        # Don't hold the caller hostage to stages whose result is no longer needed
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    executor.shutdown(wait=True)
+    return results
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+from dotenv import load_dotenv
+from metrics import Counter, registry
+from skill_extractor import extract_profile
+from transcript_chunks import CHARS_PER_TOKEN, estimate_tokens
+
+try:
+    import tiktoken
+    TIKTOKEN_SUPPORT = True
+except ImportError:
+    TIKTOKEN_SUPPORT = False
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Tokens the per-call context of one prompt may use; 0 disables budgeting
+PROMPT_CONTEXT_TOKEN_BUDGET = int(os.getenv("PROMPT_CONTEXT_TOKEN_BUDGET", "8000"))
+
+# Tokens every section keeps, however low its priority, when a prompt is over budget
+MIN_SECTION_TOKENS = 200
+
+# Longest string values, in characters, tried in turn when shrinking JSON sections
+STRING_CAPS = (1000, 500, 250, 120, 60)
+
+# Longest lists, in items, tried in turn when capping strings is not enough
+LIST_CAPS = (10, 5, 3, 1)
+
+TRUNCATION_MARKER = " [...truncated]"
+
+# Skills listed after a truncated text, at most
+MAX_DROPPED_SKILLS = 20
+
+prompt_truncations = registry.register(Counter(
+    "prompt_truncations_total", "Prompt sections truncated to fit the token budget.", ["section"]))
+
+def load_encoding():
+    """The tokenizer of the current OpenAI chat models, if tiktoken and its data are available."""
+    if not TIKTOKEN_SUPPORT:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logging.warning(f"tiktoken encoding unavailable, estimating token counts: {str(e)}")
+        return None
+
+_encoding = load_encoding()
+
+def count_tokens(text):
+    """Count the tokens of a text with tiktoken if it is installed, or estimate them."""
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return estimate_tokens(text)
+
+def compact_json(value):
+    """Serialize a value for a prompt: no indentation and no spaces after separators."""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+def render(value):
+    """The text a context value becomes in a prompt."""
+    return compact_json(value) if isinstance(value, (dict, list)) else str(value)
+
+def truncate_text(text, max_tokens):
+    """
+    Cut a text down to about max_tokens, at a line or word boundary where possible.
+
+    The skills the cut-off part mentions are listed after the marker, so they aren't
+    lost entirely.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    all_skills = extract_profile(text)["skills"]
+    max_chars = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+    while True:
+        cut = text.rfind("\n", 0, max_chars)
+        if cut < max_chars // 2:
+            cut = text.rfind(" ", 0, max_chars)
+        head = text[:cut if cut > 0 else max_chars].rstrip()
+        kept = set(extract_profile(head)["skills"])
+        dropped = [skill for skill in all_skills if skill not in kept][:MAX_DROPPED_SKILLS]
+        truncated = head + TRUNCATION_MARKER + (f" Also mentions: {', '.join(dropped)}." if dropped else "")
+        if count_tokens(truncated) <= max_tokens or max_chars == 0:
+            return truncated
+        max_chars = max(0, max_chars - max(CHARS_PER_TOKEN, (count_tokens(truncated) - max_tokens) * CHARS_PER_TOKEN))
+
+def cap_strings(value, max_chars):
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars].rstrip() + TRUNCATION_MARKER
+    if isinstance(value, dict):
+        return {key: cap_strings(item, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        return [cap_strings(item, max_chars) for item in value]
+    return value
+
+def cap_lists(value, max_items):
+    if isinstance(value, dict):
+        return {key: cap_lists(item, max_items) for key, item in value.items()}
+    if isinstance(value, list):
+        return [cap_lists(item, max_items) for item in value[:max_items]]
+    return value
+
+def shrink_value(value, max_tokens):
+    """
+    Shrink a context value to about max_tokens.
+
+    Text is truncated. JSON values keep their structure for as long as possible: long
+    strings are shortened first, then lists are cut to their first items, and only
+    then is the serialized JSON truncated as text.
+
+    Returns:
+        The value itself if it fits, otherwise a smaller value or a truncated string
+    """
+    if count_tokens(render(value)) <= max_tokens:
+        return value
+    if not isinstance(value, (dict, list)):
+        return truncate_text(str(value), max_tokens)
+
+    for max_chars in STRING_CAPS:
+        candidate = cap_strings(value, max_chars)
+        if count_tokens(compact_json(candidate)) <= max_tokens:
+            return candidate
+    for max_items in LIST_CAPS:
+        candidate = cap_lists(cap_strings(value, STRING_CAPS[-1]), max_items)
+        if count_tokens(compact_json(candidate)) <= max_tokens:
+            return candidate
+    return truncate_text(compact_json(value), max_tokens)
+
+def allocate_budget(sizes, priorities, budget):
+    """
+    Split a token budget between sections.
+
+    Every section first gets up to MIN_SECTION_TOKENS. The rest of the budget then
+    goes to the sections in order of priority, each taking all it needs until it runs out.
+
+    Args:
+        sizes (dict): Tokens each section needs
+        priorities (dict): Priority of each section, higher first (missing = 0)
+        budget (int): Total tokens available
+
+    Returns:
+        dict: Tokens allotted to each section
+    """
+    allotted = {name: min(size, MIN_SECTION_TOKENS) for name, size in sizes.items()}
+    remaining = budget - sum(allotted.values())
+    for name in sorted(sizes, key=lambda name: -priorities.get(name, 0)):
+        extra = max(0, min(sizes[name] - allotted[name], remaining))
+        allotted[name] += extra
+        remaining -= extra
+    return allotted
+
+def fit_to_budget(values, budget, priorities=None, prompt_name="prompt"):
+    """
+    Shrink the context values of a prompt so that together they fit in the budget.
+
+    Only text and JSON values are budgeted; numbers and other scalars are left alone.
+    Lower-priority sections are cut first, and every cut is logged and counted.
+
+    Args:
+        values (dict): Context values of one prompt
+        budget (int): Tokens the values may use in total; 0 or None for no limit
+        priorities (dict): Priority of each value, higher is more important to keep
+        prompt_name (str): Name of the prompt, for logging
+
+    Returns:
+        dict: The values, with over-budget sections shrunk
+    """
+    sections = {name: value for name, value in values.items() if isinstance(value, (str, dict, list))}
+    if not budget or not sections:
+        return values
+
+    sizes = {name: count_tokens(render(value)) for name, value in sections.items()}
+    fixed = sum(count_tokens(render(value)) for name, value in values.items() if name not in sections)
+    if sum(sizes.values()) + fixed <= budget:
+        return values
+
+    allotted = allocate_budget(sizes, priorities or {}, max(0, budget - fixed))
+    fitted = dict(values)
+    for name, size in sizes.items():
+        if size > allotted[name]:
+            fitted[name] = shrink_value(sections[name], allotted[name])
+            prompt_truncations.inc(section=f"{prompt_name}.{name}")
+            logging.warning(f"Token budget: {prompt_name} section '{name}' shrunk from {size} to "
+                            f"{count_tokens(render(fitted[name]))} tokens (budget {budget})")
+    return fitted
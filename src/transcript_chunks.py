@@ -0,0 +1,116 @@
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Rough size of a token in characters of English text
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text):
+    """Estimate the number of tokens in a text without a tokenizer."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def split_transcript(transcript_text, max_tokens):
+    """
+    Split a transcript into chunks of at most max_tokens, on line boundaries where possible.
+
+    Args:
+        transcript_text (str): Full meeting transcript
+        max_tokens (int): Token budget of one chunk
+
+    Returns:
+        list: Transcript chunks, in order
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current = []
+    current_length = 0
+
+    def pieces():
+        for line in transcript_text.splitlines():
+            # A single speaker turn longer than a chunk is split between words
+            while len(line) > max_chars:
+                cut = line.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                yield line[:cut]
+                line = line[cut:].lstrip()
+            yield line
+
+    for piece in pieces():
+        if current and current_length + len(piece) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current = []
+            current_length = 0
+        current.append(piece)
+        current_length += len(piece) + 1
+
+    if current:
+        chunks.append("\n".join(current))
+
+    return [chunk for chunk in chunks if chunk.strip()]
+
+def unique_items(values):
+    """Return values without duplicates (compared case- and whitespace-insensitively), keeping the first."""
+    seen = set()
+    items = []
+    for value in values:
+        key = " ".join(value.split()).casefold() if isinstance(value, str) else repr(value)
+        if key and key not in seen:
+            seen.add(key)
+            items.append(value)
+    return items
+
+def merge_values(values):
+    """
+    Merge the values one field took in several partial insights.
+
+    Lists are concatenated, dicts are merged key by key, and distinct strings are
+    joined by newlines; duplicates are dropped and chunk order is kept.
+    """
+    values = [value for value in values if value not in (None, "", [], {})]
+    if not values:
+        return None
+
+    if all(isinstance(value, dict) for value in values):
+        keys = unique_items(key for value in values for key in value)
+        return {key: merge_values([value.get(key) for value in values]) for key in keys}
+
+    if any(isinstance(value, list) for value in values):
+        flattened = []
+        for value in values:
+            flattened.extend(value if isinstance(value, list) else [value])
+        return unique_items(flattened)
+
+    if all(isinstance(value, str) for value in values):
+        return "\n".join(unique_items(values))
+
+    return values[0]
+
+def merge_insights(partials):
+    """
+    Combine the insights extracted from consecutive transcript chunks.
+
+    The result only depends on the partial insights and their order, so the same
+    transcript always merges to the same insights.
+
+    Args:
+        partials (list): Insight dicts, one per chunk, in transcript order
+
+    Returns:
+        dict: Insights with the same keys extract_meeting_insights() returns
+    """
+    merged = {}
+    for key in unique_items(key for partial in partials for key in partial):
+        values = [partial.get(key) for partial in partials]
+
+        if key == "code_challenge_needed":
+            merged[key] = any(value is True for value in values)
+        elif key == "interview_duration_minutes":
+            # The first chunk that mentions a duration wins
+            merged[key] = next((value for value in values if value not in (None, "", 0)), None)
+        elif key in ("topics_to_cover", "red_flags"):
+            merged[key] = merge_values([value if isinstance(value, list) else [value] for value in values if value]) or []
+        else:
+            merged[key] = merge_values(values)
+
+    return merged
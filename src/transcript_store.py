@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+import os
+from cache_backends import CACHE_DIR, create_backend
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Meeting transcripts, keyed by the SHA-256 of the recording and the transcription
+# parameters, and the insights extracted from them, keyed by the recording and the
+# insights model and prompt: one client meeting usually feeds many candidate plans,
+# and Whisper is the slowest stage of the pipeline
+transcript_store = create_backend(
+    os.getenv("TRANSCRIPT_CACHE_BACKEND", "tiered"),
+    path=os.getenv("TRANSCRIPT_CACHE_PATH", os.path.join(CACHE_DIR, "transcripts.sqlite3")),
+    max_entries=int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", "0")) or None,
+    memory_entries=int(os.getenv("TRANSCRIPT_CACHE_MEMORY_ENTRIES", "32"))
+)
+
+def make_transcript_key(audio_hash, params):
+    """
+    Build the store key for a recording transcribed with the given parameters.
+
+    Args:
+        audio_hash (str): SHA-256 hex digest of the recording bytes
+        params (dict): Everything that changes the transcript (model, language, chunking)
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    payload = json.dumps({"audio_hash": audio_hash, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def get_transcript(key):
+    """
+    Look up a stored transcript.
+
+    Args:
+        key (str): Key from make_transcript_key()
+
+    Returns:
+        dict: {"audio_hash", "transcript"}, or None if the recording is unknown
+    """
+    if transcript_store is None:
+        return None
+    return transcript_store.get(key)
+
+def store_transcript(key, audio_hash, transcript):
+    """
+    Store a transcript.
+
+    Args:
+        key (str): Key from make_transcript_key()
+        audio_hash (str): SHA-256 hex digest of the recording bytes
+        transcript (dict): Result of transcribe_audio()
+    """
+    if transcript_store is None:
+        return
+    try:
+        transcript_store.set(key, {
+            "audio_hash": audio_hash,
+            "transcript": transcript
+        })
+    except (TypeError, ValueError) as e:
+        # A transcript that can't be serialized is just not cached
+        logging.warning(f"Could not store transcript {key[:12]}: {str(e)}")
+
+def make_insights_key(audio_hash, params):
+    """
+    Build the store key for the meeting insights of a recording.
+
+    Args:
+        audio_hash (str): SHA-256 hex digest of the recording bytes
+        params (dict): Everything that changes the insights (model, prompt fingerprint, chunking)
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    payload = json.dumps({"audio_hash": audio_hash, "insights_params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def get_insights(key):
+    """
+    Look up stored meeting insights.
+
+    Args:
+        key (str): Key from make_insights_key()
+
+    Returns:
+        dict: {"audio_hash", "insights"}, or None if none were stored under this key
+    """
+    if transcript_store is None:
+        return None
+    return transcript_store.get(key)
+
+def store_insights(key, audio_hash, insights):
+    """
+    Store the meeting insights of a recording.
+
+    Args:
+        key (str): Key from make_insights_key()
+        audio_hash (str): SHA-256 hex digest of the recording bytes
+        insights (dict): Result of extract_meeting_insights()
+    """
+    if transcript_store is None:
+        return
+    try:
+        transcript_store.set(key, {"audio_hash": audio_hash, "insights": insights})
+    except (TypeError, ValueError) as e:
+        logging.warning(f"Could not store meeting insights {key[:12]}: {str(e)}")
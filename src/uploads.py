@@ -0,0 +1,102 @@
+import logging
+import os
+import shutil
+import tempfile
+from dotenv import load_dotenv
+from flask import Request
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Uploaded files stay in memory up to this size, then roll over to a temp file on disk
+UPLOAD_SPOOL_MAX_MEMORY_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_MEMORY_KB", "1024")) * 1024
+
+# Chunk size used when copying or hashing uploads
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+class SpooledUploadRequest(Request):
+    """Request that spools multipart file parts to temp files as they are read, in chunks."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY_BYTES, mode="rb+")
+
+def save_upload(file_storage, folder):
+    """
+    Copy an uploaded file into a temp file that outlives the request.
+
+    Background jobs run after the request (and its spooled uploads) has been
+    closed, so the pipeline works from a path it owns instead.
+
+    Args:
+        file_storage: Werkzeug FileStorage from request.files
+        folder (str): Directory for the temp file
+
+    Returns:
+        str: Path of the saved file; the caller is responsible for deleting it
+    """
+    extension = os.path.splitext(file_storage.filename or "")[1]
+    with tempfile.NamedTemporaryFile(dir=folder, prefix="upload_", suffix=extension, delete=False) as temp_file:
+        shutil.copyfileobj(file_storage.stream, temp_file, UPLOAD_CHUNK_BYTES)
+        path = temp_file.name
+
+    logging.info(f"Saved upload {file_storage.filename} to {path} ({os.path.getsize(path)} bytes)")
+    return path
+
+def read_source_bytes(source):
+    """
+    Return the full content of a bytes object, file path or binary file object.
+
+    Args:
+        source: bytes, path (str) or binary file object
+
+    Returns:
+        bytes: File content
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read()
+
+    source.seek(0)
+    return source.read()
+
+def iter_source_chunks(source):
+    """
+    Yield the content of a bytes object, file path or binary file object in chunks.
+
+    Args:
+        source: bytes, path (str) or binary file object
+
+    Yields:
+        bytes: Consecutive chunks of at most UPLOAD_CHUNK_BYTES
+    """
+    if isinstance(source, (bytes, bytearray)):
+        yield bytes(source)
+        return
+
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            while True:
+                chunk = f.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    return
+                yield chunk
+
+    source.seek(0)
+    while True:
+        chunk = source.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        yield chunk
+    source.seek(0)
+
+def remove_file(path):
+    """Delete a temp file, ignoring files that are already gone."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
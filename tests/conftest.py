@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# The backend modules import each other by bare name from src/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Keep caches, stores and the uploads folder (relative to the working directory) out of the tree,
+# and never reach the OpenAI API
+TEST_DIR = tempfile.mkdtemp(prefix="interview-tests-")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["CACHE_DIR"] = TEST_DIR
+os.environ["LLM_CACHE_BACKEND"] = "none"
+os.chdir(TEST_DIR)
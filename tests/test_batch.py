@@ -0,0 +1,42 @@
+from batch import run_batch
+
+def test_failed_candidate_is_reported_once_and_not_retried():
+    calls = []
+
+    def run_pipeline(payload):
+        calls.append(payload['candidate_cv']['name'])
+        if payload['candidate_cv']['name'] == 'bad.pdf':
+            raise RuntimeError("Error code: 429 - rate limit reached")
+        return {'candidate_cv_hash': 'hash', 'plan_id': 'plan',
+                'excel_file': {'name': 'plan.xlsx', 'artifact_id': 'a', 'download_url': '/plans/plan/workbook'}}
+
+    summary = run_batch(run_pipeline, [{'name': 'good.pdf'}, {'name': 'bad.pdf'}], {'job_profile_id': 'job'},
+                        max_concurrency=2)
+
+    assert sorted(calls) == ['bad.pdf', 'good.pdf']
+    assert (summary['succeeded'], summary['failed']) == (1, 1)
+    good, bad = summary['candidates']
+    assert good['status'] == 'succeeded' and good['plan_id'] == 'plan'
+    assert bad['status'] == 'failed' and '429' in bad['error']
+
+def test_batch_links_to_the_plan_workbook_which_outlives_the_artifact(tmp_path, monkeypatch):
+    import app as app_module
+    import artifact_store
+    import llm_client
+    from fake_openai import FakeOpenAI
+
+    monkeypatch.setattr(llm_client.client, "client", FakeOpenAI(latency=0, jitter=0))
+    cv = tmp_path / "cv.txt"
+    cv.write_text("Senior .NET developer with 8 years of C#, SQL Server and Azure.")
+    summary = run_batch(app_module.run_pipeline_stages, [{'name': 'cv.txt', 'upload_path': str(cv)}],
+                        {'job_position': 'Senior .NET Developer', 'meeting_transcript': 'We need a senior .NET developer.'})
+
+    [result] = summary['candidates']
+    assert result['status'] == 'succeeded'
+    assert result['download_url'] == f"/plans/{result['plan_id']}/workbook"
+
+    # Evicted from the artifact LRU before anyone downloaded it
+    artifact_store.artifacts.clear()
+    response = app_module.app.test_client().get(result['download_url'])
+    assert response.status_code == 200
+    assert response.data[:2] == b"PK"
@@ -0,0 +1,18 @@
+from benchmark import percentile, summarize
+
+def test_percentile_nearest_rank():
+    samples = [1, 2, 3, 4, 5]
+    assert percentile(samples, 50) == 3
+    assert percentile(samples, 20) == 1
+    assert percentile(samples, 21) == 2
+    assert percentile(samples, 95) == 5
+    assert percentile(samples, 0) == 1
+    assert percentile(samples, 100) == 5
+
+def test_percentile_unsorted_and_empty():
+    assert percentile([30, 10, 20, 40], 50) == 20
+    assert percentile(list(range(1, 101)), 99) == 99
+    assert percentile([], 50) is None
+
+def test_summarize():
+    assert summarize([0.5, 0.1, 0.3]) == {"count": 3, "p50": 0.3, "p95": 0.5, "p99": 0.5}
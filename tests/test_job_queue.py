@@ -0,0 +1,25 @@
+import io
+import os
+
+import pytest
+
+import app as app_module
+
+@pytest.fixture
+def full_queue(tmp_path, monkeypatch):
+    """A job queue that rejects every submission, with uploads saved under tmp_path."""
+    monkeypatch.setattr(app_module, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(app_module.job_manager, "max_pending", 0)
+    return tmp_path
+
+@pytest.mark.parametrize("path", ["/generate_interview_plan/jobs", "/generate_interview_plan/stream"])
+def test_rejected_multipart_request_removes_its_uploads(full_queue, path):
+    client = app_module.app.test_client()
+    response = client.post(path, data={
+        "job_position": "Senior .NET Developer",
+        "candidate_cv": (io.BytesIO(b"Senior .NET developer, 8 years of C#"), "cv.txt"),
+        "meeting_recording": (io.BytesIO(b"fake audio"), "call.mp3")
+    }, content_type="multipart/form-data")
+
+    assert response.status_code == 503
+    assert os.listdir(full_queue) == []
@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+import app as app_module
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "UPLOAD_FOLDER", str(tmp_path))
+    return app_module.app.test_client()
+
+@pytest.mark.parametrize("value", ["soon", "-5", "nan", "inf"])
+def test_multipart_rejects_invalid_latency_budget(client, value):
+    response = client.post("/generate_interview_plan", data={
+        "latency_budget_seconds": value,
+        "candidate_cv": (io.BytesIO(b"Senior .NET developer"), "cv.txt")
+    }, content_type="multipart/form-data")
+
+    assert response.status_code == 400
+    assert "latency_budget_seconds" in response.get_json()["message"]
+
+@pytest.mark.parametrize("path", ["/generate_interview_plan", "/generate_interview_plan/jobs",
+                                  "/generate_interview_plan/stream"])
+@pytest.mark.parametrize("value", ["soon", -1, True, [30]])
+def test_json_rejects_invalid_latency_budget(client, path, value):
+    response = client.post(path, json={"latency_budget_seconds": value, "job_position": "Developer"})
+
+    assert response.status_code == 400
+    assert "latency_budget_seconds" in response.get_json()["message"]
+
+@pytest.mark.parametrize("value, seconds", [("30", 30.0), (0, 0.0), (12.5, 12.5)])
+def test_parse_latency_budget_accepts_non_negative_numbers(value, seconds):
+    assert app_module.parse_latency_budget(value) == seconds
+
+@pytest.mark.parametrize("path", ["/generate_interview_plan", "/generate_interview_plan/jobs",
+                                  "/generate_interview_plan/stream", "/job_profiles", "/batch"])
+@pytest.mark.parametrize("value", ["an hour", "0", "-30", "45.5"])
+def test_multipart_rejects_invalid_interview_duration(client, path, value):
+    response = client.post(path, data={
+        "interview_duration_minutes": value,
+        "candidate_cv": (io.BytesIO(b"Senior .NET developer"), "cv.txt")
+    }, content_type="multipart/form-data")
+
+    assert response.status_code == 400
+    assert "interview_duration_minutes" in response.get_json()["message"]
+
+@pytest.mark.parametrize("value", ["an hour", 0, True, 12.5])
+def test_json_rejects_invalid_interview_duration(client, value):
+    response = client.post("/generate_interview_plan", json={"interview_duration_minutes": value})
+
+    assert response.status_code == 400
+    assert "interview_duration_minutes" in response.get_json()["message"]
+
+@pytest.mark.parametrize("value, minutes", [("45", 45), (60, 60), (30.0, 30)])
+def test_parse_interview_duration_accepts_whole_minutes(value, minutes):
+    assert app_module.parse_interview_duration(value) == minutes
+
+@pytest.mark.parametrize("value", ["many", "0", "-2", "1.5"])
+def test_batch_rejects_invalid_concurrency_before_queueing(client, tmp_path, value):
+    response = client.post("/batch", data={
+        "concurrency": value,
+        "candidate_cv": (io.BytesIO(b"Senior .NET developer"), "cv.txt")
+    }, content_type="multipart/form-data")
+
+    assert response.status_code == 400
+    assert "concurrency" in response.get_json()["message"]
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.parametrize("value", ["many", 0, True])
+def test_json_batch_rejects_invalid_concurrency(client, value):
+    response = client.post("/batch", json={"concurrency": value, "candidates": [{"content_hash": "abc"}]})
+
+    assert response.status_code == 400
+    assert "concurrency" in response.get_json()["message"]
+
+def test_batch_concurrency_is_clamped():
+    assert app_module.parse_batch_concurrency("2") == min(2, app_module.BATCH_CONCURRENCY)
+    assert app_module.parse_batch_concurrency(10 ** 6) == app_module.BATCH_CONCURRENCY
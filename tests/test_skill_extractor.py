@@ -0,0 +1,45 @@
+import pytest
+
+from skill_extractor import extract_profile, select_tech_stack
+
+@pytest.mark.parametrize("text", [
+    "Oracle of Delphi. Rust belt. Swift delivery. Unity of purpose. Flask of wine. AR team",
+    "Our VR team ships fast.",
+    "Grab a flask of coffee and TS reports before the meeting.",
+    "He values unity and swift decisions; the oracle of the office.",
+    "Senior QA Engineer. The candidate should react calmly under pressure.",
+    "Must react quickly and stay agile when priorities change.",
+    "A playwright, a postman and Mr Jenkins walk past the cypress trees.",
+    "She reads Kafka novels at the docker yard, then goes to a bash.",
+    "Azure skies over the ruby red confluence of two rivers.",
+])
+def test_ordinary_words_are_not_skills(text):
+    assert extract_profile(text)["skills"] == []
+
+def test_prose_does_not_pick_the_tech_stack():
+    assert select_tech_stack("Oracle of Delphi. Rust belt. Swift delivery. Unity of purpose.") == ["General Programming"]
+    assert select_tech_stack("Senior QA Engineer with manual testing experience. Should react calmly under pressure.") == \
+        ["Manual testing"]
+
+@pytest.mark.parametrize("text, skill", [
+    ("Built low-latency services in Rust and Python", "Rust"),
+    ("Rust programming for embedded devices", "Rust"),
+    ("iOS apps in Swift", "Swift"),
+    ("REST APIs with Flask", "Flask"),
+    ("Game development with the Unity game engine", "Unity"),
+    ("Migrated the Oracle database to PostgreSQL", "Oracle"),
+    ("Shipped a Meta Quest experience", "VR/AR"),
+    ("Skills: python, java, docker, kafka", "Java"),
+    ("Skills: python, java, docker, kafka", "Kafka"),
+    ("Frontend in React with TypeScript", "React"),
+    ("E2E tests with Playwright and Cypress, API tests with Postman", "Postman"),
+    ("CI/CD pipelines on Jenkins", "Jenkins"),
+])
+def test_ambiguous_skills_count_in_technical_context(text, skill):
+    assert skill in extract_profile(text)["skills"]
+
+def test_unambiguous_skills():
+    profile = extract_profile("Senior C#/.NET developer: SQL Server, Azure, Docker. 8+ years.")
+    assert profile["skills"] == ["C#", ".NET", "SQL Server", "Azure", "Docker"]
+    assert profile["seniority"] == "senior"
+    assert profile["years_of_experience"] == 8
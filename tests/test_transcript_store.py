@@ -0,0 +1,68 @@
+import pytest
+
+import audio_transcriber
+import llm_client
+from fake_openai import FakeOpenAI
+from model_routing import ROUTING_PROFILES, routing_context
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    fake = FakeOpenAI(latency=0, jitter=0)
+    models = []
+    create_chat_completion = fake.create_chat_completion
+
+    def record_model(model, messages, **kwargs):
+        models.append(model)
+        return create_chat_completion(model, messages, **kwargs)
+
+    fake.chat.completions.create = record_model
+    monkeypatch.setattr(llm_client.client, "client", fake)
+    return fake, models
+
+@pytest.fixture
+def recording(tmp_path):
+    # Unique per test: the transcript store lives for the whole session
+    path = tmp_path / "meeting.mp3"
+    path.write_bytes(f"recording for {tmp_path}".encode("utf-8"))
+    return str(path)
+
+def test_stored_insights_are_reused_for_the_same_model_and_prompt(fake_client, recording):
+    fake, _ = fake_client
+    first = audio_transcriber.process_meeting_recording(recording)
+    calls_after_first = fake.calls
+
+    second = audio_transcriber.process_meeting_recording(recording)
+
+    assert "error" not in first
+    assert second["insights"] == first["insights"]
+    assert fake.calls == calls_after_first
+
+def test_stored_insights_of_another_model_are_not_replayed(fake_client, recording, monkeypatch):
+    fake, models = fake_client
+    monkeypatch.setitem(ROUTING_PROFILES["fast"], "meeting_insights", {"model": "gpt-4o", "max_tokens": None})
+
+    with routing_context("default"):
+        first = audio_transcriber.process_meeting_recording(recording)
+    calls_after_first = fake.calls
+
+    with routing_context("fast"):
+        second = audio_transcriber.process_meeting_recording(recording)
+
+    assert second["transcript"] == first["transcript"]
+    # The transcript is reused; only the insights are requested again, from the fast profile's model
+    assert fake.calls == calls_after_first + 1
+    assert models[-1] == "gpt-4o" != ROUTING_PROFILES["default"]["meeting_insights"]["model"]
+
+    with routing_context("fast"):
+        audio_transcriber.process_meeting_recording(recording)
+    assert fake.calls == calls_after_first + 1
+
+def test_stored_insights_of_another_prompt_are_not_replayed(fake_client, recording, monkeypatch):
+    fake, _ = fake_client
+    audio_transcriber.process_meeting_recording(recording)
+    calls_after_first = fake.calls
+
+    monkeypatch.setattr(audio_transcriber.MEETING_INSIGHTS_PROMPT, "fingerprint", "reworded")
+    audio_transcriber.process_meeting_recording(recording)
+
+    assert fake.calls == calls_after_first + 1